@@ -0,0 +1,109 @@
+"""Throughput, CPU and peak memory of whole crawls, `get_all_stargazers` and `is_stargazer`,
+against the local stub server, for repositories of many sizes.
+
+    $ python -m benchmarks.bench_crawl --sizes 1000 10000 100000 --concurrency 1 8 --output results.json
+    $ python -m benchmarks.bench_crawl --sizes 1000000 --engine api --throttle-every 50 --latency 0.02
+
+Every crawl runs in a new process, so its peak RSS is its own; the server answers from this one.
+The `github` markup serves pages as heavy as github.com's, the `minimal` one measures the crawler alone.
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import typing
+
+from benchmarks.stub_server import MARKUPS, StubGitHubServer, get_username
+from github_stargazers.github import ENGINES, GitHub, HTML_ENGINE
+from github_stargazers.instrumentation import Profiler
+from github_stargazers.scheduler import RequestScheduler
+
+OPERATIONS: typing.Tuple[str, ...] = ("get_all_stargazers", "is_stargazer")
+
+
+class _Case(typing.NamedTuple):
+    operation: str
+    engine: str
+    markup: str
+    stars: int
+    concurrency: int
+    latency: float
+    throttle_every: int
+
+
+def _get_peak_rss_mib() -> float:
+    peak_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 2 ** 20 if sys.platform == "darwin" else peak_rss / 2 ** 10  # bytes on macOS, KiB elsewhere
+
+
+def _run_case(case: _Case, url: str) -> typing.Dict[str, typing.Any]:
+    """Crawl in a child process and return the measures of `case`."""
+    profiler: Profiler = Profiler()
+    scheduler: typing.Optional[RequestScheduler] = \
+        RequestScheduler(max_concurrency=case.concurrency, base_delay=0.0) if case.throttle_every else None
+    github: GitHub = GitHub("foo/bar", concurrency=case.concurrency, github_url=url, api_url=url, engine=case.engine,
+                            scheduler=scheduler, on_page=profiler.record)
+
+    cpu_start: float = time.process_time()
+    start: float = time.perf_counter()
+    if case.operation == "is_stargazer":
+        github.is_stargazer(get_username(case.stars - 1))
+    else:
+        github.get_all_stargazers()
+    seconds: float = time.perf_counter() - start
+    cpu_seconds: float = time.process_time() - cpu_start
+
+    pages: int = len(profiler.pages)
+    return dict(case._asdict(), pages=pages, seconds=seconds,
+                pages_per_second=pages / seconds, users_per_second=case.stars / seconds,
+                cpu_seconds_per_page=cpu_seconds / max(pages, 1), peak_rss_mib=_get_peak_rss_mib(),
+                retries=sum(page.retries for page in profiler.pages))
+
+
+def _report(result: typing.Dict[str, typing.Any]) -> None:
+    print(f"{result['operation']:<20}{result['engine']:<8}{result['markup']:<9}{result['stars']:>9}"
+          f"{result['concurrency']:>4}{result['pages']:>8}{result['pages_per_second']:>10.1f}"
+          f"{result['users_per_second']:>12.0f}{result['cpu_seconds_per_page'] * 1000:>10.2f}"
+          f"{result['peak_rss_mib']:>10.1f}{result['retries']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--engine", choices=ENGINES, default=HTML_ENGINE)
+    parser.add_argument("--markup", choices=MARKUPS, default="github")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the server waits before answering")
+    parser.add_argument("--throttle-every", type=int, default=0,
+                        help="Answer every Nth request with 429 Too Many Requests")
+    parser.add_argument("--output", help="Also write the results, as JSON, to this file")
+    arguments = parser.parse_args()
+
+    print(f"{'operation':<20}{'engine':<8}{'markup':<9}{'stars':>9}{'c':>4}{'pages':>8}{'pages/s':>10}"
+          f"{'users/s':>12}{'cpu ms/p':>10}{'rss MiB':>10}{'retries':>8}")
+    results: typing.List[typing.Dict[str, typing.Any]] = []
+    for stars in arguments.sizes:
+        with StubGitHubServer(stars=stars, latency=arguments.latency, markup=arguments.markup,
+                              throttle_every=arguments.throttle_every) as server:
+            for operation in arguments.operations:
+                for concurrency in arguments.concurrency:
+                    case: _Case = _Case(operation, arguments.engine, arguments.markup, stars, concurrency,
+                                        arguments.latency, arguments.throttle_every)
+                    with concurrent.futures.ProcessPoolExecutor(
+                            max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                        results.append(executor.submit(_run_case, case, server.url).result())
+                    _report(results[-1])
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "processor": platform.processor(), "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
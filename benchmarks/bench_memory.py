@@ -0,0 +1,66 @@
+"""Memory held by the stargazers as a list, a set and a `CompactStargazers`, and their lookup time,
+then the time to load a `CompactStargazers` snapshot and look up in it.
+
+    $ python -m benchmarks.bench_memory --sizes 10000 100000 1000000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import timeit
+import tracemalloc
+import typing
+
+from benchmarks.stub_server import get_username
+from github_stargazers.compact import CompactStargazers
+
+
+def _measure(build: typing.Callable[[], typing.Collection[str]]) -> typing.Tuple[typing.Collection[str], int]:
+    """Return what `build` returns and the bytes it still holds once built."""
+    gc.collect()
+    tracemalloc.start()
+    collection: typing.Collection[str] = build()
+    held_bytes: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return collection, held_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=100000)
+    arguments = parser.parse_args()
+
+    builders: typing.Dict[str, typing.Callable[[int], typing.Collection[str]]] = {
+        "list": lambda size: [get_username(index) for index in range(size)],
+        "set": lambda size: {get_username(index) for index in range(size)},
+        "CompactStargazers": lambda size: CompactStargazers.from_sorted(get_username(index) for index in range(size)),
+    }
+    for size in arguments.sizes:
+        print(f"{size} stargazers")
+        for name, build in builders.items():
+            collection, held_bytes = _measure(lambda: build(size))  # pylint: disable=cell-var-from-loop
+            missing_user: str = get_username(size)
+            lookups: int = arguments.lookups if name != "list" else 100  # a list is scanned linearly
+            seconds: float = timeit.timeit(lambda: missing_user in collection,  # pylint: disable=cell-var-from-loop
+                                           number=lookups)
+            print(f"  {name:<18} {held_bytes / 2 ** 20:8.2f} MiB  {held_bytes / size:6.1f} bytes/user  "
+                  f"{seconds / lookups * 1e6:10.3f} us/lookup")
+            del collection
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path: str = os.path.join(directory, "stargazers.bin")
+            CompactStargazers.from_sorted(get_username(index) for index in range(size)).save(snapshot_path)
+            start: float = time.perf_counter()
+            snapshot: CompactStargazers = CompactStargazers.load(snapshot_path)
+            load_seconds: float = time.perf_counter() - start
+            seconds = timeit.timeit(lambda: get_username(size // 2) in snapshot,  # pylint: disable=cell-var-from-loop
+                                    number=arguments.lookups)
+            print(f"  {'snapshot':<18} {load_seconds * 1000:8.3f} ms to load   "
+                  f"{seconds / arguments.lookups * 1e6:10.3f} us/lookup")
+            del snapshot
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Time every available parser backend on a saved stargazers page.
+
+    $ python -m benchmarks.bench_parsers --repeat 200
+"""
+import argparse
+import functools
+import importlib.util
+import os
+import timeit
+import typing
+
+from github_stargazers.parsers import PARSERS, get_parser
+
+FIXTURE_PATH: str = os.path.join(os.path.dirname(__file__), "fixtures", "stargazers_page.html")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    arguments = parser.parse_args()
+
+    with open(FIXTURE_PATH, encoding="utf-8") as fixture:
+        page: str = fixture.read()
+
+    expected: typing.List[str] = get_parser("html.parser")(page)
+    print(f"{len(page)} characters, {len(expected)} stargazers per page")
+    for name in sorted(PARSERS):
+        if name in ("lxml", "selectolax") and importlib.util.find_spec(name) is None:
+            print(f"{name:<12} skipped, not installed")
+            continue
+        parse: typing.Callable[[str], typing.List[str]] = get_parser(name)
+        assert parse(page) == expected, name
+        seconds: float = timeit.timeit(functools.partial(parse, page), number=arguments.repeat)
+        print(f"{name:<12} {seconds / arguments.repeat * 1000:8.3f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Per-page latency of a new connection per request against a kept-alive `requests.Session`.
+
+    $ python -m benchmarks.bench_session --pages 200
+
+The stub server speaks plain HTTP, so only the TCP handshake is saved here; against github.com
+every new connection also pays for a TLS handshake.
+"""
+import argparse
+import statistics
+import time
+import typing
+
+import requests
+
+from benchmarks.stub_server import StubGitHubServer, STARGAZERS_PER_PAGE
+from github_stargazers.github import GitHub, create_session
+
+
+def _time_pages(get: typing.Callable[[str], requests.Response], base_url: str, pages: int) -> typing.List[float]:
+    timings: typing.List[float] = []
+    for page_number in range(1, pages + 1):
+        start: float = time.perf_counter()
+        get(f"{base_url}/foo/bar/stargazers?page={page_number}").raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name: str, timings: typing.List[float]) -> None:
+    print(f"{name:<24} mean {statistics.mean(timings) * 1000:7.3f} ms/page   "
+          f"median {statistics.median(timings) * 1000:7.3f} ms/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the server waits before answering")
+    arguments = parser.parse_args()
+
+    with StubGitHubServer(stars=arguments.pages * STARGAZERS_PER_PAGE, latency=arguments.latency) as server:
+        _report("requests.get", _time_pages(requests.get, server.url, arguments.pages))
+        _report("requests.Session", _time_pages(create_session().get, server.url, arguments.pages))
+
+        start: float = time.perf_counter()
+        GitHub("foo/bar", github_url=server.url).get_all_stargazers()
+        _report("GitHub crawl", [(time.perf_counter() - start) / (arguments.pages + 1)])
+
+
+if __name__ == "__main__":
+    main()
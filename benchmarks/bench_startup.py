@@ -0,0 +1,90 @@
+"""Startup time of the command line: the import time of its module, from `python -X importtime`,
+the modules taking the longest to import, and the wall time of quick invocations.
+
+    $ python -m benchmarks.bench_startup --repeat 10 --output startup.json
+
+Each measure runs a new interpreter and keeps the median of `--repeat` runs, the first one being
+discarded, so that the bytecode caches are warm.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+from github_stargazers.compact import CompactStargazers
+
+_CLI_MODULE: str = "github_stargazers.github_stargazers"
+_IMPORT_TIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s*)(?P<module>\S+)$")
+
+
+def _get_import_times() -> typing.Dict[str, int]:
+    """The cumulative microseconds the import of the CLI took, and of every module it imported,
+    leaving out the ones the interpreter imports at startup, such as `site`.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {_CLI_MODULE}"],
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    import_times: typing.Dict[str, int] = {}
+    for line in process.stderr.splitlines():  # a module is listed after the ones it imported
+        match: typing.Optional[typing.Match[str]] = _IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        if len(match.group("indent")) == 1 and match.group("module") != _CLI_MODULE:
+            import_times.clear()  # imported by the interpreter, not by the CLI
+            continue
+        import_times[match.group("module")] = int(match.group("cumulative"))
+    return import_times
+
+
+def _time_command(arguments: typing.List[str], repeat: int) -> float:
+    timings: typing.List[float] = []
+    for _ in range(repeat + 1):
+        start: float = time.perf_counter()
+        subprocess.run([sys.executable, "-m", _CLI_MODULE] + arguments, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings[1:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="Number of the slowest imported modules listed")
+    parser.add_argument("--output", help="Also write the results, as JSON, to this file")
+    arguments = parser.parse_args()
+
+    _get_import_times()  # warms the bytecode caches
+    runs: typing.List[typing.Dict[str, int]] = [_get_import_times() for _ in range(arguments.repeat)]
+    import_times: typing.Dict[str, float] = {module: statistics.median(run.get(module, 0) for run in runs)
+                                             for module in runs[0]}
+    print(f"import {_CLI_MODULE:<40} {import_times[_CLI_MODULE] / 1000:8.1f} ms")
+    slowest: typing.List[str] = sorted((module for module in import_times if module != _CLI_MODULE),
+                                       key=import_times.__getitem__, reverse=True)[:arguments.top]
+    for module in slowest:
+        print(f"  {module:<45} {import_times[module] / 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path: str = os.path.join(directory, "stargazers.bin")
+        CompactStargazers(["foo", "bar"]).save(snapshot_path)
+        commands: typing.Dict[str, typing.List[str]] = {
+            "--help": ["--help"],
+            "--from-snapshot --user": ["--from-snapshot", snapshot_path, "--user", "foo"],
+        }
+        wall_times: typing.Dict[str, float] = {name: _time_command(command, arguments.repeat)
+                                               for name, command in commands.items()}
+    for name, seconds in wall_times.items():
+        print(f"github-stargazers {name:<34} {seconds * 1000:8.1f} ms")
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump({"python": sys.version.split()[0], "import_microseconds": import_times,
+                       "wall_seconds": wall_times}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
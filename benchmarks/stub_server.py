@@ -0,0 +1,178 @@
+"""A local stand-in for github.com serving stargazers pages, and the REST API listing them,
+used by the benchmarks and the tests."""
+import functools
+import http.server
+import json
+import math
+import os
+import re
+import socketserver
+import threading
+import time
+import typing
+import urllib.parse
+
+STARGAZERS_PER_PAGE: int = 48
+
+_STARGAZERS_PATH = re.compile(r"^/(?P<owner>[^/]+)/(?P<repository>[^/]+)/stargazers$")
+_API_STARGAZERS_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repository>[^/]+)/stargazers$")
+_API_DEFAULT_PER_PAGE: int = 30
+_FIXTURE_PATH: str = os.path.join(os.path.dirname(__file__), "fixtures", "stargazers_page.html")
+_FIXTURE_USERNAME: str = "yyx990803-54805"
+_FIXTURE_NAME: str = "Yyx990803 54805"
+
+MARKUPS: typing.Tuple[str, ...] = ("minimal", "github")
+
+
+def get_username(index: int) -> str:
+    return f"user{index:07d}"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_github_markup() -> typing.Tuple[str, str, str]:
+    """Split the saved github.com page into what comes before the stargazers, the markup of one
+    stargazer, with `{username}` and `{name}` placeholders, and what comes after the stargazers.
+    """
+    with open(_FIXTURE_PATH, encoding="utf-8") as fixture:
+        page: str = fixture.read()
+    first_item: int = page.index('<li class="follow-list-item')
+    first_item_end: int = page.index('</li>', first_item) + len('</li>')
+    last_item_end: int = page.rindex('</li>') + len('</li>')
+    item: str = page[first_item:first_item_end].replace("{", "{{").replace("}", "}}")
+    item = item.replace(_FIXTURE_USERNAME, "{username}").replace(_FIXTURE_NAME, "{name}")
+    return page[:first_item], item, page[last_item_end:]
+
+
+def render_stargazers_page(stars: int, page_number: int, markup: str = "minimal") -> str:
+    """Render the stargazers of `page_number` as `minimal` markup, or as the full `github` page
+    with avatars, follow buttons and the site's header and footer, about 75 kB.
+    """
+    first: int = (page_number - 1) * STARGAZERS_PER_PAGE
+    last: int = min(first + STARGAZERS_PER_PAGE, stars)
+    if markup == "github":
+        before, item, after = _get_github_markup()
+        return before + "".join(item.format(username=get_username(index), name=f"User {index}")
+                                for index in range(first, last)) + after
+    if first >= last:
+        components: typing.List[str] = ['<h3>This repository has no more stargazers.</h3>']
+    else:
+        components = [f'<li class="follow-list-item"><h3 class="follow-list-name">'
+                      f'<span class="css-truncate" title="User {index}">'
+                      f'<a href="/{get_username(index)}">User {index}</a></span></h3></li>'
+                      for index in range(first, last)]
+    return '<html><head><title>Stargazers</title></head><body><ol class="follow-list">' + \
+        "".join(components) + '</ol></body></html>'
+
+
+def render_api_page(stars: int, page_number: int, per_page: int) -> str:
+    first: int = (page_number - 1) * per_page
+    return json.dumps([{"login": get_username(index), "type": "User"}
+                       for index in range(first, min(first + per_page, stars))])
+
+
+def get_api_link_header(url: str, stars: int, page_number: int, per_page: int) -> str:
+    """The `next` and `last` links of the API pagination, as GitHub sends them."""
+    last_page: int = max(1, math.ceil(stars / per_page))
+    links: typing.List[str] = []
+    if page_number < last_page:
+        links.append(f'<{url}?per_page={per_page}&page={page_number + 1}>; rel="next"')
+    links.append(f'<{url}?per_page={per_page}&page={last_page}>; rel="last"')
+    return ", ".join(links)
+
+
+class _StargazersHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urllib.parse.urlsplit(self.path)
+        query: typing.Dict[str, typing.List[str]] = urllib.parse.parse_qs(url.query)
+        page_number: int = int(query.get("page", ["1"])[0])
+        if self.__is_throttled():
+            self.__send(429, "Too Many Requests", headers={"Retry-After": "0"})
+            return
+        if _API_STARGAZERS_PATH.match(url.path):
+            self.__send_api_page(url.path, page_number, int(query.get("per_page", [_API_DEFAULT_PER_PAGE])[0]))
+            return
+        if not _STARGAZERS_PATH.match(url.path):
+            self.__send(404, "Not Found")
+            return
+        time.sleep(self.server.latency)  # type: ignore
+        self.__send(200, render_stargazers_page(self.server.stars, page_number, self.server.markup))  # type: ignore
+
+    def __is_throttled(self) -> bool:
+        with self.server.lock:  # type: ignore
+            self.server.requests += 1  # type: ignore
+            throttle_every: int = self.server.throttle_every  # type: ignore
+            return bool(throttle_every) and self.server.requests % throttle_every == 0  # type: ignore
+
+    def __send_api_page(self, path: str, page_number: int, per_page: int) -> None:
+        token: typing.Optional[str] = self.server.token  # type: ignore
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            self.__send(401, json.dumps({"message": "Bad credentials"}), "application/json")
+            return
+        stars: int = self.server.stars  # type: ignore
+        time.sleep(self.server.latency)  # type: ignore
+        self.__send(200, render_api_page(stars, page_number, per_page), "application/json",
+                    {"Link": get_api_link_header(self.server.url + path, stars, page_number, per_page)})  # type: ignore
+
+    def __send(self, status_code: int, body: str, content_type: str = "text/html",
+               headers: typing.Optional[typing.Dict[str, str]] = None) -> None:
+        content: bytes = body.encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args: typing.Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class StubGitHubServer:
+    """Serve `stars` stargazers for every `/owner/repository/stargazers?page=N` URL, on a free local port,
+    waiting `latency` seconds before answering each page. The same stargazers are listed by the REST API
+    at `/repos/owner/repository/stargazers?per_page=M&page=N`, which requires `token` when it is set.
+
+    The pages are rendered with one of the `MARKUPS`, and every `throttle_every`-th request,
+    if set, is answered 429 Too Many Requests with a `Retry-After: 0` header.
+
+    Use it as a context manager and point `GitHub(..., github_url=server.url)`,
+    or `GitHub(..., engine="api", api_url=server.url)`, to it.
+    """
+
+    def __init__(self, stars: int = 1000, latency: float = 0.0,  # pylint: disable=too-many-arguments
+                 token: typing.Optional[str] = None, markup: str = "minimal", throttle_every: int = 0) -> None:
+        self.__server = _ThreadingHTTPServer(("127.0.0.1", 0), _StargazersHandler)
+        self.__server.stars = stars  # type: ignore
+        self.__server.latency = latency  # type: ignore
+        self.__server.token = token  # type: ignore
+        self.__server.markup = markup  # type: ignore
+        self.__server.throttle_every = throttle_every  # type: ignore
+        self.__server.requests = 0  # type: ignore
+        self.__server.lock = threading.Lock()  # type: ignore
+        self.__server.url = self.url  # type: ignore
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.__server.server_address[1]}"
+
+    @property
+    def requests(self) -> int:
+        """The number of requests answered so far, including the throttled ones."""
+        return self.__server.requests  # type: ignore
+
+    def __enter__(self) -> 'StubGitHubServer':
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -0,0 +1,67 @@
+import json
+import typing
+import urllib.parse
+
+if typing.TYPE_CHECKING:
+    import requests
+
+API_URL: str = "https://api.github.com"
+API_PAGE_SIZE: int = 100
+
+_API_VERSION: str = "2022-11-28"
+_FORBIDDEN_STATUS_CODE: int = 403
+_UNPROCESSABLE_STATUS_CODE: int = 422
+
+
+class ApiResponseError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("GitHub API answered with something other than a list of users.")
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:  # raised again in the parent of a parsing process
+        return type(self), ()
+
+
+class PaginationLimitError(ValueError):
+
+    def __init__(self, repository: str) -> None:
+        super().__init__(f"GitHub API lists only the first stargazers of {repository}, about 400 pages of them. "
+                         f"Use the html engine to list them all.")
+
+
+def get_api_page_url_prefix(username: str, repository: str, api_url: str = API_URL) -> str:
+    """The URL of the REST stargazers endpoint, to be followed by a page number, as in its Link header."""
+    return f"{api_url}/repos/{username}/{repository}/stargazers?per_page={API_PAGE_SIZE}&page="
+
+
+def get_api_headers(token: typing.Optional[str] = None) -> typing.Dict[str, str]:
+    headers: typing.Dict[str, str] = {'Accept': 'application/vnd.github+json', 'X-GitHub-Api-Version': _API_VERSION}
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    return headers
+
+
+def parse_api_page(text: str) -> typing.List[str]:
+    try:
+        return [user["login"] for user in json.loads(text)]
+    except (ValueError, TypeError, KeyError) as error:
+        raise ApiResponseError() from error
+
+
+def is_rate_limited(response: 'requests.Response') -> bool:
+    """The API answers 403 instead of 429 once the hourly rate limit is used up."""
+    return response.status_code == _FORBIDDEN_STATUS_CODE and response.headers.get('X-RateLimit-Remaining') == "0"
+
+
+def is_past_pagination_limit(response: 'requests.Response') -> bool:
+    """The API answers 422 for the pages past the last one it paginates, whatever the number of stargazers."""
+    return response.status_code == _UNPROCESSABLE_STATUS_CODE
+
+
+def get_last_page(response: 'requests.Response') -> typing.Optional[int]:
+    """The page number of the `rel="last"` link of the API pagination, when the response has one."""
+    last_url: typing.Optional[str] = response.links.get('last', {}).get('url')
+    if not last_url:
+        return None
+    page: typing.List[str] = urllib.parse.parse_qs(urllib.parse.urlsplit(last_url).query).get('page', [])
+    return int(page[0]) if page and page[0].isdigit() else None
@@ -0,0 +1,118 @@
+import asyncio
+import collections
+import itertools
+import typing
+
+from github_stargazers.github import ConcurrencyError
+from github_stargazers.github import _extract_user_and_repo, _get_stargazers_base_url, _check_status_code
+from github_stargazers.github import _is_past_last_page, _PAGE_SUFFIX, _GITHUB_URL
+from github_stargazers.parsers import DEFAULT_PARSER, get_parser
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+
+class MissingAsyncHttpClientError(ImportError):
+
+    def __init__(self) -> None:
+        super().__init__("AsyncGitHub requires aiohttp. Install it with `pip install github-stargazers[async]`.")
+
+
+class AsyncGitHub:
+    """Asyncio counterpart of `GitHub`, exposing `get_all_stargazers` and `is_stargazer` as coroutines.
+
+    Pages are requested through an `aiohttp.ClientSession`. Passing the same `session` to many instances
+    lets them share one connection pool; otherwise each instance opens its own session on first use,
+    which is closed by `close()` or by using the instance as an async context manager.
+
+    The pages are parsed and validated exactly like in `GitHub`, with the same `parser` backends,
+    raising the same exceptions.
+    """
+
+    def __init__(self, username_and_repository: str, concurrency: int = 1,  # pylint: disable=too-many-arguments
+                 session: typing.Optional['aiohttp.ClientSession'] = None, github_url: str = _GITHUB_URL,
+                 parser: str = DEFAULT_PARSER) -> None:
+        if aiohttp is None:
+            raise MissingAsyncHttpClientError()
+        self.__username, self.__repository = _extract_user_and_repo(username_and_repository)
+        if concurrency < 1:
+            raise ConcurrencyError()
+        self.__concurrency: int = concurrency
+        self.__parse: typing.Callable[[str], typing.List[str]] = get_parser(parser)
+        self.__stargazers_base_url: str = _get_stargazers_base_url(self.__username, self.__repository, github_url)
+        self.__session: typing.Optional[aiohttp.ClientSession] = session
+        self.__owns_session: bool = session is None
+
+    async def __aenter__(self) -> 'AsyncGitHub':
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self.__owns_session and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def __get_session(self) -> 'aiohttp.ClientSession':
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession()
+        return self.__session
+
+    async def __get_page_text(self, url: str) -> str:
+        async with self.__get_session().get(url, headers={'Content-Type': 'text/html'}) as response:
+            _check_status_code(response.status, self.__username, self.__repository)
+            return await response.text()
+
+    async def __extract_stargazers_from_url(self, url: str) -> typing.List[str]:
+        return self.__parse(await self.__get_page_text(url))
+
+    def __get_url_page_template(self, page_number: int) -> str:
+        return self.__stargazers_base_url + _PAGE_SUFFIX + str(page_number)
+
+    async def __fetch_pages(self) -> typing.AsyncGenerator[typing.List[str], None]:
+        """Yield the stargazers of every page, in page order, keeping up to `concurrency` requests in flight."""
+        pending: typing.Deque[asyncio.Future] = collections.deque()
+        page_numbers: typing.Iterator[int] = itertools.count(1)
+        try:
+            while True:
+                while len(pending) < self.__concurrency:
+                    current_url: str = self.__get_url_page_template(next(page_numbers))
+                    pending.append(asyncio.ensure_future(self.__extract_stargazers_from_url(current_url)))
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def __iter_pages(self) -> typing.AsyncGenerator[typing.List[str], None]:
+        previous_stargazers: typing.List[str] = []
+        pages = self.__fetch_pages()
+        try:
+            async for current_stargazers in pages:
+                if _is_past_last_page(current_stargazers, previous_stargazers):
+                    break
+                yield current_stargazers
+                previous_stargazers = current_stargazers
+        finally:
+            await pages.aclose()
+
+    async def get_all_stargazers(self) -> typing.List[str]:
+        all_stargazers: typing.List[str] = []
+        async for current_stargazers in self.__iter_pages():
+            all_stargazers += current_stargazers
+
+        return sorted(all_stargazers)
+
+    async def is_stargazer(self, user: str) -> bool:
+        pages = self.__iter_pages()
+        try:
+            async for current_stargazers in pages:
+                if user in current_stargazers:
+                    return True
+        finally:
+            await pages.aclose()
+
+        return False
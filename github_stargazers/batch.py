@@ -0,0 +1,151 @@
+import concurrent.futures
+import csv
+import json
+import os
+import typing
+
+import requests
+
+from github_stargazers.api import ApiResponseError, PaginationLimitError
+from github_stargazers.github import GitHub, HTTPError
+from github_stargazers.github import UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError
+from github_stargazers.incremental import SnapshotFormatError, SnapshotMismatchError, StargazersDelta
+from github_stargazers.parsers import MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError
+from github_stargazers.parsers import MissingParserDependencyError, ParserError
+
+REPOSITORY_ERRORS: typing.Tuple[typing.Type[Exception], ...] = (
+    UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError, HTTPError, SnapshotFormatError,
+    SnapshotMismatchError, MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError, ApiResponseError,
+    PaginationLimitError, MissingParserDependencyError, ParserError, requests.RequestException,
+)
+
+
+class RepositoryResult(typing.NamedTuple):
+    """The outcome of listing the stargazers of a repository, or of checking whether `user` starred it.
+
+    On failure, `error` holds the name of the exception class, e.g. `UrlNotFoundError`, and `message` its message.
+    """
+    repository: str
+    user: typing.Optional[str] = None
+    stargazers: typing.Optional[typing.List[str]] = None
+    is_stargazer: typing.Optional[bool] = None
+    error: typing.Optional[str] = None
+    message: typing.Optional[str] = None
+
+    def to_record(self) -> typing.Dict[str, typing.Any]:
+        record: typing.Dict[str, typing.Any] = {"repository": self.repository}
+        if self.user is not None:
+            record.update(user=self.user, is_stargazer=self.is_stargazer)
+        else:
+            record.update(count=None if self.stargazers is None else len(self.stargazers), stargazers=self.stargazers)
+        record.update(error=self.error, message=self.message)
+        return record
+
+
+def read_repositories(lines: typing.Iterable[str]) -> typing.List[str]:
+    """Return the `username/repository` of every line, skipping the blank ones and the '#' comments."""
+    repositories: typing.List[str] = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            repositories.append(line)
+    return repositories
+
+
+def process_repository(github_factory: typing.Callable[[str], GitHub], repository: str,
+                       user: typing.Optional[str] = None) -> RepositoryResult:
+    try:
+        github: GitHub = github_factory(repository)
+        if user:
+            return RepositoryResult(repository, user=user, is_stargazer=github.is_stargazer(user))
+        return RepositoryResult(repository, stargazers=github.get_all_stargazers())
+    except REPOSITORY_ERRORS as exception:
+        return RepositoryResult(repository, user=user, error=type(exception).__name__, message=str(exception))
+
+
+def process_repositories(github_factory: typing.Callable[[str], GitHub], repositories: typing.Iterable[str],
+                         user: typing.Optional[str] = None, workers: int = 1) -> typing.Iterator[RepositoryResult]:
+    """Yield the result of every repository, in the given order, crawling up to `workers` of them at once.
+
+    The `github_factory` should build all the `GitHub` instances on the same session, and scheduler if any,
+    so that every repository shares the connection pool and the limits.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(lambda repository: process_repository(github_factory, repository, user),
+                                repositories)
+
+
+def write_jsonl(results: typing.Iterable[RepositoryResult], output: typing.TextIO) -> None:
+    for result in results:
+        output.write(json.dumps(result.to_record()) + "\n")
+        output.flush()
+
+
+def write_csv(results: typing.Iterable[RepositoryResult], output: typing.TextIO) -> None:
+    """Write a row per repository, the stargazers being separated by spaces, which usernames cannot contain."""
+    writer = None
+    for result in results:
+        record: typing.Dict[str, typing.Any] = result.to_record()
+        if record.get("stargazers") is not None:
+            record["stargazers"] = " ".join(record["stargazers"])
+        if writer is None:
+            writer = csv.DictWriter(output, fieldnames=list(record), lineterminator="\n")
+            writer.writeheader()
+        writer.writerow(record)
+        output.flush()
+
+
+class RepositoryDelta(typing.NamedTuple):
+    """The stargazers added to and removed from a repository since its snapshot, or the error of its crawl."""
+    repository: str
+    delta: typing.Optional[StargazersDelta] = None
+    error: typing.Optional[str] = None
+    message: typing.Optional[str] = None
+
+    def to_records(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        if self.delta is None:
+            yield {"repository": self.repository, "error": self.error, "message": self.message}
+            return
+        for change, users in (("added", self.delta.added), ("removed", self.delta.removed)):
+            for user in users:
+                yield {"repository": self.repository, "change": change, "user": user}
+
+
+def get_snapshot_path(snapshot_dir: str, repository: str) -> str:
+    """Return `snapshot_dir/username/repository.json`, creating the directory of the username if needed."""
+    username, repository_name = repository.strip("/").split("/")
+    os.makedirs(os.path.join(snapshot_dir, username), exist_ok=True)
+    return os.path.join(snapshot_dir, username, repository_name + ".json")
+
+
+def process_delta(github_factory: typing.Callable[[str], GitHub], repository: str,
+                  snapshot_dir: str) -> RepositoryDelta:
+    try:
+        github: GitHub = github_factory(repository)
+        return RepositoryDelta(repository, github.get_stargazers_delta(get_snapshot_path(snapshot_dir, repository)))
+    except REPOSITORY_ERRORS as exception:
+        return RepositoryDelta(repository, error=type(exception).__name__, message=str(exception))
+
+
+def process_deltas(github_factory: typing.Callable[[str], GitHub], repositories: typing.Iterable[str],
+                   snapshot_dir: str, workers: int = 1) -> typing.Iterator[RepositoryDelta]:
+    """Yield the delta of every repository since its snapshot in `snapshot_dir`, in the given order,
+    like `process_repositories`.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(lambda repository: process_delta(github_factory, repository, snapshot_dir),
+                                repositories)
+
+
+def write_deltas_jsonl(deltas: typing.Iterable[RepositoryDelta], output: typing.TextIO) -> None:
+    """Write a line per stargazer added or removed, and per repository failing, as soon as a repository is done."""
+    for delta in deltas:
+        for record in delta.to_records():
+            output.write(json.dumps(record) + "\n")
+        output.flush()
+
+
+OUTPUT_WRITERS: typing.Dict[str, typing.Callable[[typing.Iterable[RepositoryResult], typing.TextIO], None]] = {
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+}
@@ -0,0 +1,107 @@
+import hashlib
+import math
+import mmap
+import struct
+import typing
+
+from github_stargazers.incremental import SnapshotFormatError
+
+
+class FalsePositiveRateError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("False positive rate should be between 0 and 1, excluded.")
+
+
+# magic, version, number of hash functions, number of bits, number of usernames added
+_BLOOM_HEADER: struct.Struct = struct.Struct("<8sIIQQ")
+_BLOOM_MAGIC: bytes = b"GHBLOOM\0"
+_BLOOM_VERSION: int = 1
+
+
+def _map_bloom_filter(path: str) -> typing.Tuple[memoryview, int, int, int]:
+    with open(path, "rb") as bloom_file:
+        try:
+            mapped: memoryview = memoryview(mmap.mmap(bloom_file.fileno(), 0, access=mmap.ACCESS_READ))
+        except ValueError as error:  # an empty file cannot be mapped
+            raise SnapshotFormatError(path) from error
+    if len(mapped) < _BLOOM_HEADER.size:
+        raise SnapshotFormatError(path)
+    magic, version, hash_count, bit_count, count = _BLOOM_HEADER.unpack_from(mapped)
+    if magic != _BLOOM_MAGIC or version != _BLOOM_VERSION or hash_count < 1 or bit_count < 1 \
+            or len(mapped) != _BLOOM_HEADER.size + (bit_count + 7) // 8:
+        raise SnapshotFormatError(path)
+    return mapped[_BLOOM_HEADER.size:], hash_count, bit_count, count
+
+
+class BloomFilter:
+    """A probabilistic set of usernames, answering whether a user starred a repository in a few bytes
+    per stargazer, e.g. 1.2 bytes for a false positive rate of 1%, instead of the whole usernames.
+
+    A username not in the filter is certainly not a stargazer, while one in the filter is a stargazer
+    with a probability of `1 - false_positive_rate`, hence should be confirmed against the exact stargazers.
+    The filter knows only the stargazers it was built from, so it does not know the newer ones.
+
+    `save` writes the bits after a small header, and `load` memory-maps them, like `compact.CompactStargazers`.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01) -> None:
+        if not 0 < false_positive_rate < 1:
+            raise FalsePositiveRateError()
+        capacity = max(capacity, 1)
+        self.__bit_count: int = max(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.__hash_count: int = max(round(self.__bit_count / capacity * math.log(2)), 1)
+        self.__bits: typing.Union[bytearray, memoryview] = bytearray((self.__bit_count + 7) // 8)
+        self.__count: int = 0
+
+    @classmethod
+    def from_stargazers(cls, stargazers: typing.Collection[str], false_positive_rate: float = 0.01) -> 'BloomFilter':
+        """Build a filter sized for the `stargazers`, e.g. the result of `GitHub.get_compact_stargazers()`."""
+        bloom_filter: 'BloomFilter' = cls(len(stargazers), false_positive_rate)
+        for username in stargazers:
+            bloom_filter.add(username)
+        return bloom_filter
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        bloom_filter: 'BloomFilter' = cls.__new__(cls)
+        bloom_filter.__bits, bloom_filter.__hash_count, bloom_filter.__bit_count, bloom_filter.__count = \
+            _map_bloom_filter(path)
+        return bloom_filter
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as bloom_file:
+            bloom_file.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, _BLOOM_VERSION, self.__hash_count, self.__bit_count,
+                                                self.__count))
+            bloom_file.write(self.__bits)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.__bits)
+
+    def __get_positions(self, username: str) -> typing.Iterator[int]:
+        """The bits of `username`, derived from the two halves of a single hash (Kirsch and Mitzenmacher)."""
+        digest: bytes = hashlib.blake2b(username.encode(), digest_size=16).digest()
+        first_hash: int = int.from_bytes(digest[:8], "little")
+        second_hash: int = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.__hash_count):
+            yield (first_hash + index * second_hash) % self.__bit_count
+
+    def add(self, username: str) -> None:
+        if isinstance(self.__bits, memoryview):
+            raise TypeError("A loaded BloomFilter is read-only.")
+        for position in self.__get_positions(username):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+        self.__count += 1
+
+    def __contains__(self, username: object) -> bool:
+        if not isinstance(username, str):
+            return False
+        return all(self.__bits[position >> 3] & (1 << (position & 7)) for position in self.__get_positions(username))
+
+    def __len__(self) -> int:
+        """The number of usernames added, counting the duplicates."""
+        return self.__count
+
+    def __repr__(self) -> str:
+        return f"BloomFilter({self.__count} usernames, {self.nbytes} bytes, {self.__hash_count} hashes)"
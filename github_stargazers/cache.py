@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+
+
+class CacheTtlError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("Cache TTL should be a non-negative number of seconds.")
+
+
+class CachedPage(typing.NamedTuple):
+    text: str
+    etag: typing.Optional[str]
+    last_modified: typing.Optional[str]
+    stored_at: float
+
+
+class CacheStats(typing.NamedTuple):
+    hits: int
+    revalidations: int
+    misses: int
+
+    def __str__(self) -> str:
+        return f"Cache: {self.hits} hits, {self.revalidations} revalidated, {self.misses} misses."
+
+
+class PageCache:
+    """Keeps the downloaded pages in `directory`, one JSON file per URL, so that they are not downloaded again.
+
+    A page younger than `ttl` seconds is served without any request. An older one is revalidated
+    with a conditional request using its ETag and Last-Modified headers, which costs no download
+    when GitHub answers 304 Not Modified. When the files grow over `max_size` bytes, the least
+    recently stored pages are evicted.
+    """
+    __DEFAULT_TTL: float = 3600.0
+    __DEFAULT_MAX_SIZE: int = 100 * 1024 * 1024
+    __FILE_SUFFIX: str = ".json"
+
+    def __init__(self, directory: str, ttl: float = __DEFAULT_TTL, max_size: int = __DEFAULT_MAX_SIZE) -> None:
+        if ttl < 0:
+            raise CacheTtlError()
+        self.__directory: str = directory
+        self.__ttl: float = ttl
+        self.__max_size: int = max_size
+        self.__lock: threading.Lock = threading.Lock()
+        self.__hits: int = 0
+        self.__revalidations: int = 0
+        self.__misses: int = 0
+        os.makedirs(directory, exist_ok=True)
+        self.__size: int = sum(os.path.getsize(path) for path in self.__list_files())
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self.__hits, self.__revalidations, self.__misses)
+
+    def __list_files(self) -> typing.List[str]:
+        return [os.path.join(self.__directory, name) for name in os.listdir(self.__directory)
+                if name.endswith(self.__FILE_SUFFIX)]
+
+    def __get_path(self, url: str) -> str:
+        return os.path.join(self.__directory, hashlib.sha256(url.encode()).hexdigest() + self.__FILE_SUFFIX)
+
+    def get(self, url: str) -> typing.Optional[CachedPage]:
+        try:
+            with open(self.__get_path(url), encoding="utf-8") as cache_file:
+                return CachedPage(**json.load(cache_file))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.stored_at < self.__ttl
+
+    def get_conditional_headers(self, page: CachedPage) -> typing.Dict[str, str]:
+        headers: typing.Dict[str, str] = {}
+        if page.etag:
+            headers['If-None-Match'] = page.etag
+        if page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+        return headers
+
+    def record_hit(self) -> None:
+        with self.__lock:
+            self.__hits += 1
+
+    def record_revalidation(self, url: str, page: CachedPage) -> None:
+        with self.__lock:
+            self.__revalidations += 1
+        self.__write(url, page._replace(stored_at=time.time()))
+
+    def put(self, url: str, text: str, etag: typing.Optional[str], last_modified: typing.Optional[str]) -> None:
+        with self.__lock:
+            self.__misses += 1
+        self.__write(url, CachedPage(text, etag, last_modified, time.time()))
+
+    def __write(self, url: str, page: CachedPage) -> None:
+        path: str = self.__get_path(url)
+        temporary_path: str = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as cache_file:
+            json.dump(page._asdict(), cache_file)
+        with self.__lock:
+            previous_size: int = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temporary_path, path)
+            self.__size += os.path.getsize(path) - previous_size
+            if self.__size > self.__max_size:
+                self.__evict()
+
+    def __evict(self) -> None:
+        for path in sorted(self.__list_files(), key=os.path.getmtime):
+            if self.__size <= self.__max_size:
+                break
+            self.__size -= os.path.getsize(path)
+            os.remove(path)
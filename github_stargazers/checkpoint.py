@@ -0,0 +1,86 @@
+import json
+import os
+import typing
+
+from github_stargazers.incremental import SnapshotFormatError
+
+
+class CheckpointMismatchError(ValueError):
+
+    def __init__(self, path: str) -> None:
+        super().__init__(f"'{path}' is the checkpoint of another crawl.")
+
+
+class CrawlCheckpoint:
+    """The progress of a crawl, appended to a JSON lines file every `every` pages, so that a crawl
+    failing on a page, e.g. throttled by GitHub, can resume after the last pages saved.
+
+    The first line identifies the crawl by the `url` its pages start with, and every following line
+    holds a batch of pages: the number of its last page, the stargazers of that page, which tell
+    the end of the stargazers when GitHub repeats them, and all the stargazers of the batch.
+    A line cut short, e.g. by a crash while writing it, is ignored.
+    """
+    __VERSION: int = 1
+
+    def __init__(self, path: str, url: str, every: int = 100, resume: bool = False) -> None:
+        self.__path: str = path
+        self.__every: int = every
+        self.__pending: typing.List[typing.List[str]] = []
+        self.page_number: int = 0
+        self.previous_page: typing.List[str] = []
+        self.stargazers: typing.List[str] = []
+        if resume and os.path.exists(path):
+            self.__load(url)
+        header: typing.Dict[str, typing.Any] = {"version": self.__VERSION, "url": url}
+        with open(path, "w", encoding="utf-8") as checkpoint_file:  # also drops any line cut short
+            checkpoint_file.write(json.dumps(header) + "\n")
+            if self.page_number:
+                checkpoint_file.write(self.__format_batch(self.stargazers) + "\n")
+
+    def __load(self, url: str) -> None:
+        with open(self.__path, encoding="utf-8") as checkpoint_file:
+            lines: typing.List[str] = checkpoint_file.read().splitlines()
+        try:
+            header: typing.Any = json.loads(lines[0]) if lines else None
+        except ValueError as error:
+            raise SnapshotFormatError(self.__path) from error
+        if not isinstance(header, dict) or header.get("version") != self.__VERSION:
+            raise SnapshotFormatError(self.__path)
+        if header.get("url") != url:
+            raise CheckpointMismatchError(self.__path)
+        for line in lines[1:]:
+            try:
+                batch: typing.Dict[str, typing.Any] = json.loads(line)
+            except ValueError:
+                break
+            self.page_number, self.previous_page = batch["page"], batch["previous_page"]
+            self.stargazers += batch["stargazers"]
+
+    def __format_batch(self, stargazers: typing.List[str]) -> str:
+        return json.dumps({"page": self.page_number, "previous_page": self.previous_page, "stargazers": stargazers})
+
+    def record(self, page: typing.List[str]) -> None:
+        """Record the stargazers of the page following the last one, adding them to `stargazers`,
+        and saving them with the pages before if there are `every` of them.
+        """
+        self.__pending.append(page)
+        self.stargazers += page
+        self.page_number += 1
+        self.previous_page = page
+        if len(self.__pending) >= self.__every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.__pending:
+            return
+        stargazers: typing.List[str] = [user for page in self.__pending for user in page]
+        with open(self.__path, "a", encoding="utf-8") as checkpoint_file:
+            checkpoint_file.write(self.__format_batch(stargazers) + "\n")
+        self.__pending = []
+
+    def remove(self) -> None:
+        """Remove the checkpoint of a crawl gone through all the pages."""
+        try:
+            os.remove(self.__path)
+        except FileNotFoundError:
+            pass
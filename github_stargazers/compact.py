@@ -0,0 +1,182 @@
+import array
+import collections.abc
+import mmap
+import struct
+import sys
+import typing
+
+from github_stargazers.incremental import SnapshotFormatError
+
+
+class UnsortedUsernamesError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("Usernames should be sorted.")
+
+
+# magic, version, bytes per offset, number of usernames, bytes of usernames; 32 bytes keep the offsets aligned
+_SNAPSHOT_HEADER: struct.Struct = struct.Struct("<8sIIQQ")
+_SNAPSHOT_MAGIC: bytes = b"GHSTARS\0"
+_SNAPSHOT_VERSION: int = 1
+
+
+def _pack(sorted_usernames: typing.Iterable[str]) -> typing.Tuple[bytes, array.array]:
+    """Concatenate the encoded usernames, skipping the duplicates, and return them with their offsets."""
+    buffer: bytearray = bytearray()
+    offsets: array.array = array.array('Q', [0])
+    previous: typing.Optional[bytes] = None
+    for username in sorted_usernames:
+        encoded: bytes = username.encode()
+        if previous is not None and encoded <= previous:
+            if encoded == previous:
+                continue
+            raise UnsortedUsernamesError()
+        buffer += encoded
+        offsets.append(len(buffer))
+        previous = encoded
+    if len(buffer) < 2 ** 32:
+        offsets = array.array('I', offsets)
+    return bytes(buffer), offsets
+
+
+def _map_snapshot(path: str) -> typing.Tuple[memoryview, typing.Sequence[int]]:
+    with open(path, "rb") as snapshot_file:
+        try:
+            mapped: memoryview = memoryview(mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ))
+        except ValueError as error:  # an empty file cannot be mapped
+            raise SnapshotFormatError(path) from error
+    if len(mapped) < _SNAPSHOT_HEADER.size:
+        raise SnapshotFormatError(path)
+    magic, version, itemsize, count, buffer_size = _SNAPSHOT_HEADER.unpack_from(mapped)
+    buffer_start: int = _SNAPSHOT_HEADER.size + itemsize * (count + 1)
+    if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION or itemsize not in (4, 8) \
+            or len(mapped) != buffer_start + buffer_size:
+        raise SnapshotFormatError(path)
+
+    raw_offsets: memoryview = mapped[_SNAPSHOT_HEADER.size:buffer_start]
+    offsets: typing.Sequence[int] = raw_offsets.cast('I') if itemsize == 4 else raw_offsets.cast('Q')
+    if sys.byteorder != "little":
+        swapped_offsets: array.array = array.array('I' if itemsize == 4 else 'Q', raw_offsets.tobytes())
+        swapped_offsets.byteswap()
+        offsets = swapped_offsets
+    return mapped[buffer_start:], offsets
+
+
+class CompactStargazers(typing.Sequence[str], typing.AbstractSet[str]):
+    """A read-only, sorted and deduplicated collection of usernames, behaving both as a list and as a set.
+
+    All the usernames are concatenated, UTF-8 encoded, in a single bytes buffer, and an array holds
+    the offset where each one starts, so a username costs its length plus a few bytes, instead of the
+    fifty bytes of overhead of a `str` object and the pointer of a list or the slot of a set.
+    Membership is checked by binary search, in O(log n).
+
+    `save` writes the same layout to a binary snapshot after a small header, and `load` memory-maps it,
+    so that other processes check stargazers without reading, copying nor parsing the whole file.
+    """
+
+    def __init__(self, usernames: typing.Iterable[str] = ()) -> None:
+        self.__buffer: typing.Union[bytes, memoryview]
+        self.__offsets: typing.Sequence[int]
+        self.__buffer, self.__offsets = _pack(sorted(set(usernames)))
+
+    @classmethod
+    def from_sorted(cls, usernames: typing.Iterable[str]) -> 'CompactStargazers':
+        """Build the collection from already sorted `usernames`, e.g. `GitHub.iter_sorted_stargazers()`,
+        without ever holding them all as `str` objects.
+        """
+        compact: 'CompactStargazers' = cls.__new__(cls)
+        compact.__buffer, compact.__offsets = _pack(usernames)
+        return compact
+
+    @classmethod
+    def load(cls, path: str) -> 'CompactStargazers':
+        """Memory-map the snapshot saved at `path`, in constant time whatever the number of usernames."""
+        compact: 'CompactStargazers' = cls.__new__(cls)
+        compact.__buffer, compact.__offsets = _map_snapshot(path)
+        return compact
+
+    def save(self, path: str) -> None:
+        itemsize: int = 4 if self.__offsets[-1] < 2 ** 32 else 8
+        offsets: array.array = array.array('I' if itemsize == 4 else 'Q', self.__offsets)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, itemsize, len(self),
+                                                      len(self.__buffer)))
+            snapshot_file.write(offsets.tobytes())
+            snapshot_file.write(self.__buffer)
+
+    @classmethod
+    def _from_iterable(cls, iterable: typing.Iterable[str]) -> 'CompactStargazers':  # type: ignore
+        """Used by the `&`, `|`, `-` and `^` operators of `collections.abc.Set`."""
+        return cls(iterable)
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes used by the usernames and their offsets."""
+        offsets_itemsize: int = self.__offsets.itemsize  # type: ignore
+        return len(self.__buffer) + offsets_itemsize * len(self.__offsets)
+
+    def __get_encoded(self, index: int) -> bytes:
+        return bytes(self.__buffer[self.__offsets[index]:self.__offsets[index + 1]])
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    @typing.overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.List[str]:
+        ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Union[str, typing.List[str]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompactStargazers index out of range")
+        return self.__get_encoded(index).decode()
+
+    def __iter__(self) -> typing.Iterator[str]:
+        for index in range(len(self)):
+            yield self.__get_encoded(index).decode()
+
+    def __bisect(self, encoded: bytes) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            middle: int = (low + high) // 2
+            if self.__get_encoded(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __contains__(self, username: object) -> bool:
+        if not isinstance(username, str):
+            return False
+        encoded: bytes = username.encode()
+        index: int = self.__bisect(encoded)
+        return index < len(self) and self.__get_encoded(index) == encoded
+
+    def index(self, value: typing.Any, start: int = 0, stop: typing.Optional[int] = None) -> int:
+        if value in self:
+            index: int = self.__bisect(value.encode())
+            if start <= index < (len(self) if stop is None else stop):
+                return index
+        raise ValueError(f"{value!r} is not in CompactStargazers")
+
+    def count(self, value: typing.Any) -> int:
+        return int(value in self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return collections.abc.Set.__eq__(self, other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"CompactStargazers({len(self)} usernames, {self.nbytes} bytes)"
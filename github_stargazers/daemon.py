@@ -0,0 +1,189 @@
+import collections
+import concurrent.futures
+import http.server
+import json
+import re
+import threading
+import time
+import typing
+import urllib.parse
+
+from github_stargazers.batch import REPOSITORY_ERRORS, RepositoryResult
+from github_stargazers.compact import CompactStargazers
+from github_stargazers.github import GitHub, UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError
+from github_stargazers.single_flight import SingleFlight
+
+_REPOSITORY_PATH = re.compile(r"^/repos/(?P<repository>[^/]+/[^/]+)/(?P<endpoint>stargazers|is_stargazer)$")
+_ERROR_STATUS_CODES: typing.Dict[typing.Type[Exception], int] = {
+    UsernameRepositoryError: 400,
+    UrlNotFoundError: 404,
+    TooManyRequestsHttpError: 503,
+}
+_DEFAULT_ERROR_STATUS_CODE: int = 502
+
+
+class _Entry(typing.NamedTuple):
+    stargazers: CompactStargazers
+    crawled_at: float
+
+
+class StargazersDaemon:
+    """Keeps the stargazers of the `max_repositories` most recently asked repositories in memory,
+    evicting the least recently used one beyond, and crawls each of them again once it is older than
+    `refresh_interval` seconds, in a background thread, while the previous stargazers are still served.
+
+    Concurrent requests for a repository being crawled wait for that crawl instead of starting their own.
+    """
+
+    def __init__(self, github_factory: typing.Callable[[str], GitHub], max_repositories: int = 128,
+                 refresh_interval: float = 3600.0, clock: typing.Callable[[], float] = time.time) -> None:
+        self.__github_factory: typing.Callable[[str], GitHub] = github_factory
+        self.__max_repositories: int = max_repositories
+        self.__refresh_interval: float = refresh_interval
+        self.__clock: typing.Callable[[], float] = clock
+
+        self.__lock: threading.Lock = threading.Lock()
+        self.__entries: typing.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self.__crawls: SingleFlight = SingleFlight(ttl=0.0)
+        self.__stopped: threading.Event = threading.Event()
+        self.__refresher: typing.Optional[threading.Thread] = None
+
+    @property
+    def repositories(self) -> typing.List[str]:
+        """The repositories in memory, the least recently used first."""
+        with self.__lock:
+            return list(self.__entries)
+
+    def __crawl(self, repository: str) -> CompactStargazers:
+        """Crawl `repository`, or wait for the crawl of it already running, and keep its stargazers."""
+        def crawl() -> CompactStargazers:
+            stargazers: CompactStargazers = self.__github_factory(repository).get_compact_stargazers()
+            with self.__lock:
+                self.__entries[repository] = _Entry(stargazers, self.__clock())  # a refresh keeps its place
+                while len(self.__entries) > self.__max_repositories:
+                    self.__entries.popitem(last=False)
+            return stargazers
+
+        return self.__crawls.call(repository, crawl)[0]
+
+    def get_stargazers(self, repository: str) -> CompactStargazers:
+        with self.__lock:
+            entry: typing.Optional[_Entry] = self.__entries.get(repository)
+            if entry is not None:
+                self.__entries.move_to_end(repository)
+                return entry.stargazers
+        return self.__crawl(repository)
+
+    def is_stargazer(self, repository: str, user: str) -> bool:
+        return user in self.get_stargazers(repository)
+
+    def __preload(self, repository: str) -> typing.Optional[RepositoryResult]:
+        try:
+            self.get_stargazers(repository)
+        except REPOSITORY_ERRORS as exception:
+            return RepositoryResult(repository, error=type(exception).__name__, message=str(exception))
+        return None
+
+    def preload(self, repositories: typing.Iterable[str], workers: int = 1) -> typing.List[RepositoryResult]:
+        """Crawl up to `workers` of the `repositories` at once and return the results of the failed ones."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return [failure for failure in executor.map(self.__preload, repositories) if failure]
+
+    def __get_stale_repositories(self) -> typing.List[str]:
+        refreshed_before: float = self.__clock() - self.__refresh_interval
+        with self.__lock:
+            return [repository for repository, entry in self.__entries.items() if entry.crawled_at <= refreshed_before]
+
+    def refresh(self) -> None:
+        """Crawl again the repositories older than `refresh_interval`, keeping the previous stargazers
+        of the ones failing until the next refresh.
+        """
+        for repository in self.__get_stale_repositories():
+            try:
+                self.__crawl(repository)
+            except REPOSITORY_ERRORS:
+                with self.__lock:
+                    entry: typing.Optional[_Entry] = self.__entries.get(repository)
+                    if entry is not None:
+                        self.__entries[repository] = entry._replace(crawled_at=self.__clock())
+
+    def __get_refresh_delay(self) -> float:
+        with self.__lock:
+            oldest_crawl: float = min((entry.crawled_at for entry in self.__entries.values()), default=self.__clock())
+        return max(0.0, oldest_crawl + self.__refresh_interval - self.__clock())
+
+    def __refresh_forever(self) -> None:
+        while not self.__stopped.wait(self.__get_refresh_delay()):
+            self.refresh()
+
+    def start(self) -> None:
+        """Start refreshing the repositories in a background thread."""
+        self.__stopped.clear()
+        self.__refresher = threading.Thread(target=self.__refresh_forever, daemon=True)
+        self.__refresher.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        if self.__refresher:
+            self.__refresher.join()
+            self.__refresher = None
+
+
+class _DaemonHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urllib.parse.urlsplit(self.path)
+        match: typing.Optional[typing.Match[str]] = _REPOSITORY_PATH.match(url.path)
+        if not match:
+            self.__send(404, {"error": "NotFound", "message": f"No such endpoint {url.path}."})
+            return
+        repository: str = match.group("repository")
+        user: typing.Optional[str] = urllib.parse.parse_qs(url.query).get("user", [None])[0]
+        is_stargazer_endpoint: bool = match.group("endpoint") == "is_stargazer"
+        if is_stargazer_endpoint and not user:
+            self.__send(400, {"error": "MissingUserError", "message": "The user query parameter is required."})
+            return
+
+        daemon: StargazersDaemon = typing.cast(_StargazersHTTPServer, self.server).stargazers_daemon
+        try:
+            stargazers: CompactStargazers = daemon.get_stargazers(repository)
+        except REPOSITORY_ERRORS as exception:
+            self.__send(_ERROR_STATUS_CODES.get(type(exception), _DEFAULT_ERROR_STATUS_CODE),
+                        {"error": type(exception).__name__, "message": str(exception)})
+            return
+        if is_stargazer_endpoint:
+            self.__send(200, {"repository": repository, "user": user, "is_stargazer": user in stargazers})
+        else:
+            self.__send(200, list(stargazers))
+
+    def __send(self, status_code: int, body: typing.Any) -> None:
+        content: bytes = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args: typing.Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+class _StargazersHTTPServer(http.server.ThreadingHTTPServer):
+    """Answers from the `stargazers_daemon`, each request in its own daemon thread."""
+
+    def __init__(self, address: typing.Tuple[str, int], stargazers_daemon: StargazersDaemon) -> None:
+        super().__init__(address, _DaemonHandler)
+        self.stargazers_daemon: StargazersDaemon = stargazers_daemon
+
+
+def create_server(daemon: StargazersDaemon, host: str = "127.0.0.1", port: int = 8080) -> http.server.HTTPServer:
+    """An HTTP server answering from `daemon`, each request in its own thread, once `serve_forever` is called:
+
+    - `GET /repos/{owner}/{repository}/stargazers`, the sorted stargazers as a JSON array;
+    - `GET /repos/{owner}/{repository}/is_stargazer?user={user}`, a JSON object with an `is_stargazer` boolean.
+
+    The errors are JSON objects with the `error` class name and its `message`, e.g. a 404 status
+    for a repository not found, 503 when GitHub throttles the crawl, and 502 for the other failures.
+    """
+    return _StargazersHTTPServer((host, port), daemon)
@@ -1,10 +1,28 @@
+import collections
+import concurrent.futures
+import itertools
 import os
-import re
+import time
 import typing
 
-from bs4 import BeautifulSoup
-from bs4 import element
-import requests
+if typing.TYPE_CHECKING:
+    import requests
+
+from github_stargazers.parsers import (  # pylint: disable=unused-import
+    MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError)
+from github_stargazers.api import API_PAGE_SIZE, API_URL, get_api_headers, get_api_page_url_prefix
+from github_stargazers.api import PaginationLimitError, get_last_page, is_past_pagination_limit, is_rate_limited
+from github_stargazers.api import parse_api_page
+from github_stargazers.bloom import BloomFilter
+from github_stargazers.cache import CachedPage, PageCache
+from github_stargazers.checkpoint import CrawlCheckpoint
+from github_stargazers.compact import CompactStargazers
+from github_stargazers.incremental import PagesSnapshot, StargazersDelta, diff_sorted_stargazers, fingerprint_page
+from github_stargazers.instrumentation import PageMetrics
+from github_stargazers.parsers import DEFAULT_PARSER, get_parser, parse_display_names
+from github_stargazers.scheduler import RequestScheduler
+from github_stargazers.single_flight import SingleFlight
+from github_stargazers.sorting import sort_with_bounded_memory
 
 
 class UsernameRepositoryError(ValueError):
@@ -13,6 +31,18 @@ class UsernameRepositoryError(ValueError):
         super().__init__("Argument should be of form username/repository.")
 
 
+class ConcurrencyError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("Concurrency should be a positive integer.")
+
+
+class EngineError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__(f"Engine should be one of: {', '.join(ENGINES)}.")
+
+
 class TooManyRequestsHttpError(Exception):
 
     def __init__(self) -> None:
@@ -31,148 +61,501 @@ class HTTPError(Exception):
         super().__init__("{} HTTP.".format(status_code))
 
 
-class MissingHyperlinkTagError(Exception):
+_GITHUB_URL: str = "https://github.com"
+_STARGAZERS_URL_SUFFIX: str = "/stargazers"
+_PAGE_SUFFIX: str = "?page="
 
-    def __init__(self) -> None:
-        super().__init__("Missing hyperlink tag.")
+HTML_ENGINE: str = "html"
+API_ENGINE: str = "api"
+ENGINES: typing.Tuple[str, ...] = (HTML_ENGINE, API_ENGINE)
 
+_DEFAULT_POOL_SIZE: int = 10
+_DEFAULT_RUN_SIZE: int = 100000
 
-class MissingHrefAttributeError(Exception):
+_OK_STATUS_CODE: int = 200
+_NOT_MODIFIED_STATUS_CODE: int = 304
+_TOO_MANY_REQUESTS_STATUS_CODE: int = 429
+_NOT_FOUND_STATUS_CODE: int = 404
 
-    def __init__(self) -> None:
-        super().__init__("Missing 'href' attribute from hyperlink tag.")
 
+def _extract_user_and_repo(username_and_repository: str) -> typing.Tuple[str, str]:
+    components: typing.List[str] = username_and_repository.split("/")
+    if len(components) != 2:
+        raise UsernameRepositoryError()
+    for component in components:
+        if component == "":
+            raise UsernameRepositoryError()
 
-class HrefContentError(Exception):
+    return components[0], components[1]
 
-    def __init__(self, href_content: str) -> None:
-        super().__init__(f"Wrong 'href' content: '{href_content}'. It should be of form /username.")
 
+def _get_stargazers_base_url(username: str, repository: str, github_url: str = _GITHUB_URL) -> str:
+    return os.path.join(github_url, username, repository) + _STARGAZERS_URL_SUFFIX
 
-class GitHub:
-    """Creates a GitHub instance for listing the stargazers of a given repository
-    and checking if a user's full name is in the list of stargazers.
 
-    The constructor requires a string of the following form: `username/repository`,
-    both representing the GitHub meaning of them.
+def create_session(pool_size: int = _DEFAULT_POOL_SIZE) -> 'requests.Session':
+    """Create a `requests.Session` keeping alive up to `pool_size` connections per host and asking for
+    compressed responses. A session can be shared by many `GitHub` instances, including across threads.
     """
-    __GITHUB_URL: str = "https://github.com"
-    __STARGAZERS_URL_SUFFIX: str = "/stargazers"
-    __PAGE_SUFFIX: str = "?page="
-    __MARK_END_OF_STARGAZERS: str = 'This repository has no more stargazers.'
-
-    __OK_STATUS_CODE: int = 200
-    __TOO_MANY_REQUESTS_STATUS_CODE: int = 429
-    __NOT_FOUND_STATUS_CODE: int = 404
-
-    def __init__(self, username_and_repository: str) -> None:
-        self.__username, self.__repository = GitHub.__extract_user_and_repo(username_and_repository)
-        self.__repository_url: str = self.__get_repository_url()
-        self.__stargazers_base_url: str = self.__repository_url + self.__STARGAZERS_URL_SUFFIX
-
-    @classmethod
-    def __extract_user_and_repo(cls, username_and_repository: str) -> typing.Optional[typing.Tuple[str, str]]:
-        components: typing.List[str] = username_and_repository.split("/")
-        if len(components) != 2:
-            raise UsernameRepositoryError()
-        for component in components:
-            if component == "":
-                raise UsernameRepositoryError()
+    import requests
+    import requests.adapters  # imported on first use, the command line may not need them at all
 
-        return components[0], components[1]
+    session: requests.Session = requests.Session()
+    adapter: requests.adapters.HTTPAdapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+    return session
 
-    def __get_repository_url(self) -> str:
-        return os.path.join(self.__GITHUB_URL, self.__username, self.__repository)
 
-    def __get_soup(self, url: str) -> BeautifulSoup:
-        response: requests.Response = requests.get(url, headers={'Content-Type': 'text/html'})
+def create_parse_pool(processes: typing.Optional[int] = None) -> 'concurrent.futures.ProcessPoolExecutor':
+    """Create a pool of `processes`, one per core by default, parsing the pages of `GitHub` instances
+    outside of the interpreter fetching them. Shut it down once done, or use it as a context manager.
 
-        status_code: int = response.status_code
-        if status_code == self.__OK_STATUS_CODE:
-            return BeautifulSoup(response.text, "html.parser")
-        if status_code == self.__TOO_MANY_REQUESTS_STATUS_CODE:
-            raise TooManyRequestsHttpError()
-        if status_code == self.__NOT_FOUND_STATUS_CODE:
-            raise UrlNotFoundError(os.path.join(self.__username, self.__repository))
-        raise HTTPError(status_code)
-
-    def __extract_stargazers_from_url(self, url: str) -> typing.List[str]:
-        soup: typing.Optional[BeautifulSoup] = self.__get_soup(url)
-        h3_components: element.ResultSet = soup.find_all('h3')
-
-        def _check_hyperlink_component(component: element.Tag) -> None:
-            """Check the BeautifulSoup `element.Tag` component that receives a hyperlink HTML tag.
-
-            The expected structure is as follows:
-            '<h3> <a href="/foo"> John Williams </a> </h3>'
-            It incrementally dives into the component one tag or attribute of a tag at a time, making sure they appear:
-            - the hyperlink tag: <a>
-            - the `href` attribute: <a href="..."> </a>
-            - the content of hyperlink's `href` attribute.
-            The href content contains the GitHub username prefixed by the '/' character, with the following form:
-            `/username`.
-
-            If any of the above mentioned is missing or not in the expected form, an Exception is raised.
-            """
-            hyperlink_component: typing.Optional[element.Tag] = component.find('a')
-            if not hyperlink_component:
-                raise MissingHyperlinkTagError()
-            if not hyperlink_component.get('href'):
-                raise MissingHrefAttributeError()
-            href_content: str = hyperlink_component['href']
-            if not re.match(r"/.+$", href_content):
-                raise HrefContentError(href_content)
-
-        def _extract_username_from_h3(component: element.Tag) -> typing.Optional[str]:
-            if component.get_text() == self.__MARK_END_OF_STARGAZERS:
-                return None
-            _check_hyperlink_component(component)
-            return component.a['href'][1:]  # dropping the first '/' character
-
-        users: typing.List[str] = []
-        for component in h3_components:
-            username: typing.Optional[str] = _extract_username_from_h3(component)
-            if not username:
-                break
-            users.append(username)
+    The processes are spawned rather than forked, forking being unsafe while other threads run.
+    """
+    import multiprocessing
 
-        return users
+    return concurrent.futures.ProcessPoolExecutor(max_workers=processes,
+                                                  mp_context=multiprocessing.get_context("spawn"))
 
-    def __get_url_page_template(self, page_number: int) -> str:
-        return self.__stargazers_base_url + self.__PAGE_SUFFIX + str(page_number)
 
-    def get_all_stargazers(self) -> typing.List[str]:
-        page_number: int = 1
+def _check_status_code(status_code: int, username: str, repository: str) -> None:
+    if status_code == _OK_STATUS_CODE:
+        return None
+    if status_code == _TOO_MANY_REQUESTS_STATUS_CODE:
+        raise TooManyRequestsHttpError()
+    if status_code == _NOT_FOUND_STATUS_CODE:
+        raise UrlNotFoundError(os.path.join(username, repository))
+    raise HTTPError(status_code)
 
-        all_stargazers: typing.List[str] = []
-        previous_stargazers: typing.List[str] = []
-        while True:
-            current_url: str = self.__get_url_page_template(page_number)
-            current_stargazers: typing.List[str] = self.__extract_stargazers_from_url(current_url)
-            if not current_stargazers:
-                break
-            if current_stargazers == previous_stargazers:
-                break
-            all_stargazers += current_stargazers
-            previous_stargazers = current_stargazers
-            page_number += 1
 
-        return sorted(all_stargazers)
+def _is_past_last_page(current_stargazers: typing.List[str], previous_stargazers: typing.List[str]) -> bool:
+    """GitHub marks the end of the stargazers with an empty page, or by serving the last page again."""
+    return not current_stargazers or current_stargazers == previous_stargazers
 
-    def is_stargazer(self, user: str) -> bool:
-        page_number: int = 1
 
-        previous_stargazers: typing.List[str] = []
-        while True:
-            current_url: str = self.__get_url_page_template(page_number)
-            current_stargazers: typing.List[str] = self.__extract_stargazers_from_url(current_url)
-            if not current_stargazers:
+class GitHub:
+    """Creates a GitHub instance for listing the stargazers of a given repository
+    and checking if a user's full name is in the list of stargazers.
+
+    The constructor requires a string of the following form: `username/repository`,
+    both representing the GitHub meaning of them.
+
+    The optional `concurrency` sets how many stargazers pages are requested in parallel.
+    With the default of 1 the pages are fetched one after another.
+
+    All the requests of an instance go through the same `requests.Session`, so connections are kept
+    alive between pages and calls. Pass `session`, e.g. one made by `create_session`, to share it with
+    other instances; otherwise one is created with `pool_size` connections, at least `concurrency`.
+
+    The `engine` is either `html`, scraping the stargazers pages of the website, or `api`, listing
+    the stargazers through the REST API at `api_url`, 100 per page instead of a few dozens. The API
+    allows far more requests per hour when authenticated with a `token`.
+
+    The `parser` names the backend extracting the usernames from a HTML page, see `parsers.get_parser`.
+    An optional `cache`, see `cache.PageCache`, keeps the pages on disk between runs.
+    An optional `scheduler`, see `scheduler.RequestScheduler`, paces the requests and retries the pages
+    throttled with a 429 response instead of failing the whole crawl.
+    An optional `on_page` hook is called with the `instrumentation.PageMetrics` of every page fetched,
+    from the fetching thread, e.g. `instrumentation.Profiler().record`.
+    An optional `single_flight`, see `single_flight.SingleFlight`, shared by many instances, fetches
+    and parses a page once for all the instances asking for it at the same time or shortly after.
+    An optional `parse_pool`, e.g. made by `create_parse_pool`, parses the pages in other processes, so that
+    with a `concurrency` greater than 1 the pages downloaded together are parsed on as many cores.
+    An optional `bloom_filter`, see `bloom.BloomFilter`, built from an earlier crawl, answers the users
+    certainly not stargazers without any request, the others being checked against the stargazers.
+
+    Once a crawl has gone through all the pages, its stargazers are kept for the lifetime of the instance,
+    so the next `is_stargazer` and `are_stargazers` checks are answered without crawling again.
+    """
+
+    def __init__(self, username_and_repository: str, concurrency: int = 1,  # pylint: disable=too-many-arguments
+                 session: typing.Optional['requests.Session'] = None, pool_size: int = _DEFAULT_POOL_SIZE,
+                 github_url: str = _GITHUB_URL, parser: str = DEFAULT_PARSER, cache: typing.Optional[PageCache] = None,
+                 scheduler: typing.Optional[RequestScheduler] = None, engine: str = HTML_ENGINE,
+                 token: typing.Optional[str] = None, api_url: str = API_URL,
+                 on_page: typing.Optional[typing.Callable[[PageMetrics], None]] = None,
+                 single_flight: typing.Optional[SingleFlight] = None,
+                 parse_pool: typing.Optional[concurrent.futures.Executor] = None,
+                 bloom_filter: typing.Optional[BloomFilter] = None) -> None:
+        self.__username, self.__repository = _extract_user_and_repo(username_and_repository)
+        if concurrency < 1:
+            raise ConcurrencyError()
+        if engine not in ENGINES:
+            raise EngineError()
+        self.__concurrency: int = concurrency
+        # the stargazers of the last full crawl, a list being made a set on the first check only
+        self.__loaded_stargazers: typing.Union[typing.AbstractSet[str], typing.List[str], None] = None
+        self.__cache: typing.Optional[PageCache] = cache
+        self.__scheduler: typing.Optional[RequestScheduler] = scheduler
+        self.__on_page: typing.Optional[typing.Callable[[PageMetrics], None]] = on_page
+        self.__single_flight: typing.Optional[SingleFlight] = single_flight
+        self.__parse_pool: typing.Optional[concurrent.futures.Executor] = parse_pool
+        self.__bloom_filter: typing.Optional[BloomFilter] = bloom_filter
+        self.__session: requests.Session = session or create_session(max(pool_size, concurrency))
+        if engine == API_ENGINE:
+            self.__parse: typing.Callable[[str], typing.List[str]] = parse_api_page
+            self.__headers: typing.Dict[str, str] = get_api_headers(token)
+            self.__page_size: typing.Optional[int] = API_PAGE_SIZE
+            self.__has_last_page_hint: bool = True
+            self.__newest_first: bool = False
+            self.__url_page_prefix: str = get_api_page_url_prefix(self.__username, self.__repository, api_url)
+        else:
+            self.__parse = get_parser(parser)
+            self.__headers = {'Content-Type': 'text/html'}
+            self.__page_size = None
+            self.__has_last_page_hint = False
+            self.__newest_first = True
+            self.__url_page_prefix = _get_stargazers_base_url(self.__username, self.__repository,
+                                                              github_url) + _PAGE_SUFFIX
+
+    def __send(self, url: str, headers: typing.Dict[str, str]) -> typing.Tuple['requests.Response', PageMetrics]:
+        """Request `url`, through the scheduler if any, and download the response, timing every step."""
+        attempts: typing.List[float] = []
+
+        def send() -> 'requests.Response':
+            attempt_start: float = time.perf_counter()
+            attempt_response: requests.Response = self.__session.get(url, headers=headers, stream=True)
+            attempts.append(time.perf_counter() - attempt_start)
+            return attempt_response
+
+        start: float = time.perf_counter()
+        response: requests.Response = self.__scheduler.request(send) if self.__scheduler else send()
+        headers_received: float = time.perf_counter()
+        size: int = len(response.content)
+        metrics: PageMetrics = PageMetrics(
+            url, response.status_code, False, queued=headers_received - start - attempts[-1],
+            first_byte=attempts[-1], download=time.perf_counter() - headers_received,
+            size=int(response.headers.get('Content-Length') or size), retries=len(attempts) - 1)
+        return response, metrics
+
+    def __get_page(self, url: str) -> typing.Tuple[str, typing.Optional[int], PageMetrics]:
+        """Return the text of the page at `url`, the number of the last page when the response tells it,
+        and how it was fetched.
+        """
+        headers: typing.Dict[str, str] = dict(self.__headers)
+        cached_page: typing.Optional[CachedPage] = self.__cache.get(url) if self.__cache else None
+        if self.__cache and cached_page:
+            if self.__cache.is_fresh(cached_page):
+                self.__cache.record_hit()
+                return cached_page.text, None, PageMetrics(url, None, True)
+            headers.update(self.__cache.get_conditional_headers(cached_page))
+
+        response, metrics = self.__send(url, headers)
+        if self.__cache and cached_page and response.status_code == _NOT_MODIFIED_STATUS_CODE:
+            self.__cache.record_revalidation(url, cached_page)
+            return cached_page.text, get_last_page(response), metrics._replace(from_cache=True)
+        if is_rate_limited(response):
+            raise TooManyRequestsHttpError()
+        if self.__page_size and is_past_pagination_limit(response):
+            raise PaginationLimitError(os.path.join(self.__username, self.__repository))
+        _check_status_code(response.status_code, self.__username, self.__repository)
+        if self.__cache:
+            self.__cache.put(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.text, get_last_page(response), metrics
+
+    def __fetch_page(self, url: str, display_names: typing.Optional[typing.Dict[str, str]] = None
+                     ) -> typing.Tuple[typing.List[str], typing.Optional[int], PageMetrics]:
+        text, last_page, metrics = self.__get_page(url)
+        if display_names is not None and self.__page_size is None:  # only the HTML pages show names
+            display_names.update(parse_display_names(text))
+        parse_start: float = time.perf_counter()
+        stargazers: typing.List[str] = \
+            self.__parse_pool.submit(self.__parse, text).result() if self.__parse_pool else self.__parse(text)
+        return stargazers, last_page, metrics._replace(parse=time.perf_counter() - parse_start,
+                                                       stargazers=len(stargazers))
+
+    def __extract_page(self, url: str, display_names: typing.Optional[typing.Dict[str, str]] = None
+                       ) -> typing.Tuple[typing.List[str], typing.Optional[int]]:
+        if self.__single_flight:
+            (stargazers, last_page, metrics), shared = self.__single_flight.call(
+                url, lambda: self.__fetch_page(url, display_names))
+            if shared:  # fetched for another caller, who may be consuming the same list
+                stargazers = list(stargazers)
+                metrics = PageMetrics(url, None, True, stargazers=len(stargazers))
+        else:
+            stargazers, last_page, metrics = self.__fetch_page(url, display_names)
+        if self.__on_page:
+            self.__on_page(metrics)
+        return stargazers, last_page
+
+    def __extract_stargazers_from_url(self, url: str, display_names: typing.Optional[typing.Dict[str, str]] = None
+                                      ) -> typing.List[str]:
+        return self.__extract_page(url, display_names)[0]
+
+    def __get_url_page_template(self, page_number: int) -> str:
+        return self.__url_page_prefix + str(page_number)
+
+    def __fetch_pages(self, first_page: int = 1, display_names: typing.Optional[typing.Dict[str, str]] = None
+                      ) -> typing.Iterator[typing.List[str]]:
+        """Yield the stargazers of every page, in page order, starting with `first_page`.
+
+        When the concurrency is greater than 1, up to `concurrency` pages are requested ahead
+        of the page being consumed. The pages requested past the end of the stargazers are
+        discarded, together with any error they raised, and the requests already in flight are
+        waited for so that no worker outlives the crawl.
+
+        When the first response tells the number of the last page, as the API's Link header does,
+        all the pages up to it are requested at once instead, `concurrency` at a time, and the
+        speculative requests only resume past it, in case stargazers were added meanwhile.
+        """
+        if self.__concurrency == 1:
+            for page_number in itertools.count(first_page):
+                yield self.__extract_stargazers_from_url(self.__get_url_page_template(page_number), display_names)
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__concurrency)
+        pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+        page_numbers: typing.Iterator[int] = itertools.count(first_page)
+        try:
+            if self.__has_last_page_hint:
+                first_stargazers, last_page = self.__extract_page(self.__get_url_page_template(next(page_numbers)),
+                                                                  display_names)
+                yield first_stargazers
+                hinted_pages: range = range(first_page + 1, max(first_page, last_page or 0) + 1)
+                pending.extend(executor.submit(self.__extract_stargazers_from_url, self.__get_url_page_template(page),
+                                               display_names)
+                               for page in hinted_pages)
+                while pending:
+                    yield pending.popleft().result()
+                page_numbers = itertools.count(hinted_pages.stop)
+            while True:
+                while len(pending) < self.__concurrency:
+                    current_url: str = self.__get_url_page_template(next(page_numbers))
+                    pending.append(executor.submit(self.__extract_stargazers_from_url, current_url, display_names))
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def __iter_pages(self, first_page: int = 1, previous_stargazers: typing.Optional[typing.List[str]] = None,
+                     display_names: typing.Optional[typing.Dict[str, str]] = None) -> typing.Iterator[typing.List[str]]:
+        """Yield the stargazers of every page, up to the last one, adding the names shown on the pages
+        to `display_names` if given.
+        """
+        previous_stargazers = previous_stargazers or []
+        for current_stargazers in self.__fetch_pages(first_page, display_names):
+            if _is_past_last_page(current_stargazers, previous_stargazers):
                 break
-            if current_stargazers == previous_stargazers:
+            yield current_stargazers
+            if self.__page_size and len(current_stargazers) < self.__page_size:
                 break
-            if user in current_stargazers:
-                return True
             previous_stargazers = current_stargazers
-            page_number += 1
 
-        return False
+    def iter_stargazers(self) -> typing.Iterator[str]:
+        """Yield the stargazers in the order GitHub lists them, as soon as each page is parsed."""
+        for current_stargazers in self.__iter_pages():
+            yield from current_stargazers
+
+    def iter_sorted_stargazers(self, run_size: int = _DEFAULT_RUN_SIZE) -> typing.Iterator[str]:
+        """Yield the same stargazers as `get_all_stargazers`, holding at most `run_size` of them in memory,
+        see `sorting.sort_with_bounded_memory`.
+        """
+        return sort_with_bounded_memory(self.iter_stargazers(), run_size)
+
+    def get_all_stargazers(self, checkpoint_path: typing.Optional[str] = None, resume: bool = False
+                           ) -> typing.List[str]:
+        """Return the sorted stargazers. With a `checkpoint_path`, the pages crawled are saved there
+        in batches, see `checkpoint.CrawlCheckpoint`, and with `resume` the crawl continues after the
+        pages saved by a previous call that failed. The checkpoint is removed once the crawl is over.
+        """
+        if checkpoint_path is None:
+            all_stargazers: typing.List[str] = []
+            for current_stargazers in self.__iter_pages():
+                all_stargazers += current_stargazers
+        else:
+            all_stargazers = self.__crawl_with_checkpoint(checkpoint_path, resume)
+
+        all_stargazers.sort()
+        self.__loaded_stargazers = all_stargazers
+        return all_stargazers
+
+    def __crawl_with_checkpoint(self, checkpoint_path: str, resume: bool) -> typing.List[str]:
+        checkpoint: CrawlCheckpoint = CrawlCheckpoint(checkpoint_path, self.__url_page_prefix, resume=resume)
+        try:
+            for current_stargazers in self.__iter_pages(checkpoint.page_number + 1, checkpoint.previous_page):
+                checkpoint.record(current_stargazers)
+        except BaseException:
+            checkpoint.flush()
+            raise
+        checkpoint.remove()
+        return checkpoint.stargazers
+
+    def get_display_names(self) -> typing.Dict[str, typing.Optional[str]]:
+        """Return the sorted stargazers, as `get_all_stargazers`, each with the display name shown next to it
+        on the stargazers pages, if any. The api engine lists no names, nor do the pages fetched for another
+        instance sharing the `single_flight`, so their stargazers have None.
+        """
+        display_names: typing.Dict[str, str] = {}
+        all_stargazers: typing.List[str] = []
+        for current_stargazers in self.__iter_pages(display_names=display_names):
+            all_stargazers += current_stargazers
+        all_stargazers.sort()
+        stargazers_names: typing.Dict[str, typing.Optional[str]] = {
+            stargazer: display_names.get(stargazer) for stargazer in all_stargazers}
+        self.__loaded_stargazers = stargazers_names.keys()
+        return stargazers_names
+
+    def get_compact_stargazers(self, run_size: int = _DEFAULT_RUN_SIZE) -> CompactStargazers:
+        """Return the same stargazers as `get_all_stargazers`, packed in a `compact.CompactStargazers`,
+        holding at most `run_size` of them as `str` objects while sorting.
+
+        The later `is_stargazer` and `are_stargazers` checks search it, in O(log n), instead of a set.
+        """
+        compact_stargazers: CompactStargazers = CompactStargazers.from_sorted(self.iter_sorted_stargazers(run_size))
+        self.__loaded_stargazers = compact_stargazers
+        return compact_stargazers
+
+    def __is_page_unchanged(self, snapshot: PagesSnapshot, page_number: int) -> bool:
+        current_stargazers: typing.List[str] = self.__extract_stargazers_from_url(
+            self.__get_url_page_template(page_number))
+        return fingerprint_page(current_stargazers) == snapshot.fingerprints[page_number - 1]
+
+    def __find_first_changed_page(self, snapshot: PagesSnapshot) -> int:
+        last_full_page: int = snapshot.count_full_pages()
+        if last_full_page == 0 or not self.__is_page_unchanged(snapshot, 1):
+            return 1
+        if last_full_page == 1 or self.__is_page_unchanged(snapshot, last_full_page):
+            return last_full_page + 1
+
+        lowest_page, changed_page = 2, last_full_page
+        while lowest_page < changed_page:
+            middle_page: int = (lowest_page + changed_page) // 2
+            if self.__is_page_unchanged(snapshot, middle_page):
+                lowest_page = middle_page + 1
+            else:
+                changed_page = middle_page
+        return changed_page
+
+    def __load_snapshot(self, snapshot_path: str) -> PagesSnapshot:
+        return PagesSnapshot.load(snapshot_path, self.__url_page_prefix) \
+            or PagesSnapshot([], url=self.__url_page_prefix)
+
+    def __crawl_changed_pages(self, snapshot: PagesSnapshot
+                              ) -> typing.Tuple[PagesSnapshot, typing.List[str], typing.List[str]]:
+        """Return the `snapshot` updated with the pages changed since, together with the stargazers
+        of the pages replaced and of the pages crawled in their place.
+        """
+        if self.__newest_first:
+            return self.__crawl_newest_pages(snapshot)
+        first_changed_page: int = self.__find_first_changed_page(snapshot)
+        previous_stargazers: typing.List[str] = snapshot.pages[first_changed_page - 2] \
+            if first_changed_page > 1 else []
+        current_pages: typing.List[typing.List[str]] = list(self.__iter_pages(first_changed_page, previous_stargazers))
+        return (snapshot.replace_pages_from(first_changed_page, current_pages),
+                list(itertools.chain.from_iterable(snapshot.pages[first_changed_page - 1:])),
+                list(itertools.chain.from_iterable(current_pages)))
+
+    def __crawl_newest_pages(self, snapshot: PagesSnapshot
+                             ) -> typing.Tuple[PagesSnapshot, typing.List[str], typing.List[str]]:
+        """The pages are crawled from the first one until a full page holds a run of the stargazers of the
+        `snapshot`, and the last of them are found shifted as much, see `__is_tail_unchanged`: the stargazers
+        after that run are unchanged, and kept without crawling their pages again.
+        """
+        previous_stargazers: typing.List[str] = list(itertools.chain.from_iterable(snapshot.pages))
+        positions: typing.Dict[str, int] = {user: index for index, user in enumerate(previous_stargazers)}
+        current_pages: typing.List[typing.List[str]] = []
+        crawled_count: int = 0
+        rejected_shift: typing.Optional[int] = None
+        for current_stargazers in self.__iter_pages():
+            current_pages.append(current_stargazers)
+            crawled_count += len(current_stargazers)
+            start: int = positions.get(current_stargazers[0], -1)
+            end: int = start + len(current_stargazers)
+            if start < 0 or len(current_stargazers) != len(current_pages[0]) or crawled_count - end == rejected_shift \
+                    or previous_stargazers[start:end] != current_stargazers:
+                continue
+            if self.__is_tail_unchanged(previous_stargazers, end, current_pages):
+                return (snapshot.replace_head(current_pages, len(previous_stargazers) - end), previous_stargazers[:end],
+                        list(itertools.chain.from_iterable(current_pages)))
+            rejected_shift = crawled_count - end  # a star removed further down, the pages after it will tell
+        return (PagesSnapshot(current_pages, url=snapshot.url), previous_stargazers,
+                list(itertools.chain.from_iterable(current_pages)))
+
+    def __is_tail_unchanged(self, previous_stargazers: typing.List[str], end: int,
+                            current_pages: typing.List[typing.List[str]]) -> bool:
+        """Whether the stargazers after the first `end` ones of the snapshot are still listed after the
+        `current_pages`. No star is added but at the top, so they are unless a star was removed among them,
+        which would list the last of them on an earlier place: the page which should hold the last one is
+        checked, together with the page after it, which should be past the end.
+        """
+        page_size: int = len(current_pages[0])
+        shift: int = len(current_pages) * page_size - end
+        last_page_number: int = (len(previous_stargazers) - 1 + shift) // page_size + 1
+        last_page: typing.List[str] = current_pages[-1]
+        if last_page_number > len(current_pages):
+            last_page = self.__extract_stargazers_from_url(self.__get_url_page_template(last_page_number))
+            if last_page != previous_stargazers[(last_page_number - 1) * page_size - shift:]:
+                return False
+        return _is_past_last_page(
+            self.__extract_stargazers_from_url(self.__get_url_page_template(last_page_number + 1)), last_page)
+
+    def get_stargazers_incrementally(self, snapshot_path: str) -> typing.List[str]:
+        """Return the same stargazers as `get_all_stargazers`, fetching only the pages that changed
+        since the snapshot saved at `snapshot_path`, which is then updated, or created on the first call.
+
+        The api engine lists the oldest stars first, so new stars are on the last pages, while a removed
+        star shifts every page after it: when a page is unchanged, so are all the pages before it. The first
+        page is checked, then the last full page of the snapshot, the first changed page is searched by
+        bisection, and only the pages from there onwards are crawled again.
+
+        The stargazers pages of the website list the newest stars first, so a new star shifts every page.
+        They are crawled from the first one, only until the stargazers of the snapshot are found again
+        and the last of them are checked to be listed as far down, see `__crawl_newest_pages`.
+
+        A snapshot of another repository raises `incremental.SnapshotMismatchError`.
+        """
+        snapshot: PagesSnapshot = self.__crawl_changed_pages(self.__load_snapshot(snapshot_path))[0]
+        snapshot.save(snapshot_path)
+        self.__loaded_stargazers = snapshot.stargazers
+        return snapshot.stargazers
+
+    def get_stargazers_delta(self, snapshot_path: str) -> StargazersDelta:
+        """Return the users who starred the repository, and the ones who removed their star, since the
+        snapshot saved at `snapshot_path`, which is then updated like by `get_stargazers_incrementally`.
+
+        Only the pages changed since the snapshot are crawled, the last ones with the api engine and the
+        first ones with the website, see `get_stargazers_incrementally`, and only their stargazers are
+        compared with the ones of the pages they replace, with a sorted merge. On the first call, without
+        a snapshot, every stargazer is added.
+        """
+        snapshot, previous_stargazers, current_stargazers = self.__crawl_changed_pages(
+            self.__load_snapshot(snapshot_path))
+        snapshot.save(snapshot_path)
+        return diff_sorted_stargazers(sorted(previous_stargazers), sorted(current_stargazers))
+
+    def are_stargazers(self, users: typing.Iterable[str]) -> typing.Dict[str, bool]:
+        """Check which of the `users` starred the repository, crawling its stargazers at most once.
+
+        The crawl stops as soon as every user is found. When it reaches the last page instead,
+        the stargazers are kept on the instance and answer the later checks without any request.
+        With a `bloom_filter`, only the users it may hold are checked.
+        """
+        users = list(users)
+        if self.__bloom_filter is not None:
+            maybe_stargazers: typing.Dict[str, bool] = self.__check_stargazers(
+                [user for user in users if user in self.__bloom_filter])
+            return {user: maybe_stargazers.get(user, False) for user in users}
+        return self.__check_stargazers(users)
+
+    def __check_stargazers(self, users: typing.List[str]) -> typing.Dict[str, bool]:
+        if isinstance(self.__loaded_stargazers, list):
+            self.__loaded_stargazers = set(self.__loaded_stargazers)
+        if self.__loaded_stargazers is None and users:
+            missing_users: typing.Set[str] = set(users)
+            seen_stargazers: typing.Set[str] = set()
+            for current_stargazers in self.__iter_pages():
+                seen_stargazers.update(current_stargazers)
+                missing_users.difference_update(current_stargazers)
+                if not missing_users:
+                    break
+            else:
+                self.__loaded_stargazers = seen_stargazers
+            return {user: user not in missing_users for user in users}
+
+        return {user: user in (self.__loaded_stargazers or ()) for user in users}
+
+    def is_stargazer(self, user: str) -> bool:
+        return self.are_stargazers([user])[user]
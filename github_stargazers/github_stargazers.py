@@ -1,39 +1,117 @@
+"""The command line. Only click and the modules every crawl needs are imported up front; requests, the HTML
+parsers, halo and the modules of the batch, overlap and serve commands are imported when first used, so that
+quick checks, e.g. of a snapshot with `--from-snapshot --user`, do not pay for them.
+"""
+import concurrent.futures
+import functools
+import json
+import sys
 import typing
 import click
 
-from halo import Halo
-
-from github_stargazers.github import GitHub
+from github_stargazers.api import ApiResponseError, PaginationLimitError
+from github_stargazers.bloom import BloomFilter
+from github_stargazers.cache import PageCache
+from github_stargazers.checkpoint import CheckpointMismatchError
+from github_stargazers.compact import CompactStargazers
+from github_stargazers.github import ENGINES, HTML_ENGINE, GitHub, HTTPError, create_parse_pool, create_session
 from github_stargazers.github import UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError
 from github_stargazers.github import MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError
+from github_stargazers.incremental import SnapshotFormatError, SnapshotMismatchError
+from github_stargazers.instrumentation import Profiler
+from github_stargazers.scheduler import RequestScheduler
+from github_stargazers.single_flight import SingleFlight
+from github_stargazers.parsers import DEFAULT_PARSER, PARSERS, MissingParserDependencyError
+from github_stargazers.profiles import GraphQLError, ProfileFetcher, get_stargazer_profiles
+
+_OUTPUT_FORMATS: typing.List[str] = ['csv', 'jsonl']  # the `batch.OUTPUT_WRITERS`, imported only for a batch
+
+
+def _succeed(text: str) -> None:
+    """Print `text` after a check mark when stdout is a terminal, as is otherwise, e.g. to a pipe."""
+    if sys.stdout.isatty():
+        from halo import Halo
+        Halo().succeed(text)
+    else:
+        print(text, flush=True)
+
+
+def _fail(text: typing.Any) -> None:
+    """Print `text`, or the message of an exception, after a cross when stdout is a terminal, as is otherwise."""
+    if sys.stdout.isatty():
+        from halo import Halo
+        Halo().fail(str(text))
+    else:
+        print(text, flush=True)
 
 
 class _OutputPrintable(object):
     @staticmethod
-    def print_stargazers(stargazers: typing.List[str]) -> None:
-        if not stargazers:
-            print("0 stargazers.")
-            return None
-        print("Stargazers:")
+    def print_stargazers(stargazers: typing.Iterable[str], flush: bool = False) -> None:
+        """Print each stargazer as soon as it is available, so that `stargazers` may be a generator,
+        flushing the output after every one with `flush`, when a reader waits for them.
+        """
+        has_stargazers: bool = False
         for stargazer in stargazers:
-            print(stargazer)
+            if not has_stargazers:
+                print("Stargazers:")
+                has_stargazers = True
+            print(stargazer, flush=flush)
+        if not has_stargazers:
+            print("0 stargazers.")
 
     @staticmethod
     def print_check_stargazer(is_stargazer: bool) -> None:
-        return Halo().succeed("Stargazer") if is_stargazer else Halo().fail("Not a Stargazer")
+        return _succeed("Stargazer") if is_stargazer else _fail("Not a Stargazer")
+
+
+def _print_compact_stargazers(stargazers: CompactStargazers, user: typing.Optional[str]) -> None:
+    if user:
+        _OutputPrintable.print_check_stargazer(user in stargazers)
+    else:
+        _OutputPrintable.print_stargazers(stargazers)
+
+
+def _process_snapshot(snapshot_path: str, user: typing.Optional[str],
+                      bloom_filter: typing.Optional[BloomFilter] = None) -> None:
+    if user and bloom_filter is not None and user not in bloom_filter:
+        return _OutputPrintable.print_check_stargazer(False)
+    try:
+        stargazers: CompactStargazers = CompactStargazers.load(snapshot_path)
+    except (OSError, SnapshotFormatError) as exception_message:
+        _fail(str(exception_message))
+        return None
+    _print_compact_stargazers(stargazers, user)
+
+
+class _ListingOptions(typing.NamedTuple):
+    """The options of `crawl` telling how to list the stargazers of every repository, or check the `user`."""
+    user: typing.Optional[str] = None
+    snapshot_path: typing.Optional[str] = None
+    stream: bool = False
+    run_size: typing.Optional[int] = None
+    export_path: typing.Optional[str] = None
+    checkpoint_path: typing.Optional[str] = None
+    resume: bool = False
+    export_bloom_path: typing.Optional[str] = None
+    false_positive_rate: float = 0.01
+    profiles: bool = False
 
 
 class _Command:  # pylint: disable=too-few-public-methods
 
-    def __init__(self, username_and_repository: str, user: str) -> None:
+    def __init__(self, username_and_repository: str, github_factory: typing.Callable[[str], GitHub],
+                 options: _ListingOptions, profile_fetcher: typing.Optional[ProfileFetcher] = None) -> None:
         self.__username_and_repository: str = username_and_repository
-        self.__user: typing.Optional[str] = user
+        self.__github_factory: typing.Callable[[str], GitHub] = github_factory
+        self.__options: _ListingOptions = options
+        self.__profile_fetcher: typing.Optional[ProfileFetcher] = profile_fetcher
 
     def __get_github(self) -> typing.Optional[GitHub]:
         try:
-            github = GitHub(self.__username_and_repository)
-        except (UsernameRepositoryError, UrlNotFoundError) as exception_message:
-            Halo().fail(exception_message)
+            github = self.__github_factory(self.__username_and_repository)
+        except (UsernameRepositoryError, UrlNotFoundError, MissingParserDependencyError) as exception_message:
+            _fail(exception_message)
             return None
         return github
 
@@ -41,24 +119,366 @@ class _Command:  # pylint: disable=too-few-public-methods
         github: typing.Optional[GitHub] = self.__get_github()
         if not github:
             return None
+        options: _ListingOptions = self.__options
         try:
-            if self.__user:
-                stargazer: bool = github.is_stargazer(self.__user)
+            if options.export_path:
+                compact_stargazers: CompactStargazers = github.get_compact_stargazers()
+                compact_stargazers.save(options.export_path)
+                self.__export_bloom_filter(compact_stargazers)
+                _print_compact_stargazers(compact_stargazers, options.user)
+            elif options.user:
+                stargazer: bool = github.is_stargazer(options.user)
                 _OutputPrintable.print_check_stargazer(stargazer)
+            elif options.profiles:
+                for profile in get_stargazer_profiles(github, self.__profile_fetcher):
+                    print(json.dumps(profile._asdict()))
+            elif options.snapshot_path:
+                _OutputPrintable.print_stargazers(github.get_stargazers_incrementally(options.snapshot_path))
+            elif options.stream:
+                _OutputPrintable.print_stargazers(github.iter_stargazers(), flush=True)
+            elif options.run_size:
+                _OutputPrintable.print_stargazers(github.iter_sorted_stargazers(options.run_size))
             else:
-                stargazers: typing.List[str] = github.get_all_stargazers()
+                stargazers: typing.List[str] = github.get_all_stargazers(options.checkpoint_path, options.resume)
+                self.__export_bloom_filter(stargazers)
                 _OutputPrintable.print_stargazers(stargazers)
-        except (TooManyRequestsHttpError, UrlNotFoundError,
+        except (TooManyRequestsHttpError, UrlNotFoundError, HTTPError, SnapshotFormatError, ApiResponseError,
+                PaginationLimitError, SnapshotMismatchError, CheckpointMismatchError, GraphQLError,
                 MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError) as exception_message:
-            Halo().fail(exception_message)
+            _fail(exception_message)
+        return None
+
+    def __export_bloom_filter(self, stargazers: typing.Collection[str]) -> None:
+        if self.__options.export_bloom_path:
+            BloomFilter.from_stargazers(stargazers, self.__options.false_positive_rate).save(
+                self.__options.export_bloom_path)
+
+
+class _DefaultCommandGroup(click.Group):
+    """Runs the `default_command` when the first argument is not a subcommand,
+    so that `github-stargazers username/repository [OPTIONS]` keeps working next to the subcommands.
+    """
+
+    def __init__(self, *args: typing.Any, default_command: str, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.__default_command: str = default_command
+
+    def parse_args(self, ctx: click.Context, args: typing.List[str]) -> typing.List[str]:
+        if not args or (args[0] not in self.commands and args[0] not in ctx.help_option_names):
+            args = [self.__default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+def _crawl_options(command: typing.Callable[..., None]) -> typing.Callable[..., None]:
+    """The options choosing the repositories and how they are crawled, shared by the subcommands."""
+    options: typing.List[typing.Callable[[typing.Callable[..., None]], typing.Callable[..., None]]] = [
+        click.argument('username_and_repository', nargs=-1),
+        click.option('--repositories-file', default=None, type=click.File('r'),
+                     help='File with a username/repository per line, - for stdin'),
+        click.option('--concurrency', default=1, type=click.IntRange(min=1),
+                     help='Number of stargazers pages requested in parallel, across all the repositories'),
+        click.option('--engine', default=HTML_ENGINE, type=click.Choice(ENGINES),
+                     help='Scrape the stargazers pages, or list the stargazers through the REST API'),
+        click.option('--token', default=None, envvar='GITHUB_TOKEN',
+                     help='Token authenticating the API requests, read from GITHUB_TOKEN by default'),
+        click.option('--parser', default=DEFAULT_PARSER, type=click.Choice(sorted(PARSERS)),
+                     help='Backend extracting the stargazers from the HTML pages'),
+        click.option('--parse-processes', default=0, type=click.IntRange(min=0),
+                     help='Processes parsing the pages on other cores, 0 to parse them in the fetching threads'),
+        click.option('--cache-dir', default=None, type=click.Path(file_okay=False),
+                     help='Directory keeping the downloaded pages between runs'),
+        click.option('--cache-ttl', default=3600.0, type=click.FloatRange(min=0),
+                     help='Seconds a cached page is used without asking GitHub if it changed'),
+        click.option('--rate', default=None, type=click.FloatRange(min=0, min_open=True),
+                     help='Maximum number of requests per second'),
+        click.option('--max-retries', default=0, type=click.IntRange(min=0),
+                     help='Times a page throttled with a 429 response is requested again, backing off in between'),
+        click.option('--profile', is_flag=True, default=False,
+                     help='Print how long the pages took to be queued, answered, downloaded and parsed'),
+        click.option('--metrics-file', default=None, type=click.Path(dir_okay=False),
+                     help='Write the same timings to a file in the OpenMetrics text format'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _get_repositories(username_and_repository: typing.Tuple[str, ...],
+                      repositories_file: typing.Optional[typing.TextIO]) -> typing.List[str]:
+    repositories: typing.List[str] = list(username_and_repository)
+    if repositories_file:
+        from github_stargazers.batch import read_repositories
+        repositories += read_repositories(repositories_file)
+    if not repositories:
+        raise click.UsageError("Missing argument 'USERNAME_AND_REPOSITORY' or option '--repositories-file'.")
+    return repositories
+
+
+# The options of `crawl` that cannot be used together, by parameter name. The check goes both ways.
+_EXCLUSIVE_OPTIONS: typing.Dict[str, typing.Tuple[str, ...]] = {
+    'from_snapshot': ('username_and_repository', 'repositories_file', 'output_format', 'incremental', 'stream',
+                      'run_size', 'export_path', 'checkpoint_path', 'export_bloom_path', 'profiles'),
+    'output_format': ('incremental', 'stream', 'run_size', 'export_path', 'checkpoint_path', 'export_bloom_path',
+                      'profiles'),
+    'profiles': ('user', 'incremental', 'stream', 'run_size', 'export_path', 'checkpoint_path', 'export_bloom_path'),
+    'checkpoint_path': ('user', 'incremental', 'stream', 'run_size', 'export_path'),
+    'export_bloom_path': ('user', 'incremental', 'stream', 'run_size'),
+    'export_path': ('incremental', 'stream'),
+    'user': ('incremental', 'stream', 'run_size'),
+    'stream': ('run_size',),
+}
+# The options of `crawl` reading or writing the files of one repository.
+_SINGLE_REPOSITORY_OPTIONS: typing.Tuple[str, ...] = (
+    'bloom_path', 'export_bloom_path', 'checkpoint_path', 'export_path', 'incremental')
 
 
-@click.command()
-@click.argument('username_and_repository')
+def _get_given_options(ctx: click.Context) -> typing.Dict[str, click.Parameter]:
+    """The parameters of the command given a value other than their default, by name."""
+    return {param.name: param for param in ctx.command.params
+            if param.name and ctx.params.get(param.name) not in (None, False, ()) and
+            ctx.params[param.name] != param.default}
+
+
+def _check_exclusive_options(ctx: click.Context) -> None:
+    given_options: typing.Dict[str, click.Parameter] = _get_given_options(ctx)
+    for option, exclusive_options in _EXCLUSIVE_OPTIONS.items():
+        for exclusive_option in exclusive_options:
+            if option in given_options and exclusive_option in given_options:
+                raise click.UsageError(f"Option {given_options[option].get_error_hint(ctx)} cannot be used with "
+                                       f"{given_options[exclusive_option].get_error_hint(ctx)}.", ctx)
+    if 'resume' in given_options and 'checkpoint_path' not in given_options:
+        raise click.UsageError("Option '--resume' needs the '--checkpoint' file.", ctx)
+
+
+def _check_one_repository_options(ctx: click.Context, repositories: typing.List[str]) -> None:
+    if len(repositories) < 2:
+        return None
+    for option, param in _get_given_options(ctx).items():
+        if option in _SINGLE_REPOSITORY_OPTIONS:
+            raise click.UsageError(f"Option {param.get_error_hint(ctx)} needs a single repository.", ctx)
+    return None
+
+
+def _create_github_factory(concurrency: int, engine: str,  # pylint: disable=too-many-arguments
+                           token: typing.Optional[str], parser: str, parse_processes: int,
+                           cache: typing.Optional[PageCache], rate: typing.Optional[float], max_retries: int,
+                           repository_concurrency: int, profiler: typing.Optional[Profiler],
+                           bloom_filter: typing.Optional[BloomFilter] = None) -> typing.Callable[[str], GitHub]:
+    """Build every `GitHub` on one session, and one scheduler if any, so that the repositories share
+    the `concurrency` connections and the limits, each requesting `repository_concurrency` pages at once.
+    They also share a `SingleFlight`, so that a page asked by many of them at once is requested once,
+    and the pool of `parse_processes` if any, shut down with the command.
+    """
+    scheduler: typing.Optional[RequestScheduler] = None
+    if rate or max_retries:
+        scheduler = RequestScheduler(rate=rate, max_concurrency=concurrency, max_retries=max_retries)
+    parse_pool: typing.Optional[concurrent.futures.Executor] = None
+    if parse_processes:
+        parse_pool = create_parse_pool(parse_processes)
+        click.get_current_context().call_on_close(parse_pool.shutdown)
+    return functools.partial(GitHub, concurrency=repository_concurrency, session=create_session(pool_size=concurrency),
+                             parser=parser, cache=cache, scheduler=scheduler, engine=engine, token=token,
+                             on_page=profiler.record if profiler else None, single_flight=SingleFlight(),
+                             parse_pool=parse_pool, bloom_filter=bloom_filter)
+
+
+def _print_reports(cache: typing.Optional[PageCache], profiler: typing.Optional[Profiler], profile: bool,
+                   metrics_file: typing.Optional[str]) -> None:
+    if cache:
+        click.echo(str(cache.stats), err=True)
+    if profiler and profile:
+        click.echo(profiler.summary(), err=True)
+    if profiler and metrics_file:
+        with open(metrics_file, "w", encoding="utf-8") as metrics:
+            metrics.write(profiler.to_openmetrics())
+
+
+@click.group(cls=_DefaultCommandGroup, default_command='crawl')
+def command_line() -> None:
+    """List the stargazers of GitHub repositories, the `crawl` command running when none is given."""
+
+
+@command_line.command('crawl')
+@_crawl_options
+@click.option('--format', 'output_format', default='text', type=click.Choice(['text'] + _OUTPUT_FORMATS),
+              help='Output as text, or a JSON object or a CSV row per repository')
 @click.option('--user', default=None, help='User name to see if it is a stargazer')
-def command_line(username_and_repository: str, user: str) -> None:
-    command = _Command(username_and_repository, user)
-    command.process()
+@click.option('--incremental', default=None, type=click.Path(dir_okay=False),
+              help='Snapshot file of the previous crawl, only the changed pages are fetched again')
+@click.option('--stream', is_flag=True, default=False,
+              help='Print the stargazers as soon as they are fetched, in the order GitHub lists them')
+@click.option('--run-size', default=None, type=click.IntRange(min=1),
+              help='Sort the stargazers holding at most this many in memory, merging sorted runs from disk')
+@click.option('--export', 'export_path', default=None, type=click.Path(dir_okay=False),
+              help='Also save the stargazers to a binary snapshot file, for --from-snapshot')
+@click.option('--from-snapshot', default=None, type=click.Path(dir_okay=False),
+              help='Answer from a snapshot saved with --export, without crawling')
+@click.option('--checkpoint', 'checkpoint_path', default=None, type=click.Path(dir_okay=False),
+              help='File saving the pages listed so far, removed once the listing is over')
+@click.option('--resume', is_flag=True, default=False,
+              help='Continue the listing after the pages saved to the --checkpoint file')
+@click.option('--bloom', 'bloom_path', default=None, type=click.Path(dir_okay=False),
+              help='Bloom filter saved with --export-bloom, answering --user without crawling when not a stargazer')
+@click.option('--export-bloom', 'export_bloom_path', default=None, type=click.Path(dir_okay=False),
+              help='Also save a Bloom filter of the stargazers, for --bloom')
+@click.option('--false-positive-rate', default=0.01, type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+              help='Rate of the users the --export-bloom filter wrongly holds, to be checked by crawling')
+@click.option('--profiles', is_flag=True, default=False,
+              help='Print a JSON object per stargazer, with the name shown on the stargazers pages and, '
+                   'with a --token, the company, location and followers fetched 100 users per GraphQL query')
+@click.option('--profiles-cache', default=None, type=click.Path(dir_okay=False),
+              help='File keeping the fetched --profiles for a day')
+def crawl(username_and_repository: typing.Tuple[str, ...],  # pylint: disable=too-many-arguments,too-many-locals
+          repositories_file: typing.Optional[typing.TextIO], concurrency: int, engine: str,
+          token: typing.Optional[str], parser: str, parse_processes: int,
+          cache_dir: typing.Optional[str], cache_ttl: float,
+          rate: typing.Optional[float], max_retries: int, profile: bool, metrics_file: typing.Optional[str],
+          output_format: str, user: typing.Optional[str],
+          incremental: typing.Optional[str], stream: bool, run_size: typing.Optional[int],
+          export_path: typing.Optional[str], from_snapshot: typing.Optional[str],
+          checkpoint_path: typing.Optional[str], resume: bool, bloom_path: typing.Optional[str],
+          export_bloom_path: typing.Optional[str], false_positive_rate: float, profiles: bool,
+          profiles_cache: typing.Optional[str]) -> None:
+    """List the stargazers of the repositories, or check whether --user starred them."""
+    _check_exclusive_options(click.get_current_context())
+    bloom_filter: typing.Optional[BloomFilter] = None
+    if bloom_path:
+        try:
+            bloom_filter = BloomFilter.load(bloom_path)
+        except (OSError, SnapshotFormatError) as exception_message:
+            _fail(str(exception_message))
+            return None
+    if from_snapshot:
+        _process_snapshot(from_snapshot, user, bloom_filter)
+        return None
+    repositories: typing.List[str] = _get_repositories(username_and_repository, repositories_file)
+    _check_one_repository_options(click.get_current_context(), repositories)
+
+    batch: bool = output_format != 'text'
+    cache: typing.Optional[PageCache] = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    profiler: typing.Optional[Profiler] = Profiler() if profile or metrics_file else None
+    github_factory: typing.Callable[[str], GitHub] = _create_github_factory(
+        concurrency, engine, token, parser, parse_processes, cache, rate, max_retries, 1 if batch else concurrency,
+        profiler, bloom_filter)
+
+    if batch:
+        from github_stargazers.batch import OUTPUT_WRITERS, process_repositories
+        results = process_repositories(github_factory, repositories, user, workers=concurrency)
+        OUTPUT_WRITERS[output_format](results, sys.stdout)
+    else:
+        options: _ListingOptions = _ListingOptions(user, incremental, stream, run_size, export_path, checkpoint_path,
+                                                   resume, export_bloom_path, false_positive_rate, profiles)
+        profile_fetcher: typing.Optional[ProfileFetcher] = ProfileFetcher(
+            token, concurrency=concurrency, cache_path=profiles_cache) if profiles and token else None
+        for repository in repositories:
+            if len(repositories) > 1:
+                print(repository + ":")
+            _Command(repository, github_factory, options, profile_fetcher).process()
+    _print_reports(cache, profiler, profile, metrics_file)
+
+
+@command_line.command('overlap')
+@_crawl_options
+@click.option('--operation', default='intersection',
+              type=click.Choice(['intersection', 'union', 'difference', 'ranking']),
+              help='Users who starred all the repositories, any of them, the first one only, '
+                   'or every user with the number of repositories starred')
+@click.option('--top', default=None, type=click.IntRange(min=1), help='Print only the first users of the ranking')
+def overlap(username_and_repository: typing.Tuple[str, ...],  # pylint: disable=too-many-arguments,too-many-locals
+            repositories_file: typing.Optional[typing.TextIO], concurrency: int, engine: str,
+            token: typing.Optional[str], parser: str, parse_processes: int,
+            cache_dir: typing.Optional[str], cache_ttl: float,
+            rate: typing.Optional[float], max_retries: int, profile: bool, metrics_file: typing.Optional[str],
+            operation: str, top: typing.Optional[int]) -> None:
+    """Compare the stargazers of many repositories, crawling up to --concurrency of them at once."""
+    from github_stargazers.overlap import crawl_overlap
+    repositories: typing.List[str] = _get_repositories(username_and_repository, repositories_file)
+    cache: typing.Optional[PageCache] = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    profiler: typing.Optional[Profiler] = Profiler() if profile or metrics_file else None
+    github_factory: typing.Callable[[str], GitHub] = _create_github_factory(
+        concurrency, engine, token, parser, parse_processes, cache, rate, max_retries, 1, profiler)
+
+    repositories_overlap, failures = crawl_overlap(github_factory, repositories, workers=concurrency)
+    _print_reports(cache, profiler, profile, metrics_file)
+    if failures:
+        for failure in failures:
+            _fail(f"{failure.repository}: {failure.message}")
+        return None
+    if operation == 'ranking':
+        for username, count in repositories_overlap.ranking(top):
+            print(f"{username} {count}")
+    elif operation == 'difference':
+        _OutputPrintable.print_stargazers(repositories_overlap.difference(repositories[0]))
+    else:
+        _OutputPrintable.print_stargazers(getattr(repositories_overlap, operation)())
+
+
+@command_line.command('delta')
+@_crawl_options
+@click.option('--snapshot-dir', required=True, type=click.Path(file_okay=False),
+              help='Directory of the snapshots of the previous crawls, one per repository, updated by this one')
+def delta(username_and_repository: typing.Tuple[str, ...],  # pylint: disable=too-many-arguments,too-many-locals
+          repositories_file: typing.Optional[typing.TextIO], concurrency: int, engine: str,
+          token: typing.Optional[str], parser: str, parse_processes: int,
+          cache_dir: typing.Optional[str], cache_ttl: float,
+          rate: typing.Optional[float], max_retries: int, profile: bool, metrics_file: typing.Optional[str],
+          snapshot_dir: str) -> None:
+    """Print a JSON object per user who starred a repository, or removed their star, since its last snapshot,
+    fetching only the pages changed since then.
+    """
+    from github_stargazers.batch import process_deltas, write_deltas_jsonl
+    repositories: typing.List[str] = _get_repositories(username_and_repository, repositories_file)
+    cache: typing.Optional[PageCache] = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    profiler: typing.Optional[Profiler] = Profiler() if profile or metrics_file else None
+    github_factory: typing.Callable[[str], GitHub] = _create_github_factory(
+        concurrency, engine, token, parser, parse_processes, cache, rate, max_retries, 1, profiler)
+
+    write_deltas_jsonl(process_deltas(github_factory, repositories, snapshot_dir, workers=concurrency), sys.stdout)
+    _print_reports(cache, profiler, profile, metrics_file)
+
+
+@command_line.command('serve')
+@_crawl_options
+@click.option('--host', default='127.0.0.1', help='Address to listen on')
+@click.option('--port', default=8080, type=click.IntRange(min=0, max=65535), help='Port to listen on')
+@click.option('--max-repositories', default=128, type=click.IntRange(min=1),
+              help='Repositories kept in memory, the least recently asked one being evicted beyond')
+@click.option('--refresh-interval', default=3600.0, type=click.FloatRange(min=0, min_open=True),
+              help='Seconds after which the stargazers of a repository are crawled again in the background')
+def serve(username_and_repository: typing.Tuple[str, ...],  # pylint: disable=too-many-arguments,too-many-locals
+          repositories_file: typing.Optional[typing.TextIO], concurrency: int, engine: str,
+          token: typing.Optional[str], parser: str, parse_processes: int,
+          cache_dir: typing.Optional[str], cache_ttl: float,
+          rate: typing.Optional[float], max_retries: int, profile: bool, metrics_file: typing.Optional[str],
+          host: str, port: int, max_repositories: int, refresh_interval: float) -> None:
+    """Answer GET /repos/{owner}/{repository}/stargazers and /repos/{owner}/{repository}/is_stargazer?user={user}
+    from memory, crawling the given repositories first and the others when first asked.
+    """
+    from github_stargazers.batch import read_repositories
+    from github_stargazers.daemon import StargazersDaemon, create_server
+    cache: typing.Optional[PageCache] = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    profiler: typing.Optional[Profiler] = Profiler() if profile or metrics_file else None
+    daemon: StargazersDaemon = StargazersDaemon(
+        _create_github_factory(concurrency, engine, token, parser, parse_processes, cache, rate, max_retries,
+                               concurrency, profiler),
+        max_repositories=max_repositories, refresh_interval=refresh_interval)
+    repositories: typing.List[str] = list(username_and_repository)
+    if repositories_file:
+        repositories += read_repositories(repositories_file)
+    for failure in daemon.preload(repositories, workers=concurrency):
+        _fail(f"{failure.repository}: {failure.message}")
+
+    server = create_server(daemon, host, port)
+    daemon.start()
+    click.echo(f"Serving on http://{host}:{server.server_address[1]}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop()
+        _print_reports(cache, profiler, profile, metrics_file)
 
 
 def main() -> None:
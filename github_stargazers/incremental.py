@@ -0,0 +1,126 @@
+import hashlib
+import heapq
+import itertools
+import json
+import typing
+
+
+class SnapshotFormatError(ValueError):
+
+    def __init__(self, path: str) -> None:
+        super().__init__(f"'{path}' is not a stargazers snapshot.")
+
+
+class SnapshotMismatchError(ValueError):
+
+    def __init__(self, path: str) -> None:
+        super().__init__(f"'{path}' is the snapshot of another repository.")
+
+
+def fingerprint_page(page: typing.List[str]) -> str:
+    return hashlib.sha1("\n".join(page).encode()).hexdigest()
+
+
+class PagesSnapshot:
+    """The stargazers of a crawl, page by page in crawl order, together with the fingerprint of every page
+    and all the stargazers sorted. It is saved as JSON between two incremental crawls of a repository,
+    identified by the `url` its pages start with.
+    """
+    __VERSION: int = 2
+
+    def __init__(self, pages: typing.List[typing.List[str]], stargazers: typing.Optional[typing.List[str]] = None,
+                 url: typing.Optional[str] = None) -> None:
+        self.url: typing.Optional[str] = url
+        self.pages: typing.List[typing.List[str]] = pages
+        self.fingerprints: typing.List[str] = [fingerprint_page(page) for page in pages]
+        self.stargazers: typing.List[str] = sorted(itertools.chain.from_iterable(pages)) \
+            if stargazers is None else stargazers
+
+    @classmethod
+    def load(cls, path: str, url: typing.Optional[str] = None) -> typing.Optional['PagesSnapshot']:
+        """Return the snapshot saved at `path`, None if there is none, checking it is of the crawl of `url` if given."""
+        try:
+            with open(path, encoding="utf-8") as snapshot_file:
+                content: typing.Dict[str, typing.Any] = json.load(snapshot_file)
+        except FileNotFoundError:
+            return None
+        except ValueError as error:
+            raise SnapshotFormatError(path) from error
+        if not isinstance(content, dict) or content.get("version") != cls.__VERSION:
+            raise SnapshotFormatError(path)
+        if url is not None and content.get("url") != url:
+            raise SnapshotMismatchError(path)
+        return cls(content["pages"], content["stargazers"], content.get("url"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as snapshot_file:
+            json.dump({"version": self.__VERSION, "url": self.url, "fingerprints": self.fingerprints,
+                       "pages": self.pages, "stargazers": self.stargazers}, snapshot_file)
+
+    def count_full_pages(self) -> int:
+        """The number of leading pages holding as many stargazers as the first one; only the last page may hold less."""
+        if not self.pages:
+            return 0
+        if len(self.pages[-1]) == len(self.pages[0]):
+            return len(self.pages)
+        return len(self.pages) - 1
+
+    def replace_pages_from(self, page_number: int, pages: typing.List[typing.List[str]]) -> 'PagesSnapshot':
+        """Return a snapshot keeping the pages before `page_number` and followed by `pages`,
+        merging the sorted stargazers instead of sorting all of them again.
+        """
+        dropped_stargazers: typing.Iterator[str] = itertools.chain.from_iterable(self.pages[page_number - 1:])
+        return PagesSnapshot(self.pages[:page_number - 1] + pages, self.__merge_stargazers(dropped_stargazers, pages),
+                             self.url)
+
+    def replace_head(self, pages: typing.List[typing.List[str]], kept_count: int) -> 'PagesSnapshot':
+        """Return a snapshot starting with `pages`, all as large as the first one, and followed by the last
+        `kept_count` stargazers of this one, cut in pages of that size: the pages of a crawl listing the newest
+        stars first, which shift the older ones to other pages.
+        """
+        previous_stargazers: typing.List[str] = list(itertools.chain.from_iterable(self.pages))
+        kept_from: int = len(previous_stargazers) - kept_count
+        page_size: int = len(pages[0])
+        kept_pages: typing.List[typing.List[str]] = [previous_stargazers[start:start + page_size]
+                                                     for start in range(kept_from, len(previous_stargazers), page_size)]
+        return PagesSnapshot(pages + kept_pages, self.__merge_stargazers(previous_stargazers[:kept_from], pages),
+                             self.url)
+
+    def __merge_stargazers(self, dropped: typing.Iterable[str], pages: typing.List[typing.List[str]]
+                           ) -> typing.List[str]:
+        dropped_stargazers: typing.Set[str] = set(dropped)
+        kept_stargazers: typing.Iterator[str] = (user for user in self.stargazers if user not in dropped_stargazers)
+        new_stargazers: typing.List[str] = sorted(itertools.chain.from_iterable(pages))
+        return list(heapq.merge(kept_stargazers, new_stargazers))
+
+
+class StargazersDelta(typing.NamedTuple):
+    """The users who starred a repository, and the ones who removed their star, since a snapshot; both sorted."""
+    added: typing.List[str]
+    removed: typing.List[str]
+
+
+def diff_sorted_stargazers(previous: typing.Iterable[str], current: typing.Iterable[str]) -> StargazersDelta:
+    """Compare two sorted lists of stargazers in a single pass over both, merging them like `heapq.merge`."""
+    added: typing.List[str] = []
+    removed: typing.List[str] = []
+    previous_users: typing.Iterator[str] = iter(previous)
+    current_users: typing.Iterator[str] = iter(current)
+    previous_user: typing.Optional[str] = next(previous_users, None)
+    current_user: typing.Optional[str] = next(current_users, None)
+    while previous_user is not None and current_user is not None:
+        if previous_user == current_user:
+            previous_user, current_user = next(previous_users, None), next(current_users, None)
+        elif previous_user < current_user:
+            removed.append(previous_user)
+            previous_user = next(previous_users, None)
+        else:
+            added.append(current_user)
+            current_user = next(current_users, None)
+    if previous_user is not None:
+        removed.append(previous_user)
+        removed.extend(previous_users)
+    if current_user is not None:
+        added.append(current_user)
+        added.extend(current_users)
+    return StargazersDelta(added, removed)
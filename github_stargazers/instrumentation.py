@@ -0,0 +1,100 @@
+import math
+import threading
+import typing
+
+
+class PageMetrics(typing.NamedTuple):
+    """How the time went for a stargazers page, in seconds.
+
+    - `queued`: waiting for the scheduler, including the backoff after 429 responses, `retries` of them;
+    - `first_byte`: from sending the request to receiving the headers, which includes opening
+      the connection, DNS and TLS, when none could be reused;
+    - `download`: receiving the body, of `size` bytes as sent by the server;
+    - `parse`: extracting the `stargazers` usernames from the page.
+
+    A page served from the cache, or fetched for another caller of the same `single_flight.SingleFlight`,
+    has `status_code` None and no request times;
+    `from_cache` is also set for the pages GitHub answered 304 Not Modified.
+    """
+    url: str
+    status_code: typing.Optional[int]
+    from_cache: bool
+    queued: float = 0.0
+    first_byte: float = 0.0
+    download: float = 0.0
+    parse: float = 0.0
+    size: int = 0
+    retries: int = 0
+    stargazers: int = 0
+
+
+PHASES: typing.Tuple[str, ...] = ("queued", "first_byte", "download", "parse")
+_QUANTILES: typing.Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+
+def _get_quantile(sorted_values: typing.List[float], quantile: float) -> float:
+    """The nearest-rank quantile of `sorted_values`."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(quantile * len(sorted_values)) - 1)]
+
+
+class Profiler:
+    """Collects the `PageMetrics` of crawls; pass its `record` method as the `on_page` hook of `GitHub`,
+    including of many instances crawling in parallel.
+    """
+
+    def __init__(self) -> None:
+        self.__lock: threading.Lock = threading.Lock()
+        self.__pages: typing.List[PageMetrics] = []
+
+    @property
+    def pages(self) -> typing.List[PageMetrics]:
+        with self.__lock:
+            return list(self.__pages)
+
+    def record(self, metrics: PageMetrics) -> None:
+        with self.__lock:
+            self.__pages.append(metrics)
+
+    def __get_sorted_phases(self) -> typing.Dict[str, typing.List[float]]:
+        pages: typing.List[PageMetrics] = self.pages
+        return {phase: sorted(getattr(page, phase) for page in pages) for phase in PHASES}
+
+    def summary(self) -> str:
+        pages: typing.List[PageMetrics] = self.pages
+        lines: typing.List[str] = [
+            f"{len(pages)} pages, {sum(page.from_cache for page in pages)} from cache, "
+            f"{sum(page.retries for page in pages)} retries, {sum(page.size for page in pages)} bytes, "
+            f"{sum(page.stargazers for page in pages)} stargazers.",
+            f"{'ms':<12}" + "".join(f"{'p' + str(round(quantile * 100)):>10}" for quantile in _QUANTILES) +
+            f"{'max':>10}{'total':>12}",
+        ]
+        for phase, values in self.__get_sorted_phases().items():
+            lines.append(f"{phase:<12}" +
+                         "".join(f"{_get_quantile(values, quantile) * 1000:10.1f}" for quantile in _QUANTILES) +
+                         f"{(values[-1] if values else 0.0) * 1000:10.1f}{sum(values) * 1000:12.1f}")
+        return "\n".join(lines)
+
+    def to_openmetrics(self) -> str:
+        """The metrics in the OpenMetrics text format, for a Prometheus scrape or a textfile collector."""
+        pages: typing.List[PageMetrics] = self.pages
+        lines: typing.List[str] = []
+        for name, help_text, value in (
+                ("pages", "Stargazers pages fetched.", len(pages)),
+                ("cached_pages", "Stargazers pages served from the cache.", sum(page.from_cache for page in pages)),
+                ("retries", "Requests retried after a 429 response.", sum(page.retries for page in pages)),
+                ("received_bytes", "Bytes of the stargazers pages received.", sum(page.size for page in pages))):
+            lines += [f"# TYPE github_stargazers_{name} counter",
+                      f"# HELP github_stargazers_{name} {help_text}",
+                      f"github_stargazers_{name}_total {value}"]
+        lines += ["# TYPE github_stargazers_page_seconds summary",
+                  "# HELP github_stargazers_page_seconds Seconds spent per page in each phase."]
+        for phase, values in self.__get_sorted_phases().items():
+            for quantile in _QUANTILES:
+                lines.append(f'github_stargazers_page_seconds{{phase="{phase}",quantile="{quantile}"}} '
+                             f'{_get_quantile(values, quantile)}')
+            lines += [f'github_stargazers_page_seconds_sum{{phase="{phase}"}} {sum(values)}',
+                      f'github_stargazers_page_seconds_count{{phase="{phase}"}} {len(values)}']
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
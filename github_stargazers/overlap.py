@@ -0,0 +1,112 @@
+import collections
+import typing
+
+from github_stargazers.batch import RepositoryResult, process_repositories
+from github_stargazers.github import GitHub
+
+
+class UnknownRepositoryError(KeyError):
+
+    def __init__(self, repository: str) -> None:
+        super().__init__(f"Repository {repository} was not added to the overlap.")
+
+
+def _iter_bits(bitmap: int) -> typing.Iterator[int]:
+    """Yield the positions of the bits set in `bitmap`, in one pass over its binary digits."""
+    bits: str = format(bitmap, "b")[::-1]
+    position: int = bits.find("1")
+    while position >= 0:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class RepositoriesOverlap:
+    """The stargazers of many repositories, for set algebra across them.
+
+    Every username gets an id in a dictionary shared by all the repositories, and each repository
+    is a bitmap, a Python int, with the bits of its stargazers' ids set. Intersections, unions and
+    differences are then bitwise operations over one bit per username, and only the usernames of
+    the result are looked up again.
+    """
+
+    def __init__(self) -> None:
+        self.__usernames: typing.List[str] = []
+        self.__ids: typing.Dict[str, int] = {}
+        self.__bitmaps: typing.Dict[str, int] = {}
+
+    @property
+    def repositories(self) -> typing.List[str]:
+        return list(self.__bitmaps)
+
+    def __get_id(self, username: str) -> int:
+        user_id: typing.Optional[int] = self.__ids.get(username)
+        if user_id is None:
+            user_id = self.__ids[username] = len(self.__usernames)
+            self.__usernames.append(username)
+        return user_id
+
+    def add(self, repository: str, stargazers: typing.Iterable[str]) -> None:
+        user_ids: typing.List[int] = [self.__get_id(username) for username in stargazers]
+        bits: bytearray = bytearray(max(user_ids, default=-1) // 8 + 1)
+        for user_id in user_ids:
+            bits[user_id >> 3] |= 1 << (user_id & 7)
+        self.__bitmaps[repository] = int.from_bytes(bits, "little")
+
+    def __get_bitmap(self, repository: str) -> int:
+        try:
+            return self.__bitmaps[repository]
+        except KeyError:
+            raise UnknownRepositoryError(repository) from None
+
+    def __get_usernames(self, bitmap: int) -> typing.List[str]:
+        return sorted(self.__usernames[user_id] for user_id in _iter_bits(bitmap))
+
+    def intersection(self, repositories: typing.Optional[typing.Iterable[str]] = None) -> typing.List[str]:
+        """The users who starred every one of `repositories`, all the added ones by default."""
+        bitmaps: typing.List[int] = [self.__get_bitmap(repository) for repository in repositories or self.__bitmaps]
+        if not bitmaps:
+            return []
+        bitmap: int = bitmaps[0]
+        for other_bitmap in bitmaps[1:]:
+            bitmap &= other_bitmap
+        return self.__get_usernames(bitmap)
+
+    def union(self, repositories: typing.Optional[typing.Iterable[str]] = None) -> typing.List[str]:
+        """The users who starred any of `repositories`, all the added ones by default."""
+        bitmap: int = 0
+        for repository in repositories or self.__bitmaps:
+            bitmap |= self.__get_bitmap(repository)
+        return self.__get_usernames(bitmap)
+
+    def difference(self, repository: str, others: typing.Optional[typing.Iterable[str]] = None) -> typing.List[str]:
+        """The users who starred `repository` but none of the `others`, all the other added ones by default."""
+        bitmap: int = self.__get_bitmap(repository)
+        for other in others if others is not None else self.__bitmaps:
+            if other != repository:
+                bitmap &= ~self.__get_bitmap(other)
+        return self.__get_usernames(bitmap)
+
+    def ranking(self, top: typing.Optional[int] = None) -> typing.List[typing.Tuple[str, int]]:
+        """The users with the number of repositories they starred, most first, then by username."""
+        counts: typing.Counter[int] = collections.Counter()
+        for bitmap in self.__bitmaps.values():
+            counts.update(_iter_bits(bitmap))
+        ranking: typing.List[typing.Tuple[str, int]] = sorted(
+            ((self.__usernames[user_id], count) for user_id, count in counts.items()),
+            key=lambda user_and_count: (-user_and_count[1], user_and_count[0]))
+        return ranking[:top] if top is not None else ranking
+
+
+def crawl_overlap(github_factory: typing.Callable[[str], GitHub], repositories: typing.Iterable[str],
+                  workers: int = 1) -> typing.Tuple[RepositoriesOverlap, typing.List[RepositoryResult]]:
+    """Crawl up to `workers` of the `repositories` at once, see `batch.process_repositories`,
+    and return the overlap of the crawled ones together with the results of the failed ones.
+    """
+    overlap: RepositoriesOverlap = RepositoriesOverlap()
+    failures: typing.List[RepositoryResult] = []
+    for result in process_repositories(github_factory, repositories, workers=workers):
+        if result.error:
+            failures.append(result)
+        else:
+            overlap.add(result.repository, result.stargazers or [])
+    return overlap, failures
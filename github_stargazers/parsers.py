@@ -0,0 +1,230 @@
+import html
+import importlib.util
+import re
+import typing
+
+if typing.TYPE_CHECKING:
+    from bs4 import element
+
+
+class MissingHyperlinkTagError(Exception):
+
+    def __init__(self) -> None:
+        super().__init__("Missing hyperlink tag.")
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:  # raised again in the parent of a parsing process
+        return type(self), ()
+
+
+class MissingHrefAttributeError(Exception):
+
+    def __init__(self) -> None:
+        super().__init__("Missing 'href' attribute from hyperlink tag.")
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return type(self), ()
+
+
+class HrefContentError(Exception):
+
+    def __init__(self, href_content: str) -> None:
+        super().__init__(f"Wrong 'href' content: '{href_content}'. It should be of form /username.")
+        self.href_content: str = href_content
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return type(self), (self.href_content,)
+
+
+class ParserError(ValueError):
+
+    def __init__(self, parser: str) -> None:
+        super().__init__(f"Unknown parser '{parser}'. It should be one of: {', '.join(sorted(PARSERS))}.")
+
+
+class MissingParserDependencyError(ImportError):
+
+    def __init__(self, parser: str, package: str) -> None:
+        super().__init__(f"The '{parser}' parser requires {package}. Install it with `pip install {package}`.")
+
+
+_MARK_END_OF_STARGAZERS: str = 'This repository has no more stargazers.'
+
+DEFAULT_PARSER: str = "html.parser"
+
+
+def _check_href_content(href_content: typing.Optional[str]) -> str:
+    """Check the `href` attribute of the hyperlink found in a stargazer's <h3> component and return the username.
+
+    The href content contains the GitHub username prefixed by the '/' character, with the following form:
+    `/username`. If it is missing or not in the expected form, an Exception is raised.
+    """
+    if not href_content:
+        raise MissingHrefAttributeError()
+    if not re.match(r"/.+$", href_content):
+        raise HrefContentError(href_content)
+    return href_content[1:]  # dropping the first '/' character
+
+
+def _parse_with_beautifulsoup(page: str) -> typing.List[str]:
+    from bs4 import BeautifulSoup  # imported on first use, as the other backends, to keep the startup fast
+    soup: BeautifulSoup = BeautifulSoup(page, "html.parser")
+    h3_components: 'element.ResultSet' = soup.find_all('h3')
+
+    def _extract_username_from_h3(component: 'element.Tag') -> typing.Optional[str]:
+        """Check the BeautifulSoup `element.Tag` component that receives a hyperlink HTML tag.
+
+        The expected structure is as follows:
+        '<h3> <a href="/foo"> John Williams </a> </h3>'
+        It incrementally dives into the component one tag or attribute of a tag at a time, making sure they appear:
+        - the hyperlink tag: <a>
+        - the `href` attribute: <a href="..."> </a>
+        - the content of hyperlink's `href` attribute.
+
+        If any of the above mentioned is missing or not in the expected form, an Exception is raised.
+        """
+        if component.get_text() == _MARK_END_OF_STARGAZERS:
+            return None
+        hyperlink_component: typing.Optional[element.Tag] = component.find('a')
+        if not hyperlink_component:
+            raise MissingHyperlinkTagError()
+        return _check_href_content(hyperlink_component.get('href'))
+
+    users: typing.List[str] = []
+    for component in h3_components:
+        username: typing.Optional[str] = _extract_username_from_h3(component)
+        if not username:
+            break
+        users.append(username)
+
+    return users
+
+
+def _parse_with_lxml(page: str) -> typing.List[str]:
+    import lxml.html
+    if not page.strip():
+        return []
+
+    users: typing.List[str] = []
+    for component in lxml.html.fromstring(page).iter('h3'):
+        if component.text_content() == _MARK_END_OF_STARGAZERS:
+            break
+        hyperlink_component = component.find('.//a')
+        if hyperlink_component is None:
+            raise MissingHyperlinkTagError()
+        users.append(_check_href_content(hyperlink_component.get('href')))
+
+    return users
+
+
+def _parse_with_selectolax(page: str) -> typing.List[str]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    users: typing.List[str] = []
+    for component in LexborHTMLParser(page).css('h3'):
+        if component.text(deep=True) == _MARK_END_OF_STARGAZERS:
+            break
+        hyperlink_component = component.css_first('a')
+        if hyperlink_component is None:
+            raise MissingHyperlinkTagError()
+        users.append(_check_href_content(hyperlink_component.attributes.get('href')))
+
+    return users
+
+
+_H3_COMPONENT = re.compile(r"<h3\b[^>]*>(.*?)</h3\s*>", re.IGNORECASE | re.DOTALL)
+_HYPERLINK_TAG = re.compile(r"<a(?:\s[^>]*)?>", re.IGNORECASE)
+_HREF_ATTRIBUTE = re.compile(r"""\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+_H3_OPENING_TAG = re.compile(r"<h3\b", re.IGNORECASE)
+_ANY_TAG = re.compile(r"<[^>]*>")
+_COMMENT_OR_SCRIPT = re.compile(r"<!--.*?(?:-->|\Z)|<script\b[^>]*>.*?(?:</script\s*>|\Z)", re.IGNORECASE | re.DOTALL)
+
+
+def _iter_h3_components(page: str) -> typing.Iterator[str]:
+    """Yield the content of every <h3> component of the page, leaving out the comments and the scripts,
+    whose text the tree based parsers do not take for tags either.
+
+    An <h3> left open raises, as the stargazers after it cannot be told apart from the end of the page.
+    """
+    page = _COMMENT_OR_SCRIPT.sub("", page)
+    end: int = 0
+    for h3_match in _H3_COMPONENT.finditer(page):
+        yield h3_match.group(1)
+        end = h3_match.end()
+    if _H3_OPENING_TAG.search(page, end):
+        raise MissingHyperlinkTagError()
+
+
+def _parse_with_stream(page: str) -> typing.List[str]:
+    """Scan the page for the <h3> components without building any tree.
+
+    Only the first hyperlink of every <h3> is looked at, so the cost is a single pass over the page,
+    with the same validation and end of stargazers detection as the tree based parsers.
+    """
+    users: typing.List[str] = []
+    for component in _iter_h3_components(page):
+        if html.unescape(_ANY_TAG.sub("", component)) == _MARK_END_OF_STARGAZERS:
+            break
+        hyperlink_match = _HYPERLINK_TAG.search(component)
+        if not hyperlink_match:
+            raise MissingHyperlinkTagError()
+        href_match = _HREF_ATTRIBUTE.search(hyperlink_match.group(0))
+        href_content: typing.Optional[str] = None
+        if href_match:
+            href_content = html.unescape(next(group for group in href_match.groups() if group is not None))
+        users.append(_check_href_content(href_content))
+
+    return users
+
+
+_HYPERLINK_COMPONENT = re.compile(r"(<a(?:\s[^>]*)?>)(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def parse_display_names(page: str) -> typing.Dict[str, str]:
+    """Return the display name shown next to every stargazer of a HTML page, e.g. `John Williams`
+    for '<h3> <a href="/foo"> John Williams </a> </h3>', by username, scanning the page like the `stream` parser.
+
+    The stargazers without a name, or whose <h3> component is malformed, are left out.
+    """
+    display_names: typing.Dict[str, str] = {}
+    for h3_match in _H3_COMPONENT.finditer(_COMMENT_OR_SCRIPT.sub("", page)):
+        component: str = h3_match.group(1)
+        if html.unescape(_ANY_TAG.sub("", component)) == _MARK_END_OF_STARGAZERS:
+            break
+        hyperlink_match = _HYPERLINK_COMPONENT.search(component)
+        href_match = _HREF_ATTRIBUTE.search(hyperlink_match.group(1)) if hyperlink_match else None
+        if not hyperlink_match or not href_match:
+            continue
+        href_content: str = html.unescape(next(group for group in href_match.groups() if group is not None))
+        display_name: str = " ".join(html.unescape(_ANY_TAG.sub("", hyperlink_match.group(2))).split())
+        if href_content.startswith("/") and len(href_content) > 1 and display_name:
+            display_names[href_content[1:]] = display_name
+
+    return display_names
+
+
+_REQUIRED_PACKAGES: typing.Dict[str, str] = {
+    "lxml": "lxml",
+    "selectolax": "selectolax",
+}
+
+PARSERS: typing.Dict[str, typing.Callable[[str], typing.List[str]]] = {
+    "html.parser": _parse_with_beautifulsoup,
+    "lxml": _parse_with_lxml,
+    "selectolax": _parse_with_selectolax,
+    "stream": _parse_with_stream,
+}
+
+
+def get_parser(parser: str = DEFAULT_PARSER) -> typing.Callable[[str], typing.List[str]]:
+    """Return the function extracting the stargazers' usernames from the HTML of a stargazers page.
+
+    `html.parser` builds a BeautifulSoup tree, `lxml` and `selectolax` build their own, faster, trees
+    and need the package of the same name, while `stream` scans the page text without building a tree.
+    All of them raise the same exceptions on a malformed stargazer and stop at the end of stargazers mark.
+    """
+    if parser not in PARSERS:
+        raise ParserError(parser)
+    package: typing.Optional[str] = _REQUIRED_PACKAGES.get(parser)
+    if package and importlib.util.find_spec(package) is None:
+        raise MissingParserDependencyError(parser, package)
+    return PARSERS[parser]
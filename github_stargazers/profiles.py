@@ -0,0 +1,164 @@
+import concurrent.futures
+import json
+import threading
+import time
+import typing
+
+from github_stargazers.api import API_URL, get_api_headers, is_rate_limited
+from github_stargazers.github import GitHub, HTTPError, TooManyRequestsHttpError, create_session
+
+if typing.TYPE_CHECKING:
+    import requests
+
+GRAPHQL_BATCH_SIZE: int = 100
+
+_OK_STATUS_CODE: int = 200
+_TOO_MANY_REQUESTS_STATUS_CODE: int = 429
+_NOT_FOUND_ERROR_TYPE: str = "NOT_FOUND"
+_PROFILE_FIELDS: str = "login name company location followers { totalCount }"
+
+
+class GraphQLError(ValueError):
+
+    def __init__(self, message: str) -> None:
+        super().__init__(f"GitHub GraphQL API answered with an error: {message}")
+
+
+class BatchSizeError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__(f"Batch size should be between 1 and {GRAPHQL_BATCH_SIZE}.")
+
+
+class StargazerProfile(typing.NamedTuple):
+    login: str
+    name: typing.Optional[str] = None
+    company: typing.Optional[str] = None
+    location: typing.Optional[str] = None
+    followers: typing.Optional[int] = None
+
+
+def _build_query(count: int) -> str:
+    """A query for the profiles of `count` users, the login of each one being the variable `$loginN`
+    and its profile the field `userN` of the answer.
+    """
+    variables: str = ", ".join(f"$login{index}: String!" for index in range(count))
+    users: str = " ".join(f"user{index}: user(login: $login{index}) {{ {_PROFILE_FIELDS} }}" for index in range(count))
+    return f"query({variables}) {{ {users} }}"
+
+
+def _parse_profile(login: str, user: typing.Optional[typing.Dict[str, typing.Any]]) -> StargazerProfile:
+    """The profile of a user as answered by the GraphQL API, None for a deleted account."""
+    if user is None:
+        return StargazerProfile(login)
+    return StargazerProfile(user["login"], user.get("name") or None, user.get("company") or None,
+                            user.get("location") or None, (user.get("followers") or {}).get("totalCount"))
+
+
+class ProfileFetcher:
+    """Fetches the profiles of users from the GraphQL API at `api_url`, which needs a `token`.
+
+    Instead of a request per user, the users are asked `batch_size` at a time, in a single query aliasing
+    a `user(login:)` field per user, and up to `concurrency` queries are sent at once. The profiles are kept
+    in memory, and in the JSON file at `cache_path` if any, for `ttl` seconds, so that a user is fetched once
+    for all the repositories it starred.
+    """
+    __VERSION: int = 1
+    __DEFAULT_TTL: float = 24 * 3600.0
+
+    def __init__(self, token: str,  # pylint: disable=too-many-arguments
+                 session: typing.Optional['requests.Session'] = None,
+                 batch_size: int = GRAPHQL_BATCH_SIZE, concurrency: int = 4, api_url: str = API_URL,
+                 cache_path: typing.Optional[str] = None, ttl: float = __DEFAULT_TTL,
+                 clock: typing.Callable[[], float] = time.time) -> None:
+        if not 1 <= batch_size <= GRAPHQL_BATCH_SIZE:
+            raise BatchSizeError()
+        self.__session: requests.Session = session or create_session(concurrency)
+        self.__headers: typing.Dict[str, str] = get_api_headers(token)
+        self.__batch_size: int = batch_size
+        self.__concurrency: int = concurrency
+        self.__url: str = f"{api_url}/graphql"
+        self.__cache_path: typing.Optional[str] = cache_path
+        self.__ttl: float = ttl
+        self.__clock: typing.Callable[[], float] = clock
+        self.__lock: threading.Lock = threading.Lock()
+        self.__profiles: typing.Dict[str, typing.Tuple[StargazerProfile, float]] = self.__load()
+        self.__queries: int = 0
+
+    @property
+    def queries(self) -> int:
+        """The number of GraphQL queries sent so far."""
+        return self.__queries
+
+    def __load(self) -> typing.Dict[str, typing.Tuple[StargazerProfile, float]]:
+        if not self.__cache_path:
+            return {}
+        try:
+            with open(self.__cache_path, encoding="utf-8") as cache_file:
+                content: typing.Any = json.load(cache_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if not isinstance(content, dict) or content.get("version") != self.__VERSION:
+            return {}
+        return {login: (StargazerProfile(*profile), fetched_at)
+                for login, (profile, fetched_at) in content["profiles"].items()}
+
+    def __save(self) -> None:
+        if not self.__cache_path:
+            return
+        with open(self.__cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"version": self.__VERSION,
+                       "profiles": {login: (list(profile), fetched_at)
+                                    for login, (profile, fetched_at) in self.__profiles.items()}}, cache_file)
+
+    def __fetch_batch(self, logins: typing.List[str]) -> typing.List[StargazerProfile]:
+        response: requests.Response = self.__session.post(
+            self.__url, headers=self.__headers,
+            json={"query": _build_query(len(logins)),
+                  "variables": {f"login{index}": login for index, login in enumerate(logins)}})
+        with self.__lock:
+            self.__queries += 1
+        if response.status_code == _TOO_MANY_REQUESTS_STATUS_CODE or is_rate_limited(response):
+            raise TooManyRequestsHttpError()
+        if response.status_code != _OK_STATUS_CODE:
+            raise HTTPError(response.status_code)
+        try:
+            content: typing.Dict[str, typing.Any] = response.json()
+        except ValueError as error:
+            raise GraphQLError("not JSON") from error
+        errors: typing.List[typing.Dict[str, typing.Any]] = [error for error in content.get("errors") or []
+                                                             if error.get("type") != _NOT_FOUND_ERROR_TYPE]
+        if errors or not isinstance(content.get("data"), dict):
+            raise GraphQLError(errors[0].get("message", "") if errors else "no data")
+        return [_parse_profile(login, content["data"].get(f"user{index}")) for index, login in enumerate(logins)]
+
+    def fetch(self, logins: typing.Iterable[str]) -> typing.Dict[str, StargazerProfile]:
+        """Return the profile of every user, fetching only the ones not cached, or cached for too long."""
+        logins = list(dict.fromkeys(logins))
+        now: float = self.__clock()
+        missing_logins: typing.List[str] = [login for login in logins if login not in self.__profiles
+                                            or now - self.__profiles[login][1] >= self.__ttl]
+        batches: typing.List[typing.List[str]] = [missing_logins[start:start + self.__batch_size]
+                                                  for start in range(0, len(missing_logins), self.__batch_size)]
+        if batches:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.__concurrency) as executor:
+                for batch, profiles in zip(batches, executor.map(self.__fetch_batch, batches)):
+                    for login, profile in zip(batch, profiles):
+                        self.__profiles[login] = (profile, now)
+            self.__save()
+        return {login: self.__profiles[login][0] for login in logins}
+
+
+def get_stargazer_profiles(github: GitHub,
+                           fetcher: typing.Optional[ProfileFetcher] = None) -> typing.List[StargazerProfile]:
+    """Return the profile of every stargazer, sorted by login, with the display name shown on the stargazers
+    pages, and the other fields fetched by the `fetcher` if any. The fetched name is used only for the
+    stargazers listed without one, e.g. by the api engine.
+    """
+    display_names: typing.Dict[str, typing.Optional[str]] = github.get_display_names()
+    fetched_profiles: typing.Dict[str, StargazerProfile] = fetcher.fetch(display_names) if fetcher else {}
+    profiles: typing.List[StargazerProfile] = []
+    for login, display_name in display_names.items():
+        profile: StargazerProfile = fetched_profiles.get(login, StargazerProfile(login))._replace(login=login)
+        profiles.append(profile._replace(name=display_name) if display_name else profile)
+    return profiles
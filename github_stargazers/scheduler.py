@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    import requests
+
+
+class SchedulerArgumentError(ValueError):
+
+    def __init__(self, argument: str) -> None:
+        super().__init__(f"Scheduler's {argument} should be a positive number.")
+
+
+def parse_retry_after(retry_after: typing.Optional[str], now: float) -> typing.Optional[float]:
+    """Return the seconds to wait according to a Retry-After header, given either in seconds or as a HTTP date."""
+    if not retry_after:
+        return None
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+    import email.utils  # rarely needed, and slow to import
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_date.timestamp() - now)
+
+
+class RequestScheduler:
+    """Paces the page requests of one or more `GitHub` instances to the highest rate GitHub accepts.
+
+    - a token bucket lets at most `rate` requests per second through, in bursts of at most `burst`;
+    - the number of requests in flight adapts in AIMD fashion between 1 and `max_concurrency`: it grows
+      by one after as many fast responses as the current limit, and halves on a 429 response or on a
+      response slower than `slow_latency` seconds;
+    - a 429 response pauses every request for its Retry-After header, or else for an exponential backoff
+      with jitter, then only the throttled page is requested again, at most `max_retries` times.
+
+    The same scheduler can be shared by many `GitHub` instances, so that they respect the limits together.
+    """
+    __TOO_MANY_REQUESTS_STATUS_CODE: int = 429
+
+    def __init__(self, rate: typing.Optional[float] = None, burst: int = 1,  # pylint: disable=too-many-arguments
+                 max_concurrency: int = 8, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 slow_latency: typing.Optional[float] = None,
+                 clock: typing.Callable[[], float] = time.time,
+                 sleep: typing.Callable[[float], None] = time.sleep) -> None:
+        for argument, value in (("rate", rate), ("burst", burst), ("max_concurrency", max_concurrency),
+                                ("slow_latency", slow_latency)):
+            if value is not None and value <= 0:
+                raise SchedulerArgumentError(argument)
+        self.__rate: typing.Optional[float] = rate
+        self.__burst: int = burst
+        self.__max_concurrency: int = max_concurrency
+        self.__max_retries: int = max_retries
+        self.__base_delay: float = base_delay
+        self.__max_delay: float = max_delay
+        self.__slow_latency: typing.Optional[float] = slow_latency
+        self.__clock: typing.Callable[[], float] = clock
+        self.__sleep: typing.Callable[[float], None] = sleep
+
+        self.__condition: threading.Condition = threading.Condition()
+        self.__tokens: float = float(burst)
+        self.__refilled_at: float = clock()
+        self.__paused_until: float = 0.0
+        self.__limit: float = float(max_concurrency)
+        self.__in_flight: int = 0
+        self.__retries: int = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self.__limit)
+
+    @property
+    def retries(self) -> int:
+        return self.__retries
+
+    def __refill(self, now: float) -> None:
+        if self.__rate is not None:
+            self.__tokens = min(float(self.__burst), self.__tokens + (now - self.__refilled_at) * self.__rate)
+        self.__refilled_at = now
+
+    def __acquire(self) -> None:
+        while True:
+            with self.__condition:
+                while self.__in_flight >= int(self.__limit):
+                    self.__condition.wait()
+                now: float = self.__clock()
+                self.__refill(now)
+                if now < self.__paused_until:
+                    delay: float = self.__paused_until - now
+                elif self.__rate is not None and self.__tokens < 1:
+                    delay = (1 - self.__tokens) / self.__rate
+                else:
+                    if self.__rate is not None:
+                        self.__tokens -= 1
+                    self.__in_flight += 1
+                    return
+            self.__sleep(delay)
+
+    def __release(self, latency: float, throttled: bool) -> None:
+        with self.__condition:
+            self.__in_flight -= 1
+            if throttled or (self.__slow_latency is not None and latency > self.__slow_latency):
+                self.__limit = max(1.0, self.__limit / 2)
+            else:
+                self.__limit = min(float(self.__max_concurrency), self.__limit + 1 / int(self.__limit))
+            self.__condition.notify_all()
+
+    def __get_backoff_delay(self, attempt: int, retry_after: typing.Optional[str]) -> float:
+        delay: typing.Optional[float] = parse_retry_after(retry_after, self.__clock())
+        jitter: float = random.uniform(0, self.__base_delay)
+        if delay is not None:
+            return delay + jitter
+        return min(self.__max_delay, self.__base_delay * 2 ** attempt) / 2 + jitter
+
+    def request(self, send: typing.Callable[[], 'requests.Response']) -> 'requests.Response':
+        """Call `send` when the limits allow it, calling it again while it is throttled with a 429 response.
+
+        The last response is returned, which is still a 429 one when all the retries were throttled.
+        """
+        attempt: int = 0
+        while True:
+            self.__acquire()
+            start: float = time.monotonic()
+            throttled: bool = False
+            try:
+                response: requests.Response = send()
+                throttled = response.status_code == self.__TOO_MANY_REQUESTS_STATUS_CODE
+            finally:
+                self.__release(time.monotonic() - start, throttled)
+            if not throttled or attempt >= self.__max_retries:
+                return response
+
+            delay: float = self.__get_backoff_delay(attempt, response.headers.get('Retry-After'))
+            response.close()  # sent with stream=True, the throttled response holds its connection until closed
+            with self.__condition:
+                self.__paused_until = max(self.__paused_until, self.__clock() + delay)
+                self.__retries += 1
+            attempt += 1
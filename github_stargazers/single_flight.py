@@ -0,0 +1,70 @@
+import collections
+import concurrent.futures
+import threading
+import time
+import typing
+
+
+class SingleFlight:
+    """Runs a single call at a time per key, e.g. the fetch of a page URL: the threads asking for a key
+    whose call is in flight wait for it and share its result, or its exception, instead of calling again.
+
+    A result is also kept for `ttl` seconds, `max_results` of them at most, and returned to the later
+    callers of the same key; the exceptions are not kept. Share one instance between the `GitHub`
+    instances, as the command line does, so that the same pages are requested once for all of them.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_results: int = 1024,
+                 clock: typing.Callable[[], float] = time.monotonic) -> None:
+        self.__ttl: float = ttl
+        self.__max_results: int = max_results
+        self.__clock: typing.Callable[[], float] = clock
+        self.__lock: threading.Lock = threading.Lock()
+        self.__calls: typing.Dict[typing.Hashable, concurrent.futures.Future] = {}
+        self.__results: typing.OrderedDict[typing.Hashable, typing.Tuple[float, typing.Any]] = \
+            collections.OrderedDict()
+        self.__shared: int = 0
+
+    @property
+    def shared(self) -> int:
+        """The number of calls answered with the result of another one."""
+        with self.__lock:
+            return self.__shared
+
+    def __keep(self, key: typing.Hashable, result: typing.Any) -> None:
+        now: float = self.__clock()
+        self.__results[key] = (now + self.__ttl, result)
+        self.__results.move_to_end(key)
+        while self.__results and (len(self.__results) > self.__max_results or
+                                  next(iter(self.__results.values()))[0] <= now):
+            self.__results.popitem(last=False)
+
+    def call(self, key: typing.Hashable, function: typing.Callable[[], typing.Any]) -> typing.Tuple[typing.Any, bool]:
+        """Return the result of `function()`, or of the call of `key` in flight or kept, and whether it was shared."""
+        with self.__lock:
+            kept: typing.Optional[typing.Tuple[float, typing.Any]] = self.__results.get(key)
+            if kept is not None and kept[0] > self.__clock():
+                self.__shared += 1
+                return kept[1], True
+            flight: typing.Optional[concurrent.futures.Future] = self.__calls.get(key)
+            is_waiting: bool = flight is not None
+            if flight is None:
+                flight = self.__calls[key] = concurrent.futures.Future()
+            else:
+                self.__shared += 1
+        if is_waiting:
+            return flight.result(), True
+
+        try:
+            result: typing.Any = function()
+        except BaseException as exception:
+            with self.__lock:
+                del self.__calls[key]
+            flight.set_exception(exception)
+            raise
+        with self.__lock:
+            del self.__calls[key]
+            if self.__ttl > 0:
+                self.__keep(key, result)
+        flight.set_result(result)
+        return result, False
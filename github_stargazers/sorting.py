@@ -0,0 +1,83 @@
+import heapq
+import itertools
+import os
+import tempfile
+import typing
+
+
+class RunSizeError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("Run size should be a positive integer.")
+
+
+class MaxOpenRunsError(ValueError):
+
+    def __init__(self) -> None:
+        super().__init__("Max open runs should be an integer of at least 2.")
+
+
+_DEFAULT_MAX_OPEN_RUNS: int = 64
+
+
+def _read_run(run_path: str) -> typing.Generator[str, None, None]:
+    with open(run_path, encoding="utf-8") as run_file:
+        for line in run_file:
+            yield line[:-1]  # dropping the '\n' character
+
+
+def _write_run(items: typing.Iterable[str], directory: str) -> str:
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False) as run_file:
+        run_file.writelines(item + "\n" for item in items)
+    return run_file.name
+
+
+def _merge_runs(run_paths: typing.List[str]) -> typing.Iterator[str]:
+    runs: typing.List[typing.Generator[str, None, None]] = [_read_run(run_path) for run_path in run_paths]
+    try:
+        yield from heapq.merge(*runs)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _merge_sorted_runs(items: typing.Iterable[str], run_size: int, max_open_runs: int) -> typing.Iterator[str]:
+    """Write the sorted runs to closed files, then merge them `max_open_runs` at a time into longer runs
+    until no more than `max_open_runs` are left, merged lazily, so that few files are open at once.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        run_paths: typing.List[str] = []
+        iterator: typing.Iterator[str] = iter(items)
+        while True:
+            run: typing.List[str] = sorted(itertools.islice(iterator, run_size))
+            if not run:
+                break
+            if not run_paths and len(run) < run_size:
+                yield from run  # everything fitted in a single run, no need for a file
+                return
+            run_paths.append(_write_run(run, directory))
+
+        while len(run_paths) > max_open_runs:
+            merged_run_paths: typing.List[str] = []
+            for start in range(0, len(run_paths), max_open_runs):
+                merged_run_paths.append(_write_run(_merge_runs(run_paths[start:start + max_open_runs]), directory))
+                for run_path in run_paths[start:start + max_open_runs]:
+                    os.remove(run_path)
+            run_paths = merged_run_paths
+
+        yield from _merge_runs(run_paths)
+
+
+def sort_with_bounded_memory(items: typing.Iterable[str], run_size: int,
+                             max_open_runs: int = _DEFAULT_MAX_OPEN_RUNS) -> typing.Iterator[str]:
+    """Yield the `items` sorted, holding at most `run_size` of them in memory at once.
+
+    The items are sorted in runs of `run_size`, each written to a temporary file, and the runs
+    are merged lazily. The items should not contain newlines, which holds for GitHub usernames.
+    At most `max_open_runs` runs are read at once, the others waiting in merge passes.
+    """
+    if run_size < 1:
+        raise RunSizeError()
+    if max_open_runs < 2:
+        raise MaxOpenRunsError()
+    return _merge_sorted_runs(items, run_size, max_open_runs)
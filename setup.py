@@ -20,6 +20,7 @@ setup(
     name='github-stargazers',
     #package_dir = {'': 'github-stargazers'},
     packages=['github_stargazers'],
+    python_requires='>=3.7',
     entry_points={
         'console_scripts': [
             'github-stargazers=github_stargazers.github_stargazers:command_line'
@@ -28,9 +29,14 @@ setup(
     install_requires=[
         'beautifulsoup4>=4.6.0',
         'halo>=0.0.7',
-        'click>=6.7',
+        'click>=8.0',
         'requests>=2.18.4'
     ],
+    extras_require={
+        'async': ['aiohttp>=3.0'],
+        'lxml': ['lxml>=4.0'],
+        'selectolax': ['selectolax>=0.3.12'],
+    },
     version=get_version(),
     description='List stargazers and check if a user starred that repository',
     long_description=get_long_description(),
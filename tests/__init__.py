@@ -1,5 +1,11 @@
+import json
+import re
 import typing
 
+import responses
+
+from github_stargazers.api import API_PAGE_SIZE
+
 
 def get_examples_invalid_user_repo() -> typing.List[str]:
     return [
@@ -15,3 +21,50 @@ def get_wrong_href_content() -> typing.List[str]:
 
 def get_page_content_with_href(href: str) -> str:
     return '<h3> <a href="' + href + '"> John Williams </a> </h3>'
+
+
+def register_pages(*bodies: str, status: int = 200, headers: typing.Optional[typing.Dict[str, str]] = None,
+                   repository: str = "foo/bar", mock: typing.Any = responses) -> None:
+    """Registers the stargazers pages of `repository` with `mock`, `responses` itself, a `responses.RequestsMock`
+    or an `aioresponses` mock, page N answering the N-th of the `bodies`.
+    """
+    for page_number, body in enumerate(bodies, 1):
+        mock.add(url=f"https://github.com/{repository}/stargazers?page={page_number}", method="GET", body=body,
+                 status=status, headers=headers)
+
+
+_STARGAZERS_PER_PAGE: int = 2
+
+
+class StargazersPages:
+    """Serves the stargazers pages of `foo/bar` from `users`, given in starring order, like GitHub does:
+    the website lists the newest stars first, two per page, and with `api` the REST API lists the oldest
+    first, a full page at a time. Answers 429 Too Many Requests for the `throttled_page` if any.
+    """
+
+    def __init__(self, users: typing.List[str], throttled_page: typing.Optional[int] = None, api: bool = False) -> None:
+        self.users: typing.List[str] = users
+        self.throttled_page: typing.Optional[int] = throttled_page
+        self.requested_pages: typing.List[int] = []
+        self.__api: bool = api
+        url: str = r"https://api\.github\.com/repos/foo/bar/stargazers\?per_page=\d+&page=\d+" if api \
+            else r"https://github\.com/foo/bar/stargazers\?page=\d+"
+        responses.add_callback(responses.GET, re.compile(url), callback=self.__render)
+
+    def __render(self, request: typing.Any) -> typing.Tuple[int, typing.Dict[str, str], str]:
+        page_number: int = int(request.url.split("=")[-1])
+        self.requested_pages.append(page_number)
+        if page_number == self.throttled_page:
+            return 429, {}, ""
+        if self.__api:
+            first: int = (page_number - 1) * API_PAGE_SIZE
+            return 200, {}, json.dumps([{"login": user} for user in self.users[first:first + API_PAGE_SIZE]])
+        first = (page_number - 1) * _STARGAZERS_PER_PAGE
+        page_users: typing.List[str] = self.users[::-1][first:first + _STARGAZERS_PER_PAGE]
+        if not page_users:
+            return 200, {}, "<h3>This repository has no more stargazers.</h3>"
+        return 200, {}, "".join(f'<h3> <a href="/{user}"> {user} </a> </h3>' for user in page_users)
+
+
+def get_users(count: int) -> typing.List[str]:
+    return [f"user{index:02d}" for index in range(count)]
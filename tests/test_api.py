@@ -0,0 +1,115 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import requests
+import responses
+
+from benchmarks.stub_server import StubGitHubServer, get_username
+from github_stargazers.api import ApiResponseError, PaginationLimitError, parse_api_page
+from github_stargazers.github import GitHub, EngineError, HTTPError, TooManyRequestsHttpError, create_session
+from github_stargazers.github_stargazers import command_line
+
+
+def counting_session(urls: typing.List[str]) -> requests.Session:
+    session: requests.Session = create_session()
+    session.hooks['response'].append(lambda response, *args, **kwargs: urls.append(response.url))
+    return session
+
+
+@pytest.mark.parametrize("stars, expected_requests", [(0, 1), (250, 3), (200, 3)])
+def test_api_engine_lists_all_stargazers(stars: int, expected_requests: int) -> None:
+    urls: typing.List[str] = []
+    with StubGitHubServer(stars=stars) as server:
+        github: GitHub = GitHub("foo/bar", session=counting_session(urls), engine="api", api_url=server.url)
+        assert github.get_all_stargazers() == [get_username(index) for index in range(stars)]
+    assert len(urls) == expected_requests
+    assert urls[0] == server.url + "/repos/foo/bar/stargazers?per_page=100&page=1"
+
+
+def test_api_engine_with_concurrency() -> None:
+    with StubGitHubServer(stars=1234) as server:
+        github: GitHub = GitHub("foo/bar", concurrency=4, engine="api", api_url=server.url)
+        assert github.get_all_stargazers() == [get_username(index) for index in range(1234)]
+        assert github.is_stargazer(get_username(1233))
+        assert not github.is_stargazer("foo")
+
+
+def test_api_engine_token() -> None:
+    with StubGitHubServer(stars=10, token="secret") as server:
+        assert GitHub("foo/bar", engine="api", api_url=server.url, token="secret").is_stargazer(get_username(3))
+        with pytest.raises(HTTPError):
+            GitHub("foo/bar", engine="api", api_url=server.url, token="wrong").get_all_stargazers()
+
+
+@responses.activate
+def test_api_engine_rate_limited() -> None:
+    responses.add(responses.GET, "https://api.github.com/repos/foo/bar/stargazers?per_page=100&page=1",
+                  json={"message": "API rate limit exceeded"}, status=403, headers={"X-RateLimit-Remaining": "0"})
+    with pytest.raises(TooManyRequestsHttpError):
+        GitHub("foo/bar", engine="api").get_all_stargazers()
+
+
+@pytest.mark.parametrize("text", ["<html></html>", '{"message": "Not Found"}', '[{"id": 1}]'])
+def test_parse_api_page_errors(text: str) -> None:
+    with pytest.raises(ApiResponseError):
+        parse_api_page(text)
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(EngineError):
+        GitHub("foo/bar", engine="foo")
+
+
+@responses.activate
+def test_api_engine_command_line(ok_status_code: int) -> None:
+    responses.add(responses.GET, "https://api.github.com/repos/foo/bar/stargazers?per_page=100&page=1",
+                  json=[{"login": "foo"}, {"login": "bar"}], status=ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--engine', 'api'], env={'GITHUB_TOKEN': 'secret'})
+    assert result.exit_code == 0
+    assert result.output == "Stargazers:\nbar\nfoo\n"
+    assert responses.calls[0].request.headers['Authorization'] == "Bearer secret"
+
+
+def test_api_engine_fans_out_up_to_the_last_page() -> None:
+    urls: typing.List[str] = []
+    with StubGitHubServer(stars=1234) as server:
+        github: GitHub = GitHub("foo/bar", concurrency=4, session=counting_session(urls), engine="api",
+                                api_url=server.url)
+        assert github.get_all_stargazers() == [get_username(index) for index in range(1234)]
+    assert sorted(urls) == sorted(server.url + "/repos/foo/bar/stargazers?per_page=100&page=" + str(page)
+                                  for page in range(1, 14))
+
+
+@responses.activate
+def test_api_engine_without_last_page_hint(ok_status_code: int) -> None:
+    pages: typing.List[typing.List[typing.Dict[str, str]]] = [
+        [{"login": f"user{index}"} for index in range(100)], [{"login": "foo"}], [], []]
+    for page_number, page in enumerate(pages):
+        responses.add(responses.GET,
+                      "https://api.github.com/repos/foo/bar/stargazers?per_page=100&page=" + str(page_number + 1),
+                      json=page, status=ok_status_code)
+    stargazers: typing.List[str] = GitHub("foo/bar", concurrency=3, engine="api").get_all_stargazers()
+    assert stargazers == sorted(["foo"] + [f"user{index}" for index in range(100)])
+
+
+@responses.activate
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_api_engine_past_the_pagination_limit_raises(concurrency: int, ok_status_code: int) -> None:
+    url_prefix: str = "https://api.github.com/repos/foo/bar/stargazers?per_page=100&page="
+    for page_number in (1, 2):
+        responses.add(responses.GET, url_prefix + str(page_number), status=ok_status_code,
+                      json=[{"login": f"user{page_number}_{index}"} for index in range(100)],
+                      headers={"Link": f'<{url_prefix}2>; rel="last"'})
+    for page_number in range(3, 6):
+        responses.add(responses.GET, url_prefix + str(page_number), status=422,
+                      json={"message": "In order to keep the API fast for everyone, pagination is limited."})
+    with pytest.raises(PaginationLimitError):
+        GitHub("foo/bar", concurrency=concurrency, engine="api").get_all_stargazers()
+
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--engine', 'api', '--concurrency', str(concurrency)])
+    assert result.exit_code == 0
+    assert result.output == "GitHub API lists only the first stargazers of foo/bar, about 400 pages of them. " \
+                            "Use the html engine to list them all.\n"
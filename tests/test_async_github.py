@@ -0,0 +1,143 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import asyncio
+import typing
+
+from aioresponses import aioresponses
+import pytest
+
+from github_stargazers.async_github import AsyncGitHub
+from github_stargazers.github import UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError
+from github_stargazers.github import MissingHyperlinkTagError, HrefContentError
+from tests import get_wrong_href_content, get_page_content_with_href, register_pages
+
+
+def run(coroutine: typing.Awaitable) -> typing.Any:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def get_all_stargazers(username_and_repository: str, concurrency: int = 1) -> typing.List[str]:
+    async with AsyncGitHub(username_and_repository, concurrency=concurrency) as github:
+        return await github.get_all_stargazers()
+
+
+async def is_stargazer(username_and_repository: str, user: str, concurrency: int = 1) -> bool:
+    async with AsyncGitHub(username_and_repository, concurrency=concurrency) as github:
+        return await github.is_stargazer(user)
+
+
+@pytest.fixture
+def url_page_content_1() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+@pytest.fixture
+def url_page_content_2() -> str:
+    return '<h3> <a href="/foo2"> John Williams 2 </a> </h3> ' \
+           '<h3> <a href="/bar2"> Michael Phelps 2 </a> </h3>'
+
+
+@pytest.fixture
+def url_page_content_without_stargazers() -> str:
+    return "<html> <h1> title </h1> </html>"
+
+
+def test_wrong_argument_raises() -> None:
+    wrong_arguments: typing.List[str] = ["foo", "foo/", "/bar", "/", "//", ""]
+    for wrong_argument in wrong_arguments:
+        with pytest.raises(UsernameRepositoryError):
+            AsyncGitHub(wrong_argument)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_get_all_stargazers_sorts_stargazers_two_pages(url_page_content_1: str,
+                                                       url_page_content_2: str,
+                                                       url_page_content_without_stargazers: str,
+                                                       concurrency: int,
+                                                       ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers,
+                       status=ok_status_code, mock=mocked)
+        assert run(get_all_stargazers("foo/bar", concurrency)) == sorted(['foo', 'bar', 'foo2', 'bar2'])
+
+
+def test_get_all_stargazers_stops_on_repeated_page(url_page_content_1: str, ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        register_pages(url_page_content_1, url_page_content_1, status=ok_status_code, mock=mocked)
+        assert run(get_all_stargazers("foo/bar")) == sorted(['foo', 'bar'])
+
+
+def test_get_all_stargazers_on_invalid_user_repo_raises(url_page_content_1: str,
+                                                        not_found_status_code: int) -> None:
+    with aioresponses() as mocked:
+        mocked.get("https://github.com/foo/bar/stargazers?page=1",
+                   body=url_page_content_1, status=not_found_status_code)
+        with pytest.raises(UrlNotFoundError):
+            run(get_all_stargazers("foo/bar"))
+
+
+def test_get_all_stargazers_on_too_many_requests_raises(url_page_content_1: str,
+                                                        too_many_requests_status_code: int) -> None:
+    with aioresponses() as mocked:
+        mocked.get("https://github.com/foo/bar/stargazers?page=1",
+                   body=url_page_content_1, status=too_many_requests_status_code)
+        with pytest.raises(TooManyRequestsHttpError):
+            run(get_all_stargazers("foo/bar", concurrency=2))
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_provided_user_is_stargazer_on_last_page(url_page_content_1: str,
+                                                 url_page_content_2: str,
+                                                 concurrency: int,
+                                                 ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        register_pages(url_page_content_1, url_page_content_2, status=ok_status_code, mock=mocked)
+        assert run(is_stargazer("foo/bar", "bar2", concurrency))
+
+
+def test_provided_user_is_not_stargazer(url_page_content_1: str,
+                                        url_page_content_without_stargazers: str,
+                                        ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        register_pages(url_page_content_1, url_page_content_without_stargazers, status=ok_status_code, mock=mocked)
+        assert not run(is_stargazer("foo/bar", "another_foo"))
+
+
+def test_provided_user_with_missing_hyperlink_tag(url_page_content_no_hyperlink: str,
+                                                  ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        mocked.get("https://github.com/foo/bar/stargazers?page=1",
+                   body=url_page_content_no_hyperlink, status=ok_status_code)
+        with pytest.raises(MissingHyperlinkTagError):
+            run(is_stargazer("foo/bar", "foo"))
+
+
+@pytest.mark.parametrize("wrong_href_content", get_wrong_href_content())
+def test_wrong_href_content_raises(wrong_href_content: str, ok_status_code: int) -> None:
+    with aioresponses() as mocked:
+        mocked.get("https://github.com/foo/bar/stargazers?page=1",
+                   body=get_page_content_with_href(wrong_href_content), status=ok_status_code)
+        with pytest.raises(HrefContentError):
+            run(is_stargazer("foo/bar", "foo"))
+
+
+def test_shared_session_is_not_closed(url_page_content_1: str,
+                                      url_page_content_without_stargazers: str,
+                                      ok_status_code: int) -> None:
+    async def check_two_repositories() -> typing.List[bool]:
+        import aiohttp
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(AsyncGitHub("foo/bar", session=session).is_stargazer("foo"),
+                                           AsyncGitHub("foo/baz", session=session).is_stargazer("foo"))
+            assert not session.closed
+            return list(results)
+
+    with aioresponses() as mocked:
+        for repository in ["foo/bar", "foo/baz"]:
+            register_pages(url_page_content_1, url_page_content_without_stargazers, status=ok_status_code,
+                           repository=repository, mock=mocked)
+        assert run(check_two_repositories()) == [True, True]
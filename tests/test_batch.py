@@ -0,0 +1,113 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import io
+import json
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.batch import RepositoryResult, process_repository, read_repositories, write_csv
+from github_stargazers.github import GitHub
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.parsers import MissingParserDependencyError
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+@pytest.fixture
+def url_page_content_without_stargazers() -> str:
+    return "<html> <h1> title </h1> </html>"
+
+
+def add_repository(repository: str, body: str, end_body: str, status: int) -> None:
+    responses.add(responses.GET, f"https://github.com/{repository}/stargazers?page=1", body=body, status=status)
+    responses.add(responses.GET, f"https://github.com/{repository}/stargazers?page=2", body=end_body, status=status)
+
+
+def test_read_repositories() -> None:
+    lines: typing.List[str] = ["foo/bar\n", "\n", "  # a comment\n", "  baz/qux  \n"]
+    assert read_repositories(lines) == ["foo/bar", "baz/qux"]
+
+
+@responses.activate
+def test_batch_jsonl(url_page_content: str,
+                     url_page_content_without_stargazers: str,
+                     ok_status_code: int,
+                     not_found_status_code: int) -> None:
+    add_repository("foo/bar", url_page_content, url_page_content_without_stargazers, ok_status_code)
+    add_repository("baz/qux", "", "", not_found_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', 'baz/qux', 'wrong', '--format', 'jsonl',
+                                                       '--concurrency', '2'])
+    assert result.exit_code == 0
+    records: typing.List[typing.Dict[str, typing.Any]] = [json.loads(line) for line in result.output.splitlines()]
+    assert records == [
+        {"repository": "foo/bar", "count": 2, "stargazers": ["bar", "foo"], "error": None, "message": None},
+        {"repository": "baz/qux", "count": None, "stargazers": None, "error": "UrlNotFoundError",
+         "message": "Resource not Found. Check that the repository baz/qux is correct."},
+        {"repository": "wrong", "count": None, "stargazers": None, "error": "UsernameRepositoryError",
+         "message": "Argument should be of form username/repository."},
+    ]
+
+
+@responses.activate
+def test_batch_csv_from_stdin(url_page_content: str,
+                              url_page_content_without_stargazers: str,
+                              ok_status_code: int) -> None:
+    add_repository("foo/bar", url_page_content, url_page_content_without_stargazers, ok_status_code)
+    add_repository("baz/qux", url_page_content_without_stargazers, url_page_content_without_stargazers,
+                   ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['--repositories-file', '-', '--format', 'csv',
+                                                       '--user', 'foo'],
+                                        input="foo/bar\n# skipped\nbaz/qux\n")
+    assert result.exit_code == 0
+    assert result.output == "repository,user,is_stargazer,error,message\n" \
+                            "foo/bar,foo,True,,\n" \
+                            "baz/qux,foo,False,,\n"
+
+
+def test_parser_errors_are_records_of_the_repository() -> None:
+    def github_factory(_repository: str) -> GitHub:
+        raise MissingParserDependencyError("lxml", "lxml")
+
+    result: RepositoryResult = process_repository(github_factory, "foo/bar")
+    assert result.error == "MissingParserDependencyError"
+    assert result.stargazers is None
+    assert process_repository(lambda repository: GitHub(repository, parser="foo"), "foo/bar").error == "ParserError"
+
+
+@pytest.mark.parametrize("options", [['baz/qux', '--incremental', 'foo.json'],
+                                     ['--format', 'jsonl', '--incremental', 'foo.json'],
+                                     ['--format', 'jsonl', '--stream'],
+                                     ['--format', 'csv', '--run-size', '10']])
+def test_options_listing_a_single_repository_as_text(options: typing.List[str]) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar'] + options)
+    assert result.exit_code == 2
+
+
+def test_write_csv_joins_stargazers() -> None:
+    output: io.StringIO = io.StringIO()
+    write_csv([RepositoryResult("foo/bar", stargazers=["bar", "foo"])], output)
+    assert output.getvalue() == "repository,count,stargazers,error,message\nfoo/bar,2,bar foo,,\n"
+
+
+@responses.activate
+def test_text_output_of_many_repositories(url_page_content: str,
+                                          url_page_content_without_stargazers: str,
+                                          ok_status_code: int) -> None:
+    add_repository("foo/bar", url_page_content, url_page_content_without_stargazers, ok_status_code)
+    add_repository("baz/qux", url_page_content_without_stargazers, url_page_content_without_stargazers,
+                   ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', 'baz/qux'])
+    assert result.exit_code == 0
+    assert result.output == "foo/bar:\nStargazers:\nbar\nfoo\nbaz/qux:\n0 stargazers.\n"
+
+
+def test_missing_repositories() -> None:
+    result: Result = CliRunner().invoke(command_line, [])
+    assert result.exit_code == 2
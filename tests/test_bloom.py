@@ -0,0 +1,126 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import itertools
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.bloom import BloomFilter, FalsePositiveRateError
+from github_stargazers.compact import CompactStargazers
+from github_stargazers.github import GitHub
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.incremental import SnapshotFormatError
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+@pytest.fixture
+def bloom_path(tmp_path: typing.Any) -> str:
+    return str(tmp_path / "foo_bar.bloom")
+
+
+def get_false_positive(bloom_filter: BloomFilter) -> str:
+    return next(user for user in (f"user{index}" for index in itertools.count()) if user in bloom_filter)
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    users: typing.List[str] = [f"user{index}" for index in range(10000)]
+    bloom_filter: BloomFilter = BloomFilter.from_stargazers(users, false_positive_rate=0.01)
+    assert all(user in bloom_filter for user in users)
+    assert len(bloom_filter) == 10000
+    assert bloom_filter.nbytes < 10000 * 1.3
+
+    false_positives: int = sum(f"other{index}" in bloom_filter for index in range(10000))
+    assert false_positives < 10000 * 0.02
+
+
+def test_bloom_filter_is_saved_and_loaded(bloom_path: str) -> None:
+    BloomFilter.from_stargazers(["foo", "bar"]).save(bloom_path)
+    bloom_filter: BloomFilter = BloomFilter.load(bloom_path)
+    assert "foo" in bloom_filter and "bar" in bloom_filter
+    assert "baz" not in bloom_filter
+    assert len(bloom_filter) == 2
+    with pytest.raises(TypeError):
+        bloom_filter.add("baz")
+
+
+@pytest.mark.parametrize("content", [b"", b"foo", b"GHBLOOM\0" + b"\0" * 40])
+def test_invalid_bloom_filter_raises(bloom_path: str, content: bytes) -> None:
+    with open(bloom_path, "wb") as bloom_file:
+        bloom_file.write(content)
+    with pytest.raises(SnapshotFormatError):
+        BloomFilter.load(bloom_path)
+
+
+@pytest.mark.parametrize("false_positive_rate", [0, 1, -0.5, 2])
+def test_wrong_false_positive_rate_raises(false_positive_rate: float) -> None:
+    with pytest.raises(FalsePositiveRateError):
+        BloomFilter(10, false_positive_rate)
+
+
+@responses.activate
+def test_is_stargazer_answers_definite_negatives_without_crawling(url_page_content: str,
+                                                                  ok_status_code: int) -> None:
+    github: GitHub = GitHub("foo/bar", bloom_filter=BloomFilter.from_stargazers(["foo", "bar"]))
+    assert not github.is_stargazer("baz")
+    assert not responses.calls
+
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    assert github.is_stargazer("foo")
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_is_stargazer_confirms_false_positives(url_page_content: str,
+                                               ok_status_code: int) -> None:
+    bloom_filter: BloomFilter = BloomFilter.from_stargazers(["foo", "bar"], false_positive_rate=0.5)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    false_positive: str = get_false_positive(bloom_filter)
+    assert GitHub("foo/bar", bloom_filter=bloom_filter).are_stargazers([false_positive, "foo", "baz"]) == \
+        {false_positive: False, "foo": True, "baz": False}
+
+
+@responses.activate
+def test_export_bloom_and_bloom_options(url_page_content: str, ok_status_code: int, bloom_path: str) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--export-bloom', bloom_path])
+    assert result.exit_code == 0
+    calls: int = len(responses.calls)
+
+    result = CliRunner().invoke(command_line, ['foo/bar', '--bloom', bloom_path, '--user', 'baz'])
+    assert result.exit_code == 0
+    assert result.output == 'Not a Stargazer\n'
+    assert len(responses.calls) == calls
+
+
+def test_bloom_option_skips_the_snapshot(tmp_path: typing.Any, bloom_path: str) -> None:
+    BloomFilter.from_stargazers(["foo", "bar"]).save(bloom_path)
+    missing_snapshot_path: str = str(tmp_path / "missing.bin")
+    result: Result = CliRunner().invoke(command_line, ['--from-snapshot', missing_snapshot_path,
+                                                       '--bloom', bloom_path, '--user', 'baz'])
+    assert result.output == 'Not a Stargazer\n'
+
+    snapshot_path: str = str(tmp_path / "foo_bar.bin")
+    CompactStargazers(["foo", "bar"]).save(snapshot_path)
+    result = CliRunner().invoke(command_line, ['--from-snapshot', snapshot_path, '--bloom', bloom_path,
+                                               '--user', 'foo'])
+    assert result.output == 'Stargazer\n'
+
+
+def test_export_bloom_needs_a_listing(bloom_path: str) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--export-bloom', bloom_path, '--user', 'foo'])
+    assert result.exit_code == 2
+    assert "--export-bloom" in result.output
@@ -0,0 +1,99 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import os
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.cache import PageCache, CacheStats, CacheTtlError
+from github_stargazers.github import GitHub
+from github_stargazers.github_stargazers import command_line
+from tests import register_pages
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+@pytest.fixture
+def url_page_content_without_stargazers() -> str:
+    return "<html> <h1> title </h1> </html>"
+
+
+def test_negative_ttl_raises(tmp_path: typing.Any) -> None:
+    with pytest.raises(CacheTtlError):
+        PageCache(str(tmp_path), ttl=-1)
+
+
+@responses.activate
+def test_fresh_pages_are_served_without_requests(tmp_path: typing.Any,
+                                                 url_page_content: str,
+                                                 url_page_content_without_stargazers: str,
+                                                 ok_status_code: int) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    cache = PageCache(str(tmp_path))
+    assert GitHub("foo/bar", cache=cache).get_all_stargazers() == ['bar', 'foo']
+    assert GitHub("foo/bar", cache=PageCache(str(tmp_path))).get_all_stargazers() == ['bar', 'foo']
+    assert len(responses.calls) == 2
+    assert cache.stats == CacheStats(hits=0, revalidations=0, misses=2)
+
+
+def test_stale_pages_are_revalidated(tmp_path: typing.Any,
+                                     url_page_content: str,
+                                     url_page_content_without_stargazers: str,
+                                     ok_status_code: int) -> None:
+    with responses.RequestsMock() as mocked:
+        register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code,
+                       headers={'ETag': '"v1"'}, mock=mocked)
+        GitHub("foo/bar", cache=PageCache(str(tmp_path))).get_all_stargazers()
+
+    cache = PageCache(str(tmp_path), ttl=0)
+    with responses.RequestsMock() as mocked:
+        register_pages("", "", status=304, mock=mocked)
+        assert GitHub("foo/bar", cache=cache).get_all_stargazers() == ['bar', 'foo']
+        assert all(call.request.headers['If-None-Match'] == '"v1"' for call in mocked.calls)
+    assert cache.stats == CacheStats(hits=0, revalidations=2, misses=0)
+
+
+def test_changed_pages_are_downloaded_again(tmp_path: typing.Any,
+                                            url_page_content: str,
+                                            url_page_content_without_stargazers: str,
+                                            ok_status_code: int) -> None:
+    with responses.RequestsMock() as mocked:
+        register_pages(url_page_content_without_stargazers, status=ok_status_code,
+                       headers={'ETag': '"v1"'}, mock=mocked)
+        assert GitHub("foo/bar", cache=PageCache(str(tmp_path))).get_all_stargazers() == []
+
+    cache = PageCache(str(tmp_path), ttl=0)
+    with responses.RequestsMock() as mocked:
+        register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code,
+                       headers={'ETag': '"v2"'}, mock=mocked)
+        assert GitHub("foo/bar", cache=cache).get_all_stargazers() == ['bar', 'foo']
+    assert cache.stats == CacheStats(hits=0, revalidations=0, misses=2)
+
+
+def test_oldest_pages_are_evicted(tmp_path: typing.Any) -> None:
+    cache = PageCache(str(tmp_path), max_size=1000)
+    for page_number in range(10):
+        cache.put(f"https://github.com/foo/bar/stargazers?page={page_number}", "x" * 200, None, None)
+    assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(str(tmp_path))) <= 1000
+    assert cache.get("https://github.com/foo/bar/stargazers?page=9") is not None
+    assert cache.get("https://github.com/foo/bar/stargazers?page=0") is None
+
+
+@responses.activate
+def test_cache_dir_reports_hits_and_misses(tmp_path: typing.Any,
+                                           url_page_content: str,
+                                           url_page_content_without_stargazers: str,
+                                           ok_status_code: int) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    arguments: typing.List[str] = ['foo/bar', '--cache-dir', str(tmp_path)]
+    CliRunner().invoke(command_line, arguments)
+    result: Result = CliRunner().invoke(command_line, arguments)
+    assert result.exit_code == 0
+    assert 'Stargazers:\nbar\nfoo\n' in result.output
+    assert 'Cache: 2 hits, 0 revalidated, 0 misses.' in result.output
@@ -0,0 +1,118 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import os
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.checkpoint import CheckpointMismatchError, CrawlCheckpoint
+from github_stargazers.github import GitHub, TooManyRequestsHttpError
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.incremental import SnapshotFormatError
+from tests import StargazersPages, get_users
+
+URL: str = "https://github.com/foo/bar/stargazers?page="
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path: typing.Any) -> str:
+    return str(tmp_path / "foo_bar.checkpoint")
+
+
+def test_checkpoint_is_saved_in_batches(checkpoint_path: str) -> None:
+    checkpoint: CrawlCheckpoint = CrawlCheckpoint(checkpoint_path, URL, every=2)
+    checkpoint.record(["foo", "bar"])
+    with open(checkpoint_path) as checkpoint_file:
+        assert len(checkpoint_file.readlines()) == 1
+    checkpoint.record(["baz"])
+    checkpoint.record(["qux"])
+    checkpoint.flush()
+    assert checkpoint.stargazers == ["foo", "bar", "baz", "qux"]
+
+    resumed: CrawlCheckpoint = CrawlCheckpoint(checkpoint_path, URL, resume=True)
+    assert resumed.page_number == 3
+    assert resumed.previous_page == ["qux"]
+    assert resumed.stargazers == ["foo", "bar", "baz", "qux"]
+
+
+def test_line_cut_short_is_ignored(checkpoint_path: str) -> None:
+    checkpoint: CrawlCheckpoint = CrawlCheckpoint(checkpoint_path, URL, every=1)
+    checkpoint.record(["foo"])
+    checkpoint.record(["bar"])
+    with open(checkpoint_path, "r+") as checkpoint_file:
+        checkpoint_file.truncate(len(checkpoint_file.read()) - 5)
+
+    assert CrawlCheckpoint(checkpoint_path, URL, resume=True).stargazers == ["foo"]
+    assert CrawlCheckpoint(checkpoint_path, URL, resume=True).stargazers == ["foo"]
+
+
+def test_checkpoint_without_resume_starts_over(checkpoint_path: str) -> None:
+    checkpoint: CrawlCheckpoint = CrawlCheckpoint(checkpoint_path, URL, every=1)
+    checkpoint.record(["foo"])
+    CrawlCheckpoint(checkpoint_path, URL)
+    assert CrawlCheckpoint(checkpoint_path, URL, resume=True).page_number == 0
+
+
+def test_invalid_checkpoint_raises(checkpoint_path: str) -> None:
+    with open(checkpoint_path, "w") as checkpoint_file:
+        checkpoint_file.write("foo")
+    with pytest.raises(SnapshotFormatError):
+        CrawlCheckpoint(checkpoint_path, URL, resume=True)
+
+    CrawlCheckpoint(checkpoint_path, URL)
+    with pytest.raises(CheckpointMismatchError):
+        CrawlCheckpoint(checkpoint_path, "https://github.com/foo/baz/stargazers?page=", resume=True)
+
+
+@responses.activate
+def test_resume_after_too_many_requests(checkpoint_path: str) -> None:
+    pages = StargazersPages(get_users(9), throttled_page=4)
+    with pytest.raises(TooManyRequestsHttpError):
+        GitHub("foo/bar").get_all_stargazers(checkpoint_path)
+
+    pages.throttled_page = None
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_all_stargazers(checkpoint_path, resume=True) == get_users(9)
+    assert pages.requested_pages == [4, 5, 6]
+    assert not os.path.exists(checkpoint_path)
+
+
+@responses.activate
+def test_resume_after_the_last_page(checkpoint_path: str) -> None:
+    pages = StargazersPages(get_users(4), throttled_page=3)
+    with pytest.raises(TooManyRequestsHttpError):
+        GitHub("foo/bar", concurrency=2).get_all_stargazers(checkpoint_path)
+
+    pages.throttled_page = None
+    pages.requested_pages = []
+    assert GitHub("foo/bar", concurrency=2).get_all_stargazers(checkpoint_path, resume=True) == get_users(4)
+    assert 1 not in pages.requested_pages and 2 not in pages.requested_pages
+
+
+@responses.activate
+def test_resume_option(checkpoint_path: str) -> None:
+    pages = StargazersPages(get_users(5), throttled_page=2)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--checkpoint', checkpoint_path])
+    assert result.exit_code == 0
+    assert 'Too many requests' in result.output
+
+    pages.throttled_page = None
+    result = CliRunner().invoke(command_line, ['foo/bar', '--checkpoint', checkpoint_path, '--resume'])
+    assert result.exit_code == 0
+    assert result.output == 'Stargazers:\n' + ''.join(user + '\n' for user in get_users(5))
+
+
+def test_resume_option_needs_a_checkpoint() -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--resume'])
+    assert result.exit_code == 2
+    assert "--checkpoint" in result.output
+
+
+@pytest.mark.parametrize("options", [['--user', 'foo'], ['--stream'], ['--run-size', '10'],
+                                     ['--incremental', 'foo.json'], ['--export', 'foo.bin'], ['--profiles']])
+def test_checkpoint_option_needs_a_listing(checkpoint_path: str, options: typing.List[str]) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--checkpoint', checkpoint_path] + options)
+    assert result.exit_code == 2
+    assert "--checkpoint" in result.output
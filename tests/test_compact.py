@@ -0,0 +1,88 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import typing
+
+import pytest
+
+from github_stargazers.compact import CompactStargazers, UnsortedUsernamesError
+from github_stargazers.incremental import SnapshotFormatError
+
+
+@pytest.fixture
+def usernames() -> typing.List[str]:
+    return ["marius92mc", "foo", "bar", "Zorro", "foo", "ünicode"]
+
+
+def test_list_interface(usernames: typing.List[str]) -> None:
+    compact: CompactStargazers = CompactStargazers(usernames)
+    expected: typing.List[str] = sorted(set(usernames))
+    assert len(compact) == len(expected)
+    assert list(compact) == expected
+    assert compact == expected
+    assert [compact[index] for index in range(-len(expected), len(expected))] == expected + expected
+    assert compact[1:3] == expected[1:3]
+    assert compact.index("foo") == expected.index("foo")
+    with pytest.raises(IndexError):
+        _ = compact[len(expected)]
+    with pytest.raises(ValueError):
+        compact.index("baz")
+
+
+def test_set_interface(usernames: typing.List[str]) -> None:
+    compact: CompactStargazers = CompactStargazers(usernames)
+    for username in usernames:
+        assert username in compact
+    for username in ["", "baz", "fo", "fooo", "zzz", "Ünicode"]:
+        assert username not in compact
+    assert compact == set(usernames)
+    assert compact & {"foo", "baz"} == {"foo"}
+    assert compact - {"foo"} == set(usernames) - {"foo"}
+    assert (compact | {"baz"}) == sorted(set(usernames) | {"baz"})
+
+
+def test_empty() -> None:
+    compact: CompactStargazers = CompactStargazers()
+    assert not compact
+    assert "foo" not in compact
+    assert compact == []
+
+
+def test_from_sorted_skips_duplicates() -> None:
+    assert CompactStargazers.from_sorted(["a", "a", "b", "c", "c"]) == ["a", "b", "c"]
+
+
+def test_from_sorted_rejects_unsorted() -> None:
+    with pytest.raises(UnsortedUsernamesError):
+        CompactStargazers.from_sorted(["b", "a"])
+
+
+def test_compact_size() -> None:
+    usernames: typing.List[str] = [f"user{index:07d}" for index in range(1000)]
+    assert CompactStargazers.from_sorted(usernames).nbytes == 11 * 1000 + 4 * 1001
+
+
+@pytest.mark.parametrize("count", [0, 1, 1000])
+def test_save_and_load(tmp_path: typing.Any, count: int) -> None:
+    usernames: typing.List[str] = [f"user{index:07d}" for index in range(count)] + ["ünicode"]
+    path: str = str(tmp_path / "stargazers.bin")
+    CompactStargazers(usernames).save(path)
+    loaded: CompactStargazers = CompactStargazers.load(path)
+    assert loaded == usernames
+    assert all(username in loaded for username in usernames)
+    assert "foo" not in loaded
+    assert loaded.nbytes == CompactStargazers(usernames).nbytes
+
+
+@pytest.mark.parametrize("content", [b"", b"GHSTARS", b'{"version": 1}' + bytes(32)])
+def test_load_rejects_other_files(tmp_path: typing.Any, content: bytes) -> None:
+    path = tmp_path / "stargazers.bin"
+    path.write_bytes(content)
+    with pytest.raises(SnapshotFormatError):
+        CompactStargazers.load(str(path))
+
+
+def test_load_rejects_truncated_snapshot(tmp_path: typing.Any) -> None:
+    path = tmp_path / "stargazers.bin"
+    CompactStargazers(["foo", "bar"]).save(str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(SnapshotFormatError):
+        CompactStargazers.load(str(path))
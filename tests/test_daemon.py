@@ -0,0 +1,149 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import concurrent.futures
+import threading
+import typing
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubGitHubServer, get_username
+from github_stargazers.compact import CompactStargazers
+from github_stargazers.daemon import StargazersDaemon, create_server
+from github_stargazers.github import GitHub, UrlNotFoundError
+
+
+class FakeGitHubFactory:
+
+    def __init__(self, stargazers: typing.Dict[str, typing.List[str]],
+                 crawling: typing.Optional[threading.Event] = None) -> None:
+        self.stargazers: typing.Dict[str, typing.List[str]] = stargazers
+        self.crawls: typing.List[str] = []
+        self.crawling: typing.Optional[threading.Event] = crawling
+
+    def __call__(self, repository: str) -> GitHub:
+        factory: FakeGitHubFactory = self
+
+        class FakeGitHub:  # pylint: disable=too-few-public-methods
+            @staticmethod
+            def get_compact_stargazers() -> CompactStargazers:
+                factory.crawls.append(repository)
+                if factory.crawling:
+                    factory.crawling.wait()
+                if repository not in factory.stargazers:
+                    raise UrlNotFoundError(repository)
+                return CompactStargazers(factory.stargazers[repository])
+
+        return typing.cast(GitHub, FakeGitHub())
+
+
+def test_daemon_keeps_the_most_recently_used_repositories() -> None:
+    factory: FakeGitHubFactory = FakeGitHubFactory({"foo/a": ["x"], "foo/b": ["y"], "foo/c": ["z"]})
+    daemon: StargazersDaemon = StargazersDaemon(factory, max_repositories=2)
+
+    assert daemon.is_stargazer("foo/a", "x")
+    assert not daemon.is_stargazer("foo/b", "x")
+    assert daemon.get_stargazers("foo/a") == ["x"]
+    assert daemon.get_stargazers("foo/c") == ["z"]
+    assert daemon.repositories == ["foo/a", "foo/c"]
+    assert daemon.get_stargazers("foo/b") == ["y"]
+    assert factory.crawls == ["foo/a", "foo/b", "foo/c", "foo/b"]
+
+
+def test_daemon_shares_a_crawl_between_concurrent_requests() -> None:
+    crawling: threading.Event = threading.Event()
+    factory: FakeGitHubFactory = FakeGitHubFactory({"foo/bar": ["x", "y"]}, crawling)
+    daemon: StargazersDaemon = StargazersDaemon(factory)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        checks = [executor.submit(daemon.is_stargazer, "foo/bar", "y") for _ in range(8)]
+        crawling.set()
+        assert all(check.result() for check in checks)
+    assert factory.crawls == ["foo/bar"]
+
+
+def test_daemon_shares_a_failed_crawl_without_keeping_the_failure() -> None:
+    factory: FakeGitHubFactory = FakeGitHubFactory({})
+    daemon: StargazersDaemon = StargazersDaemon(factory)
+
+    for _ in range(2):
+        with pytest.raises(UrlNotFoundError):
+            daemon.get_stargazers("foo/bar")
+    assert factory.crawls == ["foo/bar", "foo/bar"]
+    assert daemon.preload(["foo/bar"])[0].error == "UrlNotFoundError"
+
+
+def test_daemon_refreshes_the_stale_repositories() -> None:
+    now: typing.List[float] = [1000.0]
+    factory: FakeGitHubFactory = FakeGitHubFactory({"foo/a": ["x"], "foo/b": ["y"]})
+    daemon: StargazersDaemon = StargazersDaemon(factory, refresh_interval=60.0, clock=lambda: now[0])
+    assert daemon.preload(["foo/a"]) == []
+    now[0] += 30.0
+    daemon.get_stargazers("foo/b")
+
+    now[0] += 30.0
+    factory.stargazers["foo/a"] = ["x", "w"]
+    daemon.refresh()
+    assert factory.crawls == ["foo/a", "foo/b", "foo/a"]
+    assert daemon.get_stargazers("foo/a") == ["w", "x"]
+
+    now[0] += 30.0
+    del factory.stargazers["foo/b"]
+    daemon.refresh()
+    assert daemon.get_stargazers("foo/b") == ["y"]
+    daemon.refresh()
+    assert factory.crawls == ["foo/a", "foo/b", "foo/a", "foo/b"]
+
+
+def test_daemon_refreshes_in_the_background() -> None:
+    factory: FakeGitHubFactory = FakeGitHubFactory({"foo/bar": ["x"]})
+    daemon: StargazersDaemon = StargazersDaemon(factory, refresh_interval=0.01)
+    daemon.preload(["foo/bar"])
+    daemon.start()
+    try:
+        for _ in range(500):
+            if len(factory.crawls) > 2:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        daemon.stop()
+    assert len(factory.crawls) > 2
+
+
+def test_daemon_http_api() -> None:
+    with StubGitHubServer(stars=100) as stub_server:
+        daemon: StargazersDaemon = StargazersDaemon(
+            lambda repository: GitHub(repository, github_url=stub_server.url))
+        server = create_server(daemon, port=0)
+        thread: threading.Thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url: str = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            response: requests.Response = requests.get(url + "/repos/foo/bar/stargazers", timeout=10)
+            assert response.status_code == 200
+            assert response.json() == [get_username(index) for index in range(100)]
+
+            response = requests.get(url + "/repos/foo/bar/is_stargazer", params={"user": get_username(42)}, timeout=10)
+            assert response.json() == {"repository": "foo/bar", "user": get_username(42), "is_stargazer": True}
+            response = requests.get(url + "/repos/foo/bar/is_stargazer", params={"user": "nobody"}, timeout=10)
+            assert response.json()["is_stargazer"] is False
+
+            assert requests.get(url + "/repos/foo/bar/is_stargazer", timeout=10).status_code == 400
+            assert requests.get(url + "/foo/bar", timeout=10).status_code == 404
+            assert daemon.repositories == ["foo/bar"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_daemon_http_api_errors() -> None:
+    server = create_server(StargazersDaemon(FakeGitHubFactory({})), port=0)
+    thread: threading.Thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response: requests.Response = requests.get(f"http://127.0.0.1:{server.server_address[1]}"
+                                                   "/repos/foo/bar/stargazers", timeout=10)
+        assert response.status_code == 404
+        assert response.json()["error"] == "UrlNotFoundError"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,13 +1,16 @@
 # pylint: disable=no-member,invalid-name,redefined-outer-name
+import concurrent.futures
 import typing
 
 import pytest
+import requests
 import responses
 
 from github_stargazers.github import GitHub
+from github_stargazers.github import ConcurrencyError, create_parse_pool, create_session
 from github_stargazers.github import UsernameRepositoryError, TooManyRequestsHttpError, UrlNotFoundError
 from github_stargazers.github import MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError
-from tests import get_examples_invalid_user_repo, get_wrong_href_content, get_page_content_with_href
+from tests import get_examples_invalid_user_repo, get_wrong_href_content, get_page_content_with_href, register_pages
 
 
 def test_wrong_argument_raises() -> None:
@@ -233,3 +236,181 @@ def test_wrong_href_content_raises(wrong_href_content: str,
     )
     with pytest.raises(HrefContentError):
         GitHub("foo/bar").is_stargazer("foo")
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_wrong_concurrency_raises(concurrency: int) -> None:
+    with pytest.raises(ConcurrencyError):
+        GitHub("foo/bar", concurrency=concurrency)
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+@responses.activate
+def test_get_all_stargazers_concurrently_sorts_stargazers(url_page_content_1: str,
+                                                          url_page_content_2: str,
+                                                          url_page_content_without_stargazers: str,
+                                                          concurrency: int,
+                                                          ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers, status=ok_status_code)
+    assert GitHub("foo/bar", concurrency=concurrency).get_all_stargazers() == sorted(['foo', 'bar', 'foo2', 'bar2'])
+
+
+@responses.activate
+def test_get_all_stargazers_concurrently_stops_on_repeated_page(url_page_content_1: str,
+                                                                url_page_content_2: str,
+                                                                ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_2, status=ok_status_code)
+    assert GitHub("foo/bar", concurrency=3).get_all_stargazers() == sorted(['foo', 'bar', 'foo2', 'bar2'])
+
+
+@responses.activate
+def test_get_all_stargazers_concurrently_on_too_many_requests_raises(url_page_content_1: str,
+                                                                     too_many_requests_status_code: int) -> None:
+    responses.add(
+        responses.GET,
+        "https://github.com/foo/bar/stargazers?page=1",
+        body=url_page_content_1,
+        status=too_many_requests_status_code
+    )
+    with pytest.raises(TooManyRequestsHttpError):
+        GitHub("foo/bar", concurrency=2).get_all_stargazers()
+
+
+@responses.activate
+def test_provided_user_is_stargazer_concurrently(url_page_content_1: str,
+                                                 url_page_content_2: str,
+                                                 ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, status=ok_status_code)
+    assert GitHub("foo/bar", concurrency=2).is_stargazer("bar2")
+
+
+def test_create_session_asks_for_compressed_responses() -> None:
+    session = create_session(pool_size=4)
+    assert 'gzip' in session.headers['Accept-Encoding']
+    adapter = typing.cast(requests.adapters.HTTPAdapter, session.get_adapter("https://github.com"))
+    assert adapter._pool_maxsize == 4  # pylint: disable=protected-access
+
+
+@responses.activate
+def test_injected_session_is_shared_across_calls(url_page_content_1: str,
+                                                 url_page_content_without_stargazers: str,
+                                                 ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_without_stargazers, status=ok_status_code)
+    session = create_session()
+    session.headers['X-Session'] = 'shared'
+    github = GitHub("foo/bar", session=session)
+    assert github.get_all_stargazers() == sorted(['foo', 'bar'])
+    assert github.is_stargazer("foo")
+    assert GitHub("foo/bar", session=session).is_stargazer("bar")
+    assert len(responses.calls) == 3
+    assert all(call.request.headers['X-Session'] == 'shared' for call in responses.calls)
+
+
+@responses.activate
+def test_are_stargazers_crawls_once(url_page_content_1: str,
+                                    url_page_content_2: str,
+                                    url_page_content_without_stargazers: str,
+                                    ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers, status=ok_status_code)
+    github = GitHub("foo/bar")
+    assert github.are_stargazers(["bar2", "another_foo", "foo"]) == {"bar2": True, "another_foo": False, "foo": True}
+    assert len(responses.calls) == 3
+    assert github.is_stargazer("foo2")
+    assert not github.is_stargazer("another_foo")
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_are_stargazers_stops_once_all_users_are_found(url_page_content_1: str,
+                                                       url_page_content_2: str,
+                                                       ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, status=ok_status_code)
+    assert GitHub("foo/bar").are_stargazers(["bar", "foo"]) == {"bar": True, "foo": True}
+    assert len(responses.calls) == 1
+
+
+def test_are_stargazers_without_users_makes_no_request() -> None:
+    with responses.RequestsMock():
+        assert GitHub("foo/bar").are_stargazers([]) == {}
+
+
+@responses.activate
+def test_is_stargazer_reuses_loaded_stargazers(url_page_content_1: str,
+                                               url_page_content_without_stargazers: str,
+                                               ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_without_stargazers, status=ok_status_code)
+    github = GitHub("foo/bar")
+    github.get_all_stargazers()
+    assert github.is_stargazer("bar")
+    assert not github.is_stargazer("another_foo")
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_iter_stargazers_yields_in_page_order(url_page_content_1: str,
+                                              url_page_content_2: str,
+                                              url_page_content_without_stargazers: str,
+                                              ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers, status=ok_status_code)
+    stargazers: typing.Iterator[str] = GitHub("foo/bar").iter_stargazers()
+    assert next(stargazers) == 'foo'
+    assert len(responses.calls) == 1
+    assert list(stargazers) == ['bar', 'foo2', 'bar2']
+
+
+@pytest.mark.parametrize("run_size", [1, 3, 10])
+@responses.activate
+def test_iter_sorted_stargazers_sorts_stargazers(url_page_content_1: str,
+                                                 url_page_content_2: str,
+                                                 url_page_content_without_stargazers: str,
+                                                 run_size: int,
+                                                 ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers, status=ok_status_code)
+    assert list(GitHub("foo/bar").iter_sorted_stargazers(run_size)) == sorted(['foo', 'bar', 'foo2', 'bar2'])
+
+
+@responses.activate
+def test_get_compact_stargazers_answers_is_stargazer(url_page_content_1: str,
+                                                     url_page_content_2: str,
+                                                     url_page_content_without_stargazers: str,
+                                                     ok_status_code: int) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers, status=ok_status_code)
+    github = GitHub("foo/bar")
+    assert github.get_compact_stargazers(run_size=2) == sorted(['foo', 'bar', 'foo2', 'bar2'])
+    assert github.are_stargazers(["bar2", "another_foo"]) == {"bar2": True, "another_foo": False}
+    assert len(responses.calls) == 3
+
+
+@pytest.fixture(scope="module")
+def parse_pool() -> typing.Iterator[concurrent.futures.Executor]:
+    with create_parse_pool(2) as pool:
+        yield pool
+
+
+@responses.activate
+def test_get_all_stargazers_parsed_in_processes(url_page_content_1: str,
+                                                url_page_content_2: str,
+                                                url_page_content_without_stargazers: str,
+                                                ok_status_code: int,
+                                                parse_pool: concurrent.futures.Executor) -> None:
+    register_pages(url_page_content_1, url_page_content_2, url_page_content_without_stargazers,
+                   url_page_content_without_stargazers, status=ok_status_code)
+    github = GitHub("foo/bar", concurrency=2, parse_pool=parse_pool)
+    assert github.get_all_stargazers() == sorted(['foo', 'bar', 'foo2', 'bar2'])
+    assert list(github.iter_stargazers()) == ['foo', 'bar', 'foo2', 'bar2']
+
+
+@pytest.mark.parametrize("body, exception", [
+    ('<h3> John Williams </h3>', MissingHyperlinkTagError),
+    ('<h3> <a> John Williams </a> </h3>', MissingHrefAttributeError),
+    ('<h3> <a href="foo"> John Williams </a> </h3>', HrefContentError),
+])
+@responses.activate
+def test_parse_errors_raised_in_processes(body: str, exception: typing.Type[Exception], ok_status_code: int,
+                                          parse_pool: concurrent.futures.Executor) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=body, status=ok_status_code)
+    with pytest.raises(exception) as raised:
+        GitHub("foo/bar", parse_pool=parse_pool).get_all_stargazers()
+    with pytest.raises(exception) as expected:
+        GitHub("foo/bar").get_all_stargazers()
+    assert str(raised.value) == str(expected.value)
@@ -1,4 +1,6 @@
 # pylint: disable=no-member,invalid-name,redefined-outer-name
+import subprocess
+import sys
 import typing
 
 from click.testing import CliRunner
@@ -6,8 +8,9 @@ from click.testing import Result
 import pytest
 import responses
 
-from github_stargazers.github_stargazers import command_line
-from tests import get_examples_invalid_user_repo, get_wrong_href_content, get_page_content_with_href
+from github_stargazers.batch import OUTPUT_WRITERS
+from github_stargazers.github_stargazers import _OUTPUT_FORMATS, command_line
+from tests import get_examples_invalid_user_repo, get_wrong_href_content, get_page_content_with_href, register_pages
 
 
 @pytest.fixture
@@ -23,12 +26,12 @@ def url_page_content_without_stargazers() -> str:
 
 @pytest.fixture
 def halo_succeed() -> str:
-    return "\r\x1b[K\x1b[32m✔\x1b[39m "
+    return ""  # the output of CliRunner is not a terminal, so the results are printed without a spinner
 
 
 @pytest.fixture
 def halo_fail() -> str:
-    return "\r\x1b[K\x1b[31m✖\x1b[39m "
+    return ""
 
 
 @pytest.fixture
@@ -72,6 +75,81 @@ def test_user_and_repository_shows_sorted_stargazers(url_page_content: str,
     verify_invoke_from_clirunner(result, 'Stargazers:\nbar\nfoo\n')
 
 
+@responses.activate
+def test_user_and_repository_shows_sorted_stargazers_concurrently(url_page_content: str,
+                                                                  url_page_content_without_stargazers: str,
+                                                                  ok_status_code: int) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--concurrency', '3'])
+    verify_invoke_from_clirunner(result, 'Stargazers:\nbar\nfoo\n')
+
+
+@pytest.mark.parametrize("option, expected_output", [
+    (['--stream'], 'Stargazers:\nfoo\nbar\n'),
+    (['--run-size', '1'], 'Stargazers:\nbar\nfoo\n'),
+    (['--parse-processes', '2', '--concurrency', '2'], 'Stargazers:\nbar\nfoo\n'),
+])
+@responses.activate
+def test_user_and_repository_streams_stargazers(url_page_content: str,
+                                                url_page_content_without_stargazers: str,
+                                                option: typing.List[str],
+                                                expected_output: str,
+                                                ok_status_code: int) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['foo/bar'] + option)
+    verify_invoke_from_clirunner(result, expected_output)
+
+
+@pytest.mark.parametrize("options", [['--user', 'foo', '--stream'], ['--user', 'foo', '--run-size', '10'],
+                                     ['--stream', '--run-size', '10']])
+def test_listing_options_are_exclusive(options: typing.List[str]) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar'] + options)
+    assert result.exit_code == 2
+    assert "cannot be used with" in result.output
+
+
+@responses.activate
+def test_export_and_from_snapshot(url_page_content: str,
+                                  url_page_content_without_stargazers: str,
+                                  ok_status_code: int,
+                                  tmp_path: typing.Any) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    snapshot_path: str = str(tmp_path / "stargazers.bin")
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--export', snapshot_path])
+    verify_invoke_from_clirunner(result, 'Stargazers:\nbar\nfoo\n')
+    assert len(responses.calls) == 2
+
+    result = CliRunner().invoke(command_line, ['--from-snapshot', snapshot_path])
+    verify_invoke_from_clirunner(result, 'Stargazers:\nbar\nfoo\n')
+    result = CliRunner().invoke(command_line, ['--from-snapshot', snapshot_path, '--user', 'foo'])
+    assert result.exit_code == 0
+    assert len(responses.calls) == 2
+
+
+@pytest.mark.parametrize("arguments", [['foo/bar', 'baz/qux'], ['foo/bar', '--format', 'jsonl'],
+                                       ['foo/bar', '--stream'], ['foo/bar', '--incremental', 'foo.json']])
+def test_export_needs_a_single_repository_as_text(arguments: typing.List[str], tmp_path: typing.Any) -> None:
+    result: Result = CliRunner().invoke(command_line, arguments + ['--export', str(tmp_path / "stargazers.bin")])
+    assert result.exit_code == 2
+    assert "--export" in result.output
+
+
+@pytest.mark.parametrize("arguments", [['foo/bar'], ['--format', 'jsonl'], ['--repositories-file', '-']])
+def test_from_snapshot_lists_a_single_snapshot_as_text(arguments: typing.List[str], tmp_path: typing.Any) -> None:
+    result: Result = CliRunner().invoke(command_line, arguments + ['--from-snapshot', str(tmp_path / "foo.bin")],
+                                        input="foo/bar\n")
+    assert result.exit_code == 2
+    assert "--from-snapshot" in result.output
+
+
+def test_from_snapshot_of_another_file(tmp_path: typing.Any) -> None:
+    snapshot_path = tmp_path / "stargazers.bin"
+    snapshot_path.write_text("foo")
+    result: Result = CliRunner().invoke(command_line, ['--from-snapshot', str(snapshot_path)])
+    assert result.exit_code == 0
+    assert "Stargazers:" not in result.output
+
+
 @responses.activate
 def test_get_all_stargazers_shows_message_on_page_without_stargazers(url_page_content_without_stargazers: str,
                                                                      ok_status_code: int) -> None:
@@ -86,7 +164,7 @@ def test_get_all_stargazers_shows_message_on_page_without_stargazers(url_page_co
 
 
 def http_not_found(repository: str) -> str:
-    return halo_fail() + "Resource not Found. Check that the repository " + repository + " is correct.\n"
+    return "Resource not Found. Check that the repository " + repository + " is correct.\n"
 
 
 @pytest.mark.parametrize("invalid_user_and_repo", get_examples_invalid_user_repo())
@@ -234,3 +312,12 @@ def test_wrong_href_content(wrong_href_content: str,
     )
     result: Result = CliRunner().invoke(command_line, ['foo/bar', '--user', 'foo'])
     verify_invoke_from_clirunner(result, wrong_href(halo_fail, wrong_href_content))
+
+
+def test_command_line_imports_the_heavy_modules_when_needed() -> None:
+    heavy_modules: typing.List[str] = ["requests", "bs4", "halo", "http.server", "github_stargazers.batch"]
+    process = subprocess.run([sys.executable, "-c", "import sys, github_stargazers.github_stargazers; "
+                              f"print([module for module in {heavy_modules!r} if module in sys.modules])"],
+                             stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    assert process.stdout == "[]\n"
+    assert _OUTPUT_FORMATS == sorted(OUTPUT_WRITERS)
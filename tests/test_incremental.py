@@ -0,0 +1,201 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import json
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.github import GitHub
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.incremental import PagesSnapshot, SnapshotFormatError, SnapshotMismatchError
+from github_stargazers.incremental import StargazersDelta, diff_sorted_stargazers
+from tests import StargazersPages, get_users
+
+
+def load_snapshot(path: str) -> PagesSnapshot:
+    snapshot: typing.Optional[PagesSnapshot] = PagesSnapshot.load(path)
+    assert snapshot is not None
+    return snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: typing.Any) -> str:
+    return str(tmp_path / "foo_bar.json")
+
+
+@responses.activate
+def test_first_incremental_crawl_is_a_full_crawl(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(5))
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == sorted(get_users(5))
+    assert pages.requested_pages == [1, 2, 3, 4]
+    assert load_snapshot(snapshot_path).pages == [["user04", "user03"], ["user02", "user01"], ["user00"]]
+
+
+@responses.activate
+def test_unchanged_stargazers_only_fetch_the_first_and_last_pages(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(9))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == sorted(get_users(9))
+    assert pages.requested_pages == [1, 5, 6]
+
+
+@responses.activate
+def test_new_stars_only_fetch_the_first_pages(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(9))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.users = get_users(12)
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == sorted(get_users(12))
+    assert pages.requested_pages == [1, 2, 3, 6, 7]
+    assert load_snapshot(snapshot_path).pages == [get_users(12)[::-1][start:start + 2] for start in range(0, 12, 2)]
+
+
+@responses.activate
+def test_removed_star_fetches_up_to_the_page_of_the_removed_star(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(16))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.users = [user for user in get_users(17) if user != "user09"]
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == sorted(pages.users)
+    assert pages.requested_pages == [1, 2, 9, 3, 4, 5, 8, 9]
+    assert load_snapshot(snapshot_path).pages == [pages.users[::-1][start:start + 2] for start in range(0, 16, 2)]
+
+
+@responses.activate
+def test_all_stars_removed(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(4))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.users = []
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == []
+    assert load_snapshot(snapshot_path).pages == []
+
+
+@responses.activate
+def test_new_star_and_removed_star_on_the_last_page(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(16))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.users = [user for user in get_users(16) if user != "user00"] + ["newest"]  # the pages are unchanged
+    assert GitHub("foo/bar").get_stargazers_incrementally(snapshot_path) == GitHub("foo/bar").get_all_stargazers()
+    assert load_snapshot(snapshot_path).stargazers == sorted(pages.users)
+
+
+@responses.activate
+def test_api_new_stars_only_fetch_the_last_pages(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(350), api=True)
+    GitHub("foo/bar", engine="api").get_stargazers_incrementally(snapshot_path)
+    pages.users = get_users(420)
+    pages.requested_pages = []
+    assert GitHub("foo/bar", engine="api").get_stargazers_incrementally(snapshot_path) == sorted(get_users(420))
+    assert pages.requested_pages == [1, 3, 4, 5]
+
+
+@responses.activate
+def test_api_removed_star_fetches_from_the_first_changed_page(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(450), api=True)
+    GitHub("foo/bar", engine="api").get_stargazers_incrementally(snapshot_path)
+    pages.users = [user for user in get_users(450) if user != "user250"]
+    pages.requested_pages = []
+    assert GitHub("foo/bar", engine="api").get_stargazers_incrementally(snapshot_path) == sorted(pages.users)
+    assert pages.requested_pages == [1, 4, 3, 2, 3, 4, 5]
+
+
+def test_snapshot_of_another_repository_raises(snapshot_path: str) -> None:
+    PagesSnapshot([["foo"]], url="https://github.com/foo/baz/stargazers?page=").save(snapshot_path)
+    with pytest.raises(SnapshotMismatchError):
+        GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+
+
+def test_invalid_snapshot_raises(snapshot_path: str) -> None:
+    with open(snapshot_path, "w", encoding="utf-8") as snapshot_file:
+        snapshot_file.write("foo")
+    with pytest.raises(SnapshotFormatError):
+        GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+
+
+@responses.activate
+def test_incremental_option(snapshot_path: str) -> None:
+    StargazersPages(get_users(3))
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--incremental', snapshot_path])
+    assert result.exit_code == 0
+    assert result.output == 'Stargazers:\nuser00\nuser01\nuser02\n'
+
+
+@pytest.mark.parametrize("option", [['--user', 'foo'], ['--export', 'foo_bar.txt']])
+def test_incremental_option_needs_a_plain_listing(snapshot_path: str, option: typing.List[str]) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--incremental', snapshot_path] + option)
+    assert result.exit_code == 2
+    assert "cannot be used with" in result.output
+
+
+@pytest.mark.parametrize("previous, current, added, removed", [
+    ([], [], [], []),
+    ([], ["bar", "foo"], ["bar", "foo"], []),
+    (["bar", "foo"], [], [], ["bar", "foo"]),
+    (["bar", "baz", "foo"], ["baz", "foo", "qux"], ["qux"], ["bar"]),
+    (["a", "c", "e"], ["b", "c", "d", "f", "g"], ["b", "d", "f", "g"], ["a", "e"]),
+])
+def test_diff_sorted_stargazers(previous: typing.List[str], current: typing.List[str],
+                                added: typing.List[str], removed: typing.List[str]) -> None:
+    assert diff_sorted_stargazers(previous, current) == StargazersDelta(added, removed)
+
+
+@responses.activate
+def test_first_delta_adds_every_stargazer(snapshot_path: str) -> None:
+    StargazersPages(get_users(3))
+    assert GitHub("foo/bar").get_stargazers_delta(snapshot_path) == StargazersDelta(get_users(3), [])
+    assert GitHub("foo/bar").get_stargazers_delta(snapshot_path) == StargazersDelta([], [])
+
+
+@responses.activate
+def test_delta_skips_the_unchanged_pages(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(16))
+    GitHub("foo/bar").get_stargazers_incrementally(snapshot_path)
+    pages.users = [user for user in get_users(19) if user != "user11"]
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_stargazers_delta(snapshot_path) == \
+        StargazersDelta(["user16", "user17", "user18"], ["user11"])
+    assert pages.requested_pages == [1, 2, 3, 10, 4, 5, 9, 10]
+    assert load_snapshot(snapshot_path).stargazers == pages.users
+
+
+@responses.activate
+def test_delta_stops_once_the_stargazers_are_found_again(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(16))
+    GitHub("foo/bar").get_stargazers_delta(snapshot_path)
+    pages.users = [user for user in get_users(16) if user != "user09"] + ["newest"]
+    pages.requested_pages = []
+    assert GitHub("foo/bar").get_stargazers_delta(snapshot_path) == StargazersDelta(["newest"], ["user09"])
+    assert pages.requested_pages == [1, 2, 9, 3, 4, 5, 8, 9]
+    assert GitHub("foo/bar").get_stargazers_delta(snapshot_path) == StargazersDelta([], [])
+
+
+@responses.activate
+def test_api_delta_skips_the_unchanged_pages(snapshot_path: str) -> None:
+    pages = StargazersPages(get_users(350), api=True)
+    GitHub("foo/bar", engine="api").get_stargazers_delta(snapshot_path)
+    pages.users = [user for user in get_users(420) if user != "user320"]
+    pages.requested_pages = []
+    assert GitHub("foo/bar", engine="api").get_stargazers_delta(snapshot_path) == \
+        StargazersDelta(get_users(420)[350:], ["user320"])
+    assert pages.requested_pages == [1, 3, 4, 5]
+
+
+@responses.activate
+def test_delta_command(tmp_path: typing.Any) -> None:
+    pages = StargazersPages(get_users(4))
+    arguments: typing.List[str] = ['delta', 'foo/bar', 'foo', '--snapshot-dir', str(tmp_path)]
+    CliRunner().invoke(command_line, arguments)
+    pages.users = get_users(6)[1:]
+    result: Result = CliRunner().invoke(command_line, arguments)
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"repository": "foo/bar", "change": "added", "user": "user04"},
+        {"repository": "foo/bar", "change": "added", "user": "user05"},
+        {"repository": "foo/bar", "change": "removed", "user": "user00"},
+        {"repository": "foo", "error": "UsernameRepositoryError",
+         "message": "Argument should be of form username/repository."},
+    ]
+    assert load_snapshot(str(tmp_path / "foo" / "bar.json")).stargazers == get_users(6)[1:]
@@ -0,0 +1,91 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.cache import PageCache
+from github_stargazers.github import GitHub
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.instrumentation import PageMetrics, Profiler
+from github_stargazers.scheduler import RequestScheduler
+from tests import register_pages
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+@pytest.fixture
+def url_page_content_without_stargazers() -> str:
+    return "<html> <h1> title </h1> </html>"
+
+
+@responses.activate
+def test_on_page_is_called_for_every_page(url_page_content: str,
+                                          url_page_content_without_stargazers: str,
+                                          ok_status_code: int) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    profiler: Profiler = Profiler()
+    GitHub("foo/bar", on_page=profiler.record).get_all_stargazers()
+    pages: typing.List[PageMetrics] = profiler.pages
+    assert [(page.url, page.status_code, page.from_cache, page.stargazers, page.retries) for page in pages] == [
+        ("https://github.com/foo/bar/stargazers?page=1", ok_status_code, False, 2, 0),
+        ("https://github.com/foo/bar/stargazers?page=2", ok_status_code, False, 0, 0),
+    ]
+    assert profiler.pages[0].size == len(url_page_content)
+    assert all(page.first_byte >= 0 and page.download >= 0 and page.parse > 0 for page in profiler.pages)
+
+
+@responses.activate
+def test_on_page_counts_retries_and_cache_hits(url_page_content: str,
+                                               url_page_content_without_stargazers: str,
+                                               ok_status_code: int,
+                                               too_many_requests_status_code: int,
+                                               tmp_path: typing.Any) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1",
+                  status=too_many_requests_status_code, headers={'Retry-After': '0'})
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    profiler: Profiler = Profiler()
+    scheduler: RequestScheduler = RequestScheduler(base_delay=0.0, sleep=lambda seconds: None)
+    GitHub("foo/bar", scheduler=scheduler, cache=PageCache(str(tmp_path)), on_page=profiler.record) \
+        .get_all_stargazers()
+    assert [page.retries for page in profiler.pages] == [1, 0]
+
+    GitHub("foo/bar", cache=PageCache(str(tmp_path)), on_page=profiler.record).get_all_stargazers()
+    assert [(page.status_code, page.from_cache) for page in profiler.pages[2:]] == [(None, True), (None, True)]
+
+
+def test_profiler_summary_and_openmetrics() -> None:
+    profiler: Profiler = Profiler()
+    for index in range(1, 11):
+        profiler.record(PageMetrics("https://github.com/foo/bar/stargazers?page=" + str(index), 200, False,
+                                    first_byte=index / 1000, parse=0.002, size=100, retries=index % 2, stargazers=48))
+    summary: str = profiler.summary()
+    assert summary.splitlines()[0] == "10 pages, 0 from cache, 5 retries, 1000 bytes, 480 stargazers."
+    assert summary.splitlines()[3].split() == ["first_byte", "5.0", "9.0", "10.0", "10.0", "55.0"]
+
+    metrics: typing.List[str] = profiler.to_openmetrics().splitlines()
+    assert "github_stargazers_pages_total 10" in metrics
+    assert "github_stargazers_retries_total 5" in metrics
+    assert 'github_stargazers_page_seconds{phase="first_byte",quantile="0.9"} 0.009' in metrics
+    assert 'github_stargazers_page_seconds_count{phase="parse"} 10' in metrics
+    assert metrics[-1] == "# EOF"
+
+
+@responses.activate
+def test_profile_option(url_page_content: str,
+                        url_page_content_without_stargazers: str,
+                        ok_status_code: int,
+                        tmp_path: typing.Any) -> None:
+    register_pages(url_page_content, url_page_content_without_stargazers, status=ok_status_code)
+    metrics_path = tmp_path / "metrics.txt"
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--profile', '--metrics-file', str(metrics_path)])
+    assert result.exit_code == 0
+    assert result.stdout == "Stargazers:\nbar\nfoo\n"
+    assert result.stderr.startswith("2 pages, 0 from cache, 0 retries")
+    assert "github_stargazers_pages_total 2\n" in metrics_path.read_text()
@@ -0,0 +1,97 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.overlap import RepositoriesOverlap, UnknownRepositoryError
+from tests import register_pages
+
+
+@pytest.fixture
+def repositories_stargazers() -> typing.Dict[str, typing.List[str]]:
+    return {
+        "foo/bar": ["alice", "bob", "carol"],
+        "foo/baz": ["bob", "carol", "dave"],
+        "foo/qux": ["carol", "erin"],
+    }
+
+
+@pytest.fixture
+def repositories_overlap(repositories_stargazers: typing.Dict[str, typing.List[str]]) -> RepositoriesOverlap:
+    overlap: RepositoriesOverlap = RepositoriesOverlap()
+    for repository, stargazers in repositories_stargazers.items():
+        overlap.add(repository, stargazers)
+    return overlap
+
+
+def test_intersection(repositories_overlap: RepositoriesOverlap) -> None:
+    assert repositories_overlap.intersection() == ["carol"]
+    assert repositories_overlap.intersection(["foo/bar", "foo/baz"]) == ["bob", "carol"]
+
+
+def test_union(repositories_overlap: RepositoriesOverlap) -> None:
+    assert repositories_overlap.union() == ["alice", "bob", "carol", "dave", "erin"]
+    assert repositories_overlap.union(["foo/qux"]) == ["carol", "erin"]
+
+
+def test_difference(repositories_overlap: RepositoriesOverlap) -> None:
+    assert repositories_overlap.difference("foo/bar") == ["alice"]
+    assert repositories_overlap.difference("foo/baz", ["foo/qux"]) == ["bob", "dave"]
+
+
+def test_ranking(repositories_overlap: RepositoriesOverlap) -> None:
+    assert repositories_overlap.ranking() == [("carol", 3), ("bob", 2), ("alice", 1), ("dave", 1), ("erin", 1)]
+    assert repositories_overlap.ranking(top=2) == [("carol", 3), ("bob", 2)]
+
+
+def test_empty_repository_and_unknown_repository(repositories_overlap: RepositoriesOverlap) -> None:
+    repositories_overlap.add("foo/empty", [])
+    assert repositories_overlap.intersection() == []
+    assert repositories_overlap.difference("foo/empty") == []
+    with pytest.raises(UnknownRepositoryError):
+        repositories_overlap.union(["foo/unknown"])
+
+
+def add_repositories(repositories_stargazers: typing.Dict[str, typing.List[str]], ok_status_code: int) -> None:
+    for repository, stargazers in repositories_stargazers.items():
+        page: str = " ".join(f'<h3> <a href="/{stargazer}"> {stargazer} </a> </h3>' for stargazer in stargazers)
+        register_pages(page, "<html></html>", status=ok_status_code, repository=repository)
+
+
+@pytest.mark.parametrize("options, expected_output", [
+    ([], "Stargazers:\ncarol\n"),
+    (['--operation', 'union'], "Stargazers:\nalice\nbob\ncarol\ndave\nerin\n"),
+    (['--operation', 'difference'], "Stargazers:\nalice\n"),
+    (['--operation', 'ranking', '--top', '2'], "carol 3\nbob 2\n"),
+])
+@responses.activate
+def test_overlap_command(repositories_stargazers: typing.Dict[str, typing.List[str]],
+                         options: typing.List[str],
+                         expected_output: str,
+                         ok_status_code: int) -> None:
+    add_repositories(repositories_stargazers, ok_status_code)
+    result: Result = CliRunner().invoke(command_line, ['overlap', 'foo/bar', 'foo/baz', 'foo/qux',
+                                                       '--concurrency', '3'] + options)
+    assert result.exit_code == 0
+    assert result.output == expected_output
+
+
+@responses.activate
+def test_overlap_command_with_a_missing_repository(repositories_stargazers: typing.Dict[str, typing.List[str]],
+                                                   ok_status_code: int,
+                                                   not_found_status_code: int) -> None:
+    add_repositories(repositories_stargazers, ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/missing/stargazers?page=1", status=not_found_status_code)
+    result: Result = CliRunner().invoke(command_line, ['overlap', 'foo/bar', 'foo/missing'])
+    assert result.exit_code == 0
+    assert "Stargazers:" not in result.output
+
+
+def test_crawl_is_the_default_command() -> None:
+    result: Result = CliRunner().invoke(command_line, ['crawl', '--help'])
+    assert result.exit_code == 0
+    assert CliRunner().invoke(command_line, ['foo/bar', '--help']).output == result.output
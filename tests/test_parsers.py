@@ -0,0 +1,95 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import importlib.util
+import typing
+
+import pytest
+import responses
+
+from github_stargazers.github import GitHub
+from github_stargazers.parsers import PARSERS, get_parser, ParserError
+from github_stargazers.parsers import MissingHyperlinkTagError, MissingHrefAttributeError, HrefContentError
+from tests import get_wrong_href_content, get_page_content_with_href, register_pages
+
+
+def get_available_parsers() -> typing.List[str]:
+    return [parser for parser in sorted(PARSERS)
+            if parser not in ("lxml", "selectolax") or importlib.util.find_spec(parser) is not None]
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<html><body><ol>' \
+           '<li><h3 class="follow-list-name"><span title="John"><a href="/foo">John Williams</a></span></h3></li>' \
+           "<li><h3><a class='x' data-href=\"/no\" href='/bar&amp;baz'> Michael Phelps </a></h3></li>" \
+           '<li><H3><A HREF=/baz>Baz</A></H3></li>' \
+           '</ol></body></html>'
+
+
+@pytest.fixture
+def url_page_content_end_of_stargazers() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3>' \
+           '<h3>This repository has no more stargazers.</h3>' \
+           '<h3> <a href="/bar"> Michael Phelps </a> </h3>'
+
+
+def test_unknown_parser_raises() -> None:
+    with pytest.raises(ParserError):
+        get_parser("foo")
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+def test_parser_extracts_usernames(url_page_content: str, parser: str) -> None:
+    assert get_parser(parser)(url_page_content) == ['foo', 'bar&baz', 'baz']
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+def test_parser_stops_at_end_of_stargazers(url_page_content_end_of_stargazers: str, parser: str) -> None:
+    assert get_parser(parser)(url_page_content_end_of_stargazers) == ['foo']
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+@pytest.mark.parametrize("page", ["", "<html> <h1> title </h1> </html>"])
+def test_parser_on_page_without_stargazers(page: str, parser: str) -> None:
+    assert get_parser(parser)(page) == []
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+@pytest.mark.parametrize("page", [
+    '<!-- <h3><a href="/ghost">Ghost</a></h3> --><h3><a href="/foo">Foo</a></h3>',
+    '<script>var row = "<h3><a href=\'/ghost\'>Ghost</a></h3>";</script><h3><a href="/foo">Foo</a></h3>',
+    '<h3><a href="/foo">Foo</a></h3><!-- <h3><a href="/ghost">Ghost</a></h3>',
+])
+def test_parser_skips_comments_and_scripts(page: str, parser: str) -> None:
+    assert get_parser(parser)(page) == ['foo']
+
+
+@pytest.mark.parametrize("page", ['<h3><a href="/foo">Foo</a>', '<h3><a href="/foo">Foo</a></h3><h3 class="x">'])
+def test_stream_parser_on_unclosed_h3_raises(page: str) -> None:
+    with pytest.raises(MissingHyperlinkTagError):
+        get_parser("stream")(page)
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+def test_parser_on_missing_hyperlink_tag_raises(url_page_content_no_hyperlink: str, parser: str) -> None:
+    with pytest.raises(MissingHyperlinkTagError):
+        get_parser(parser)(url_page_content_no_hyperlink)
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+def test_parser_on_missing_href_attribute_raises(url_page_content_no_href: str, parser: str) -> None:
+    with pytest.raises(MissingHrefAttributeError):
+        get_parser(parser)(url_page_content_no_href)
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+@pytest.mark.parametrize("wrong_href_content", get_wrong_href_content())
+def test_parser_on_wrong_href_content_raises(wrong_href_content: str, parser: str) -> None:
+    with pytest.raises(HrefContentError):
+        get_parser(parser)(get_page_content_with_href(wrong_href_content))
+
+
+@pytest.mark.parametrize("parser", get_available_parsers())
+@responses.activate
+def test_get_all_stargazers_with_parser(url_page_content: str, parser: str, ok_status_code: int) -> None:
+    register_pages(url_page_content, "", status=ok_status_code)
+    assert GitHub("foo/bar", parser=parser).get_all_stargazers() == sorted(['foo', 'bar&baz', 'baz'])
@@ -0,0 +1,153 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import concurrent.futures
+import json
+import typing
+
+from click.testing import CliRunner
+from click.testing import Result
+import pytest
+import responses
+
+from github_stargazers.github import GitHub, TooManyRequestsHttpError
+from github_stargazers.github_stargazers import command_line
+from github_stargazers.parsers import parse_display_names
+from github_stargazers.profiles import BatchSizeError, GraphQLError, ProfileFetcher, StargazerProfile
+from github_stargazers.profiles import get_stargazer_profiles
+
+GRAPHQL_URL: str = "https://api.github.com/graphql"
+
+
+@pytest.fixture
+def url_page_content() -> str:
+    return '<h3> <a href="/foo"> John Williams </a> </h3> ' \
+           '<h3> <span title="Bar"><a href="/bar"></a></span> </h3>'
+
+
+class GraphQLServer:
+    """Answers the GraphQL queries of profiles, every user but `missing_users` working at `Acme`."""
+
+    def __init__(self, missing_users: typing.Iterable[str] = ()) -> None:
+        self.missing_users: typing.Set[str] = set(missing_users)
+        self.batches: typing.List[typing.List[str]] = []
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=self.__answer)
+
+    def __answer(self, request: typing.Any) -> typing.Tuple[int, typing.Dict[str, str], str]:
+        variables: typing.Dict[str, str] = json.loads(request.body)["variables"]
+        logins: typing.List[str] = [variables[f"login{index}"] for index in range(len(variables))]
+        self.batches.append(logins)
+        data: typing.Dict[str, typing.Any] = {
+            f"user{index}": None if login in self.missing_users else
+            {"login": login, "name": login.title(), "company": "Acme", "location": None,
+             "followers": {"totalCount": index}}
+            for index, login in enumerate(logins)}
+        errors: typing.List[typing.Dict[str, str]] = [{"type": "NOT_FOUND", "message": f"No user {login}"}
+                                                      for login in logins if login in self.missing_users]
+        return 200, {}, json.dumps({"data": data, "errors": errors} if errors else {"data": data})
+
+
+def test_parse_display_names(url_page_content: str) -> None:
+    assert parse_display_names(url_page_content) == {"foo": "John Williams"}
+    assert parse_display_names('<h3>This repository has no more stargazers.</h3>') == {}
+
+
+@responses.activate
+def test_get_display_names(url_page_content: str, ok_status_code: int) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    assert GitHub("foo/bar").get_display_names() == {"bar": None, "foo": "John Williams"}
+
+
+@responses.activate
+def test_concurrent_get_display_names(url_page_content: str, ok_status_code: int) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    github: GitHub = GitHub("foo/bar")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures: typing.List[concurrent.futures.Future] = [executor.submit(github.get_display_names) for _ in range(8)]
+    assert all(future.result() == {"bar": None, "foo": "John Williams"} for future in futures)
+
+
+@responses.activate
+def test_profiles_are_fetched_in_batches(tmp_path: typing.Any) -> None:
+    server = GraphQLServer(missing_users=["user3"])
+    cache_path: str = str(tmp_path / "profiles.json")
+    fetcher: ProfileFetcher = ProfileFetcher("token", batch_size=2, concurrency=2, cache_path=cache_path)
+    logins: typing.List[str] = [f"user{index}" for index in range(5)]
+    profiles: typing.Dict[str, StargazerProfile] = fetcher.fetch(logins)
+    assert sorted(server.batches) == [["user0", "user1"], ["user2", "user3"], ["user4"]]
+    assert profiles["user1"] == StargazerProfile("user1", "User1", "Acme", None, 1)
+    assert profiles["user3"] == StargazerProfile("user3")
+    assert fetcher.queries == 3
+
+    assert ProfileFetcher("token", cache_path=cache_path).fetch(logins + ["user5"]) == \
+        dict(profiles, user5=StargazerProfile("user5", "User5", "Acme", None, 0))
+    assert server.batches[-1] == ["user5"]
+
+
+@responses.activate
+def test_expired_profiles_are_fetched_again() -> None:
+    server = GraphQLServer()
+    now: typing.List[float] = [0.0]
+    fetcher: ProfileFetcher = ProfileFetcher("token", ttl=10.0, clock=lambda: now[0])
+    fetcher.fetch(["foo"])
+    fetcher.fetch(["foo"])
+    now[0] = 10.0
+    fetcher.fetch(["foo"])
+    assert server.batches == [["foo"], ["foo"]]
+
+
+@responses.activate
+def test_graphql_errors_raise() -> None:
+    responses.add(responses.POST, GRAPHQL_URL, json={"errors": [{"type": "FORBIDDEN", "message": "foo"}]})
+    with pytest.raises(GraphQLError):
+        ProfileFetcher("token").fetch(["foo"])
+
+    responses.replace(responses.POST, GRAPHQL_URL, status=429)
+    with pytest.raises(TooManyRequestsHttpError):
+        ProfileFetcher("token").fetch(["foo"])
+
+
+@pytest.mark.parametrize("batch_size", [0, 101])
+def test_wrong_batch_size_raises(batch_size: int) -> None:
+    with pytest.raises(BatchSizeError):
+        ProfileFetcher("token", batch_size=batch_size)
+
+
+@responses.activate
+def test_get_stargazer_profiles_keeps_the_displayed_names(url_page_content: str, ok_status_code: int) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    GraphQLServer()
+    assert get_stargazer_profiles(GitHub("foo/bar")) == [StargazerProfile("bar"),
+                                                        StargazerProfile("foo", "John Williams")]
+    assert get_stargazer_profiles(GitHub("foo/bar"), ProfileFetcher("token")) == [
+        StargazerProfile("bar", "Bar", "Acme", None, 0), StargazerProfile("foo", "John Williams", "Acme", None, 1)]
+
+
+@responses.activate
+def test_profiles_option(url_page_content: str, ok_status_code: int) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1", body=url_page_content,
+                  status=ok_status_code)
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=2", body=url_page_content,
+                  status=ok_status_code)
+    GraphQLServer()
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--profiles', '--token', 'foo'])
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"login": "bar", "name": "Bar", "company": "Acme", "location": None, "followers": 0},
+        {"login": "foo", "name": "John Williams", "company": "Acme", "location": None, "followers": 1},
+    ]
+
+
+@pytest.mark.parametrize("options", [['--user', 'foo'], ['--export', 'foo.bin'], ['--incremental', 'foo.json'],
+                                     ['--stream'], ['--run-size', '10'], ['--checkpoint', 'foo.checkpoint'],
+                                     ['--export-bloom', 'foo.bloom']])
+def test_profiles_option_needs_a_plain_listing(options: typing.List[str]) -> None:
+    result: Result = CliRunner().invoke(command_line, ['foo/bar', '--profiles'] + options)
+    assert result.exit_code == 2
@@ -0,0 +1,146 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import email.utils
+import io
+import typing
+
+import pytest
+import requests
+import responses
+
+from benchmarks.stub_server import StubGitHubServer, get_username
+from github_stargazers.github import GitHub, TooManyRequestsHttpError
+from github_stargazers.scheduler import RequestScheduler, SchedulerArgumentError, parse_retry_after
+
+
+class FakeTime:
+
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+        self.sleeps: typing.List[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time() -> FakeTime:
+    return FakeTime()
+
+
+def get_response(status_code: int, headers: typing.Optional[typing.Dict[str, str]] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO()
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.mark.parametrize("argument", ["rate", "burst", "max_concurrency", "slow_latency"])
+def test_wrong_argument_raises(argument: str) -> None:
+    with pytest.raises(SchedulerArgumentError):
+        RequestScheduler(**typing.cast(typing.Dict[str, typing.Any], {argument: 0}))
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after(None, 0) is None
+    assert parse_retry_after("120", 0) == 120
+    assert parse_retry_after(email.utils.formatdate(1030, usegmt=True), 1000) == 30
+    assert parse_retry_after("soon", 0) is None
+
+
+def test_token_bucket_limits_the_rate(fake_time: FakeTime) -> None:
+    scheduler = RequestScheduler(rate=4, clock=fake_time.clock, sleep=fake_time.sleep)
+    for _ in range(5):
+        scheduler.request(lambda: get_response(200))
+    assert fake_time.sleeps == [0.25] * 4
+
+
+def test_throttled_request_waits_for_retry_after(fake_time: FakeTime) -> None:
+    responses_to_send: typing.List[requests.Response] = [get_response(429, {'Retry-After': '30'}), get_response(200)]
+    scheduler = RequestScheduler(base_delay=0.001, clock=fake_time.clock, sleep=fake_time.sleep)
+    assert scheduler.request(lambda: responses_to_send.pop(0)).status_code == 200
+    assert len(fake_time.sleeps) == 1 and 30 <= fake_time.sleeps[0] < 30.001
+    assert scheduler.retries == 1
+
+
+def test_throttled_response_is_closed_before_retrying(fake_time: FakeTime) -> None:
+    throttled_response: requests.Response = get_response(429)
+    responses_to_send: typing.List[requests.Response] = [throttled_response, get_response(200)]
+    scheduler = RequestScheduler(base_delay=0.001, clock=fake_time.clock, sleep=fake_time.sleep)
+    last_response: requests.Response = scheduler.request(lambda: responses_to_send.pop(0))
+    assert throttled_response.raw.closed
+    assert not last_response.raw.closed
+
+
+def test_throttled_request_backs_off_exponentially(fake_time: FakeTime) -> None:
+    scheduler = RequestScheduler(max_retries=3, base_delay=2, clock=fake_time.clock, sleep=fake_time.sleep)
+    assert scheduler.request(lambda: get_response(429)).status_code == 429
+    assert scheduler.retries == 3
+    for attempt, seconds in enumerate(fake_time.sleeps):
+        assert 2 ** attempt <= seconds < 2 ** attempt + 2
+
+
+def test_concurrency_limit_is_aimd(fake_time: FakeTime) -> None:
+    scheduler = RequestScheduler(max_concurrency=8, max_retries=0, clock=fake_time.clock, sleep=fake_time.sleep)
+    scheduler.request(lambda: get_response(429))
+    assert scheduler.concurrency_limit == 4
+    scheduler.request(lambda: get_response(429))
+    assert scheduler.concurrency_limit == 2
+    for _ in range(2):
+        scheduler.request(lambda: get_response(200))
+    assert scheduler.concurrency_limit == 3
+    for _ in range(100):
+        scheduler.request(lambda: get_response(200))
+    assert scheduler.concurrency_limit == 8
+
+
+def test_slow_responses_shrink_the_concurrency_limit(fake_time: FakeTime) -> None:
+    scheduler = RequestScheduler(max_concurrency=8, slow_latency=0.0001, clock=fake_time.clock, sleep=fake_time.sleep)
+
+    def send_slowly() -> requests.Response:
+        sum(range(100000))
+        return get_response(200)
+
+    scheduler.request(send_slowly)
+    assert scheduler.concurrency_limit == 4
+
+
+@responses.activate
+def test_get_all_stargazers_retries_only_the_throttled_page(fake_time: FakeTime, ok_status_code: int,
+                                                            too_many_requests_status_code: int) -> None:
+    pages: typing.List[typing.Tuple[int, int, str]] = [
+        (1, ok_status_code, '<h3> <a href="/foo"> John Williams </a> </h3>'),
+        (2, too_many_requests_status_code, ''),
+        (2, ok_status_code, '<h3> <a href="/bar"> Michael Phelps </a> </h3>'),
+        (3, ok_status_code, '<h3>This repository has no more stargazers.</h3>'),
+    ]
+    for page_number, status, body in pages:
+        responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=" + str(page_number),
+                      body=body, status=status, headers={'Retry-After': '1'})
+    scheduler = RequestScheduler(base_delay=0.001, clock=fake_time.clock, sleep=fake_time.sleep)
+    assert GitHub("foo/bar", scheduler=scheduler).get_all_stargazers() == ['bar', 'foo']
+    assert [typing.cast(str, call.request.url)[-1] for call in responses.calls] == ['1', '2', '2', '3']
+
+
+@responses.activate
+def test_get_all_stargazers_raises_when_retries_are_exhausted(fake_time: FakeTime,
+                                                              too_many_requests_status_code: int) -> None:
+    responses.add(responses.GET, "https://github.com/foo/bar/stargazers?page=1",
+                  body='', status=too_many_requests_status_code)
+    scheduler = RequestScheduler(max_retries=2, base_delay=0.001, clock=fake_time.clock, sleep=fake_time.sleep)
+    with pytest.raises(TooManyRequestsHttpError):
+        GitHub("foo/bar", scheduler=scheduler).get_all_stargazers()
+    assert len(responses.calls) == 3
+
+
+@pytest.mark.parametrize("engine, markup", [("html", "minimal"), ("html", "github"), ("api", "minimal")])
+def test_scheduler_retries_the_throttled_pages_of_the_stub_server(engine: str, markup: str) -> None:
+    with StubGitHubServer(stars=500, markup=markup, throttle_every=3) as server:
+        github: GitHub = GitHub("foo/bar", concurrency=4, github_url=server.url, api_url=server.url, engine=engine,
+                                scheduler=RequestScheduler(max_retries=10, base_delay=0.0))
+        assert github.get_all_stargazers() == [get_username(index) for index in range(500)]
+        assert server.requests > 3
@@ -0,0 +1,82 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import concurrent.futures
+import threading
+import typing
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubGitHubServer, get_username
+from github_stargazers.github import GitHub
+from github_stargazers.instrumentation import Profiler
+from github_stargazers.single_flight import SingleFlight
+from tests.test_api import counting_session
+
+
+def test_concurrent_calls_share_the_call_in_flight() -> None:
+    single_flight: SingleFlight = SingleFlight()
+    called: threading.Event = threading.Event()
+    release: threading.Event = threading.Event()
+    calls: typing.List[str] = []
+
+    def function() -> str:
+        calls.append("foo")
+        called.set()
+        release.wait()
+        return "bar"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(single_flight.call, "foo", function)
+        called.wait()
+        followers = [executor.submit(single_flight.call, "foo", function) for _ in range(3)]
+        release.set()
+        assert leader.result() == ("bar", False)
+        assert [follower.result() for follower in followers] == [("bar", True)] * 3
+    assert calls == ["foo"]
+    assert single_flight.shared == 3
+
+
+def test_results_are_kept_for_the_ttl() -> None:
+    now: typing.List[float] = [0.0]
+    single_flight: SingleFlight = SingleFlight(ttl=5.0, max_results=2, clock=lambda: now[0])
+    assert single_flight.call("foo", lambda: 1) == (1, False)
+    assert single_flight.call("foo", lambda: 2) == (1, True)
+    now[0] = 5.0
+    assert single_flight.call("foo", lambda: 3) == (3, False)
+
+    single_flight.call("bar", lambda: 4)
+    single_flight.call("baz", lambda: 5)
+    assert single_flight.call("foo", lambda: 6) == (6, False)
+    assert single_flight.call("baz", lambda: 7) == (5, True)
+
+
+def test_exceptions_are_not_kept() -> None:
+    single_flight: SingleFlight = SingleFlight()
+
+    def fail() -> None:
+        raise ValueError("foo")
+
+    with pytest.raises(ValueError):
+        single_flight.call("foo", fail)
+    assert single_flight.call("foo", lambda: 1) == (1, False)
+
+
+def test_github_instances_fetch_shared_pages_once() -> None:
+    urls: typing.List[str] = []
+    session: requests.Session = counting_session(urls)
+    single_flight: SingleFlight = SingleFlight()
+    profiler: Profiler = Profiler()
+
+    with StubGitHubServer(stars=100) as server:
+        def check(user: str) -> bool:
+            return GitHub("foo/bar", session=session, github_url=server.url, single_flight=single_flight,
+                          on_page=profiler.record).is_stargazer(user)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            users: typing.List[str] = [get_username(index) for index in range(0, 100, 10)] + ["foo"]
+            assert list(executor.map(check, users)) == [True] * 10 + [False]
+
+    assert sorted(urls) == sorted(set(urls))
+    assert len(urls) == 4
+    assert sum(page.status_code is not None for page in profiler.pages) == 4
+    assert single_flight.shared == len(profiler.pages) - 4 > 0
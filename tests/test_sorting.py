@@ -0,0 +1,54 @@
+# pylint: disable=no-member,invalid-name,redefined-outer-name
+import random
+import typing
+
+import pytest
+
+from github_stargazers import sorting
+from github_stargazers.sorting import sort_with_bounded_memory, MaxOpenRunsError, RunSizeError
+
+
+def get_usernames(count: int) -> typing.List[str]:
+    usernames: typing.List[str] = [f"user{index}" for index in range(count)]
+    random.Random(count).shuffle(usernames)
+    return usernames
+
+
+def test_wrong_run_size_raises() -> None:
+    with pytest.raises(RunSizeError):
+        sort_with_bounded_memory(["foo"], 0)
+
+
+def test_wrong_max_open_runs_raises() -> None:
+    with pytest.raises(MaxOpenRunsError):
+        sort_with_bounded_memory(["foo"], 1, max_open_runs=1)
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 100])
+@pytest.mark.parametrize("run_size", [1, 3, 7, 1000])
+def test_sort_with_bounded_memory_sorts(count: int, run_size: int) -> None:
+    usernames: typing.List[str] = get_usernames(count)
+    assert list(sort_with_bounded_memory(usernames, run_size)) == sorted(usernames)
+
+
+def test_sort_with_bounded_memory_keeps_duplicates() -> None:
+    assert list(sort_with_bounded_memory(["b", "a", "b", "a", "c"], 2)) == ["a", "a", "b", "b", "c"]
+
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 100, 1000])
+@pytest.mark.parametrize("max_open_runs", [2, 3, 64])
+def test_runs_are_merged_a_bounded_number_at_a_time(count: int, max_open_runs: int, monkeypatch: typing.Any) -> None:
+    open_runs: typing.List[typing.IO[str]] = []
+    most_open_runs: typing.List[int] = [0]
+
+    def open_run(run_path: str, encoding: str = "utf-8") -> typing.IO[str]:
+        open_runs.append(open(run_path, encoding=encoding))  # pylint: disable=consider-using-with
+        most_open_runs[0] = max(most_open_runs[0], sum(not run_file.closed for run_file in open_runs))
+        return open_runs[-1]
+
+    monkeypatch.setattr(sorting, "open", open_run, raising=False)
+    usernames: typing.List[str] = get_usernames(count)
+    assert list(sort_with_bounded_memory(usernames, 1, max_open_runs)) == sorted(usernames)
+    assert most_open_runs[0] <= max_open_runs
+    assert all(run_file.closed for run_file in open_runs)